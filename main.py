@@ -32,6 +32,7 @@ from src.classes.config_page import ConfigManager
 # Importa o bot principal e processador paralelo
 from src.bots.bot_bbdaf import BotBBDAF
 from src.classes.methods.parallel_processor import ProcessadorParalelo
+from src.classes.methods.journal import DiarioExecucao
 from src.classes.data_extractor import DataExtractor
 
 # Importa ButtonFactory para botões de aba
@@ -357,8 +358,13 @@ class SistemaFVN:
             modo = parametros.get('modo', 'individual')
             
             if modo == 'paralelo':
-                # Execução paralela
+                # Execução paralela (diário com a mesma chave do BotBBDAF: bot + datas)
                 self.processador_paralelo = ProcessadorParalelo()
+                self.processador_paralelo.diario = DiarioExecucao(
+                    'BotBBDAF',
+                    {'data_inicial': parametros.get('data_inicial'), 'data_final': parametros.get('data_final')},
+                    parametros.get('retomar', False)
+                )
                 resultado = self.processador_paralelo.executar_paralelo_threads(
                     num_instancias=parametros.get('num_instancias', 2),
                     data_inicial=parametros.get('data_inicial'),
@@ -372,7 +378,8 @@ class SistemaFVN:
                 resultado = self.bot_atual.executar_completo(
                     cidades=parametros.get('cidades'),
                     data_inicial=parametros.get('data_inicial'),
-                    data_final=parametros.get('data_final')
+                    data_final=parametros.get('data_final'),
+                    retomar=parametros.get('retomar', False)
                 )
             
             # Processa resultado na thread principal
@@ -509,8 +516,11 @@ def main():
     print("=" * 60)
     
     # Verifica argumentos de linha de comando
-    if len(sys.argv) > 1:
-        if sys.argv[1] == "--cli":
+    # --retomar (em qualquer posição): pula as cidades já concluídas numa execução anterior com as mesmas datas
+    retomar = "--retomar" in sys.argv
+    argumentos = [arg for arg in sys.argv[1:] if arg != "--retomar"]
+    if argumentos:
+        if argumentos[0] == "--cli":
             # Modo CLI direto
             print("Modo CLI ativado")
             from src.bots.bot_bbdaf import BotBBDAF
@@ -520,12 +530,13 @@ def main():
             bot.configurar_extrator_dados(DataExtractor("bbdaf"))
             
             # Pega datas dos argumentos ou usa padrão
-            data_inicial = sys.argv[2] if len(sys.argv) > 2 else None
-            data_final = sys.argv[3] if len(sys.argv) > 3 else None
+            data_inicial = argumentos[1] if len(argumentos) > 1 else None
+            data_final = argumentos[2] if len(argumentos) > 2 else None
             
             resultado = bot.executar_completo(
                 data_inicial=data_inicial,
-                data_final=data_final
+                data_final=data_final,
+                retomar=retomar
             )
             
             if resultado['sucesso']:
@@ -535,15 +546,20 @@ def main():
                 print(f"\nErro: {resultado['erro']}")
                 return 1
         
-        elif sys.argv[1] == "--parallel":
+        elif argumentos[0] == "--parallel":
             # Modo paralelo via CLI
             print("Modo paralelo via CLI")
             from src.classes.methods.parallel_processor import ProcessadorParalelo
             
-            num_instancias = int(sys.argv[2]) if len(sys.argv) > 2 else 2
+            num_instancias = int(argumentos[1]) if len(argumentos) > 1 else 2
             processador = ProcessadorParalelo()
             
-            resultado = processador.executar_paralelo_subprocess(num_instancias)
+            # Diário com a mesma chave do BotBBDAF (bot + datas)
+            data_inicial, data_final = processador.date_calculator.obter_datas_formatadas()
+            processador.diario = DiarioExecucao(
+                'BotBBDAF', {'data_inicial': data_inicial, 'data_final': data_final}, retomar
+            )
+            resultado = processador.executar_paralelo_subprocess(num_instancias, data_inicial, data_final)
             
             if resultado['sucesso']:
                 print("\nProcessamento paralelo concluído!")
@@ -579,4 +595,7 @@ def main():
 
 
 if __name__ == "__main__":
+    # Necessário para os processos do pool de trabalhadores no executável (PyInstaller/Windows)
+    import multiprocessing
+    multiprocessing.freeze_support()
     sys.exit(main())
\ No newline at end of file
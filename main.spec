@@ -45,6 +45,7 @@ hiddenimports += [
     'bs4',           # beautifulsoup4 (nome correto do módulo)
     'requests',
     'urllib3',
+    'websocket',     # websocket-client (eventos de download do DevTools)
     'concurrent.futures',
     'threading',
     'subprocess',    # Para cancelamento forçado de processos
@@ -182,7 +182,8 @@ class RelatorioProcessamento:
         
 #.  Execução principal do script Ribeirão das Neves
 
-def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_neves", cancelado_callback=None):
+def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_neves", cancelado_callback=None,
+                             token=None):
     """
     Executa o script especifico para Ribeirao das Neves
 
@@ -195,6 +196,7 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
         ano: Ano para processar os relatorios
         nome_cidade: Nome da cidade para organização de pastas
         cancelado_callback: Função que retorna True se a execução foi cancelada
+        token: TokenCancelamento do BotBetha (interrompe as esperas longas na hora)
 
     Returns:
         bool: True se executado com sucesso
@@ -263,6 +265,8 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
 
             # Criar nova instância do bot para cada relatório
             bot_temp = BotBetha(cidade_config, ano)
+            if token:
+                bot_temp.token = token
 
             # Se temos um callback de cancelamento, verificar antes de executar
             if cancelado_callback and cancelado_callback():
@@ -294,6 +298,8 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
                 print("DOWNLOAD APÓS 5º RELATÓRIO")
                 print("="*60)
                 bot_download = BotBetha(cidade_config, ano)
+                if token:
+                    bot_download.token = token
                 if bot_download.configurar_navegador():
                     if (bot_download.navegar_para_pagina() and
                         bot_download.fazer_login() and
@@ -301,7 +307,8 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
                         bot_download.selecionar_exercicio() and
                         bot_download.pressionar_f4() and
                         bot_download.navegar_relatorios_favoritos()):
-                        baixar_ultimos_5_arquivos(bot_download.navegador, bot_download.wait, file_converter, 600)
+                        baixar_ultimos_5_arquivos(bot_download.navegador, bot_download.wait, file_converter, 600,
+                                                  token=token)
                     bot_download.fechar_navegador()
 
             # Baixar arquivos após o 10º relatório (índice 9)
@@ -310,6 +317,8 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
                 print("DOWNLOAD APÓS 10º RELATÓRIO")
                 print("="*60)
                 bot_download = BotBetha(cidade_config, ano)
+                if token:
+                    bot_download.token = token
                 if bot_download.configurar_navegador():
                     if (bot_download.navegar_para_pagina() and
                         bot_download.fazer_login() and
@@ -317,7 +326,8 @@ def executar_script_ribeirao(navegador, wait, ano=None, nome_cidade="ribeirao_ne
                         bot_download.selecionar_exercicio() and
                         bot_download.pressionar_f4() and
                         bot_download.navegar_relatorios_favoritos()):
-                        baixar_ultimos_5_arquivos(bot_download.navegador, bot_download.wait, file_converter, 900)
+                        baixar_ultimos_5_arquivos(bot_download.navegador, bot_download.wait, file_converter, 900,
+                                                  token=token)
                     bot_download.fechar_navegador()
 
         # Resumo do processamento
@@ -1641,7 +1651,7 @@ def _processar_relacao_liquidacoes(navegador, wait, ano):
         return False
 
 
-def baixar_ultimos_5_arquivos(navegador, wait, file_converter, espera_segundos=300):
+def baixar_ultimos_5_arquivos(navegador, wait, file_converter, espera_segundos=300, token=None):
     """
     Função para baixar todos os arquivos disponíveis
 
@@ -1650,6 +1660,7 @@ def baixar_ultimos_5_arquivos(navegador, wait, file_converter, espera_segundos=3
         wait: Instância do WebDriverWait
         file_converter: Instância do FileConverter
         espera_segundos: Tempo de espera antes de baixar (300 ou 600 segundos)
+        token: TokenCancelamento opcional - o cancelamento interrompe a espera imediatamente
 
     Returns:
         int: Número de arquivos baixados com sucesso
@@ -1661,7 +1672,11 @@ def baixar_ultimos_5_arquivos(navegador, wait, file_converter, espera_segundos=3
     print(f"⏳ Aguardando {espera_segundos} segundos...")
     minutos = espera_segundos // 60
     for i in range(minutos):
-        time.sleep(60)
+        if token and token.aguardar(60):
+            print("⚠ Espera interrompida: execução cancelada")
+            return 0
+        elif not token:
+            time.sleep(60)
         restante = espera_segundos - (i + 1) * 60
         if restante > 0:
             print(f"   {restante} segundos restantes...")
@@ -5,7 +5,6 @@ Contém toda a lógica de scraping, processamento e coordenação
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException
 from selenium.webdriver.common.keys import Keys
@@ -16,16 +15,15 @@ import subprocess
 import threading
 from datetime import datetime
 from typing import List, Dict, Tuple, Optional
-import concurrent.futures
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from src.classes.chrome_driver import ChromeDriverSimples
-from src.classes.data_extractor import DataExtractor
+from src.classes.chrome_driver import ChromeDriverSimples, limpar_respostas, respostas_json
 from src.classes.date_calculator import DateCalculator
 from src.classes.file.file_manager import FileManager
-from src.classes.city_manager import CitySplitter
-from src.classes.central import SISTEMA_CONFIG, SELETORES_CSS, ARQUIVOS_CONFIG
-from src.classes.methods.cancel_method import BotBase
+from src.classes.central import SISTEMA_CONFIG, SELETORES_CSS, ARQUIVOS_CONFIG, BBDAF_XHR_CONFIG
+from src.classes.methods.cancel_method import BotBase, ERRO_SESSAO_PERDIDA
+from src.classes.methods.waits import AngularEstavel, DomEstavel, RedeOciosa, ElementoPronto, ElementoPresente, Todas
+from src.classes.methods.dom_extract import extrair_elementos
 from src.classes.report_generator import ReportGenerator
 from src.classes.file.path_manager import obter_caminho_dados
 
@@ -87,11 +85,12 @@ class BotBBDAF(BotBase):
 
             # Usa a classe simples para conectar direto ao ChromeDriver
             driver_simples = ChromeDriverSimples()
-            self.navegador = driver_simples.conectar(chrome_options=opcoes)
+            self.navegador = driver_simples.conectar(chrome_options=opcoes, perfil_bloqueio='scraping', site='bbdaf',
+                                                    log_rede=True)
 
             if self.navegador:
                 # Configura o WebDriverWait para aguardar elementos aparecerem
-                self.wait = WebDriverWait(self.navegador, self.timeout)
+                self.wait = self._espera(self.navegador, self.timeout)
                 return True
             else:
                 return False
@@ -107,7 +106,7 @@ class BotBBDAF(BotBase):
             bool: True se a página foi carregada com sucesso, False caso contrário
         """
         try:
-            self.navegador.get(self.url)
+            self._navegar(self.url)
             
             # Aguarda o campo de nome do beneficiário aparecer para confirmar que a página carregou
             campo_beneficiario = self.wait.until(
@@ -141,8 +140,9 @@ class BotBBDAF(BotBase):
             campo_beneficiario.clear()
             campo_beneficiario.send_keys(cidade)
             
-            # Aguarda um momento para o sistema processar a entrada
-            time.sleep(SISTEMA_CONFIG['pausa_apos_preenchimento'])
+            # Aguarda o sistema processar a entrada
+            self._aguardar_pronto('bbdaf_apos_preenchimento', AngularEstavel(),
+                                  SISTEMA_CONFIG['pausa_apos_preenchimento'])
             
             return True
             
@@ -170,25 +170,29 @@ class BotBBDAF(BotBase):
             botao_seletor.click()
             
             # Aguarda o dropdown aparecer
-            time.sleep(SISTEMA_CONFIG['pausa_entre_campos'])
+            self._aguardar_pronto('bbdaf_dropdown_cidades',
+                                  ElementoPresente(By.CSS_SELECTOR, SELETORES_CSS['opcao_cidade_mg']),
+                                  SISTEMA_CONFIG['pausa_entre_campos'])
             
-            # Procura por todas as opções que contêm "MG" no title
+            # Lê o title de todas as opções "MG" numa única chamada ao navegador
             opcoes_mg = self.wait.until(
-                EC.presence_of_all_elements_located((By.CSS_SELECTOR, SELETORES_CSS['opcao_cidade_mg']))
+                lambda driver: extrair_elementos(driver, SELETORES_CSS['opcao_cidade_mg'], ['title'],
+                                                 incluir_elemento=True)
             )
             
             # Procura pela cidade específica do MG
             cidade_encontrada = False
             for opcao in opcoes_mg:
-                title_opcao = opcao.get_attribute('title')
+                title_opcao = opcao['title']
                 if title_opcao and cidade.upper() in title_opcao.upper():
                     
                     # Clica na opção da cidade MG
-                    opcao.click()
+                    opcao['elemento'].click()
                     cidade_encontrada = True
                     
                     # Aguarda a seleção ser processada
-                    time.sleep(SISTEMA_CONFIG['pausa_apos_preenchimento'])
+                    self._aguardar_pronto('bbdaf_apos_selecao', AngularEstavel(),
+                                          SISTEMA_CONFIG['pausa_apos_preenchimento'])
                     break
             
             return cidade_encontrada
@@ -215,7 +219,10 @@ class BotBBDAF(BotBase):
             botao_continuar.click()
             
             # Aguarda a página de seleção de datas carregar completamente
-            time.sleep(SISTEMA_CONFIG['pausa_apos_clique'])
+            self._aguardar_pronto('bbdaf_pagina_datas',
+                                  Todas(ElementoPresente(By.CSS_SELECTOR, SELETORES_CSS['campos_data']),
+                                        AngularEstavel()),
+                                  SISTEMA_CONFIG['pausa_apos_clique'])
             return True
             
         except TimeoutException:
@@ -231,6 +238,36 @@ class BotBBDAF(BotBase):
             data_inicial (str): Data inicial no formato DD/MM/AAAA
             data_final (str): Data final no formato DD/MM/AAAA
         
+        Returns:
+            bool: True se o preenchimento foi bem-sucedido, False caso contrário
+        """
+        try:
+            # Preenche as duas datas num único script (valor + eventos input/change/blur que o Angular escuta)
+            seletor = SELETORES_CSS['campos_data']
+            preenchimento = self._preencher_formulario(
+                [((seletor, 0), data_inicial), ((seletor, 1), data_final)], etapa='bbdaf_datas'
+            )
+            if not preenchimento['sucesso']:
+                return False
+
+            # A máscara do campo recusou o valor colado: digita como antes
+            if [campo['valor'] for campo in preenchimento['campos']] != [data_inicial, data_final]:
+                return self._digitar_datas(data_inicial, data_final)
+
+            # Aguarda o sistema processar e validar as datas inseridas
+            self._aguardar_pronto('bbdaf_apos_datas', AngularEstavel(),
+                                  SISTEMA_CONFIG['pausa_apos_preenchimento'])
+            return True
+
+        except TimeoutException:
+            return False
+        except Exception:
+            return False
+
+    def _digitar_datas(self, data_inicial, data_final):
+        """
+        Digita as datas tecla a tecla (caminho antigo, usado quando a máscara não aceita o valor colado)
+
         Returns:
             bool: True se o preenchimento foi bem-sucedido, False caso contrário
         """
@@ -248,16 +285,17 @@ class BotBBDAF(BotBase):
                 campo_data_inicial.clear()  # Limpa qualquer valor pré-existente
                 campo_data_inicial.send_keys(data_inicial)  # Insere data no formato DD/MM/AAAA
                 
-                # Pequena pausa entre os preenchimentos para evitar conflitos
-                time.sleep(SISTEMA_CONFIG['pausa_entre_campos'])
+                # Aguarda a máscara do campo terminar de formatar a data antes do próximo
+                self._aguardar_pronto('bbdaf_entre_datas', DomEstavel(), SISTEMA_CONFIG['pausa_entre_campos'])
                 
                 # Preenche o segundo campo: Data final
                 campo_data_final = campos_data[1]
                 campo_data_final.clear()  # Limpa qualquer valor pré-existente
                 campo_data_final.send_keys(data_final)  # Insere data no formato DD/MM/AAAA
                 
-                # Aguarda um momento para o sistema processar e validar as datas inseridas
-                time.sleep(SISTEMA_CONFIG['pausa_apos_preenchimento'])
+                # Aguarda o sistema processar e validar as datas inseridas
+                self._aguardar_pronto('bbdaf_apos_datas', AngularEstavel(),
+                                      SISTEMA_CONFIG['pausa_apos_preenchimento'])
                 return True
                 
             else:
@@ -279,17 +317,23 @@ class BotBBDAF(BotBase):
         try:
             # Pressiona ESC para fechar qualquer calendário aberto antes de clicar no botão
             self.navegador.find_element(By.TAG_NAME, 'body').send_keys(Keys.ESCAPE)
-            time.sleep(SISTEMA_CONFIG['pausa_esc_calendario'])
+            self._aguardar_pronto('bbdaf_fechar_calendario', DomEstavel(), SISTEMA_CONFIG['pausa_esc_calendario'])
             
             # Localiza e clica no segundo botão "Continuar"
             botao_continuar_datas = self.wait.until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, SELETORES_CSS['botao_continuar_datas']))
             )
             
-            botao_continuar_datas.click()
-            
-            # Aguarda a próxima página carregar completamente
-            time.sleep(SISTEMA_CONFIG['pausa_apos_clique'])
+            # Só interessam as respostas da consulta (captura XHR dos resultados)
+            limpar_respostas(self.navegador)
+
+            # Envio da consulta passa pelo governador do site (evita rajadas entre instâncias)
+            with self._acesso_site(self.url):
+                botao_continuar_datas.click()
+                
+                # Aguarda a consulta terminar e a próxima página carregar completamente
+                self._aguardar_pronto('bbdaf_apos_clique', Todas(RedeOciosa(), AngularEstavel()),
+                                      SISTEMA_CONFIG['pausa_apos_clique'])
             return True
             
         except TimeoutException:
@@ -305,7 +349,7 @@ class BotBBDAF(BotBase):
             bool: True se conseguiu voltar com sucesso, False caso contrário
         """
         try:
-            self.navegador.get(self.url)
+            self._navegar(self.url)
             
             # Aguarda a página carregar novamente
             self.wait.until(
@@ -318,6 +362,32 @@ class BotBBDAF(BotBase):
         except Exception:
             return False
     
+    def extrair_resultados(self, cidade):
+        """
+        Extrai os resultados da consulta: primeiro das respostas JSON capturadas da aplicação
+        (Network.getResponseBody), depois do HTML da página se a captura não trouxer registros
+
+        Args:
+            cidade (str): Nome da cidade consultada
+
+        Returns:
+            Dict: Resultado da extração do DataExtractor ('origem' indica xhr ou html)
+        """
+        if BBDAF_XHR_CONFIG['ativo']:
+            respostas = respostas_json(self.navegador, BBDAF_XHR_CONFIG['padroes_url'])
+            resultado_xhr = self.data_extractor.processar_respostas_xhr(respostas, cidade)
+            if resultado_xhr.get('sucesso'):
+                return resultado_xhr
+            print(f"  Captura XHR sem registros ({len(respostas)} respostas JSON) - lendo tabela do HTML")
+
+        resultado_html = self.data_extractor.processar_pagina_resultados(self.navegador, cidade)
+        resultado_html['origem'] = 'html'
+        return resultado_html
+
+    def _formulario_pronto(self):
+        """Condição de prontidão da página inicial: campo do beneficiário habilitado e Angular estável"""
+        return Todas(ElementoPronto(By.CSS_SELECTOR, SELETORES_CSS['campo_beneficiario']), AngularEstavel())
+
     def processar_cidade(self, cidade, data_inicial, data_final, gerar_relatorio=True):
         """
         Processa uma cidade completa: nome → continuar → selecionar MG → datas → continuar
@@ -329,47 +399,61 @@ class BotBBDAF(BotBase):
             gerar_relatorio (bool): Se True, gera relatório individual (padrão: True)
 
         Returns:
-            Dict: Resultado do processamento com sucesso, erro e arquivo
+            Dict: Resultado do processamento com sucesso, erro, arquivo e tempos por etapa (segundos)
         """
         resultado = {
             'municipio': cidade,
             'sucesso': False,
             'erro': None,
-            'arquivo': None
+            'arquivo': None,
+            'tempos': {}
         }
+        marco = [time.time()]
+
+        def registrar_tempo(etapa):
+            # Registra a duração da etapa concluída e reinicia o cronômetro
+            agora = time.time()
+            resultado['tempos'][etapa] = round(agora - marco[0], 2)
+            marco[0] = agora
 
         try:
             # PASSO 1: Preenche o campo "Nome do Beneficiário" com o nome da cidade
             if not self.preencher_nome_cidade(cidade):
                 resultado['erro'] = "Falha ao preencher nome da cidade"
                 return resultado
+            registrar_tempo('preencher_nome')
 
             # PASSO 2: Clica no primeiro botão "Continuar" para ir para a página de seleção
             if not self.clicar_botao_continuar():
                 resultado['erro'] = "Falha ao clicar no primeiro botão continuar"
                 return resultado
+            registrar_tempo('primeiro_continuar')
 
             # PASSO 3: Seleciona especificamente a cidade do estado MG
             if not self.selecionar_cidade_mg(cidade):
                 resultado['erro'] = "Falha ao selecionar cidade em MG"
                 return resultado
+            registrar_tempo('selecionar_cidade')
 
             # PASSO 4: Preenche os campos de data inicial e final
             if not self.preencher_datas(data_inicial, data_final):
                 resultado['erro'] = "Falha ao preencher datas"
                 return resultado
+            registrar_tempo('preencher_datas')
 
             # PASSO 5: Clica no segundo botão "Continuar" para ir para a página de resultados
             if not self.clicar_segundo_botao_continuar():
                 resultado['erro'] = "Falha ao clicar no segundo botão continuar"
                 return resultado
+            registrar_tempo('segundo_continuar')
 
             # PASSO 6: Extrai dados da página de resultados (se extrator estiver configurado)
             if hasattr(self, 'data_extractor') and self.data_extractor:
-                resultado_extracao = self.data_extractor.processar_pagina_resultados(self.navegador, cidade)
+                resultado_extracao = self.extrair_resultados(cidade)
                 if resultado_extracao.get('sucesso'):
                     print(f"{cidade.title()}: {resultado_extracao.get('registros_encontrados', 0)} registros")
-                    resultado['arquivo'] = resultado_extracao.get('arquivo')
+                    resultado['arquivo'] = resultado_extracao.get('arquivo_salvo')
+                registrar_tempo('extrair_dados')
 
             resultado['sucesso'] = True
             print(f"✓ Processamento concluído para {cidade}")
@@ -408,25 +492,29 @@ class BotBBDAF(BotBase):
         Returns:
             dict: Estatísticas do processamento (sucessos, erros, total)
         """
+        cidades = self._itens_pendentes(cidades)
         estatisticas = ReportGenerator.criar_estatisticas(len(cidades))
+        self._reinicios_sessao = 0
 
         for i, cidade in enumerate(cidades, 1):
             print(f"Processando {i}/{len(cidades)}: {cidade.title()}")
 
-            # Processa a cidade atual (sem gerar relatório individual)
-            resultado = self.processar_cidade(cidade, data_inicial, data_final, gerar_relatorio=False)
+            # Processa a cidade atual (sem gerar relatório individual); navegador caído é reaberto e a cidade repetida
+            resultado = self._processar_supervisionado(
+                lambda: self.processar_cidade(cidade, data_inicial, data_final, gerar_relatorio=False), cidade)
             ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+            self._registrar_diario(resultado)
+            reciclar = self._vigiar_memoria(cidade)
 
             # Volta para a página inicial para a próxima cidade (exceto na última)
-            if i < len(cidades):
-                if not self.voltar_pagina_inicial():
-                    print("Erro crítico: Impossível continuar")
-                    break
-
-                # Pausa entre as cidades
-                time.sleep(SISTEMA_CONFIG['pausa_entre_cidades'])
+            # Navegador acima do limite de memória, caído ou travado é trocado por um novo, já na página inicial
+            if i < len(cidades) and not self._restaurar_estado_inicial(reciclar):
+                print("Erro crítico: Impossível continuar")
+                self._registrar_sessao_perdida(cidades[i:], estatisticas)
+                break
 
         ReportGenerator.calcular_taxa_sucesso(estatisticas)
+        self._imprimir_resumo_memoria()
 
         try:
             arquivo_relatorio = self.report_gen.gerar_relatorio(
@@ -462,6 +550,7 @@ class BotBBDAF(BotBase):
         """Processa lote para uso paralelo - sem lógica de threading"""
         print(f"\n=== LOTE BBDAF: {len(cidades)} cidades ===")
         stats = ReportGenerator.criar_estatisticas(len(cidades))
+        self._reinicios_sessao = 0
         for i, cidade in enumerate(cidades, 1):
             # Check cancellation before processing
             if self._cancelado:
@@ -469,26 +558,76 @@ class BotBBDAF(BotBase):
                 break
 
             print(f"{i}/{len(cidades)}: {cidade.title()}")
-            ReportGenerator.atualizar_estatisticas(stats,
-                self.processar_cidade(cidade, data_inicial, data_final, gerar_relatorio=False))
+            resultado = self._processar_supervisionado(
+                lambda: self.processar_cidade(cidade, data_inicial, data_final, gerar_relatorio=False), cidade)
+            ReportGenerator.atualizar_estatisticas(stats, resultado)
+            self._registrar_diario(resultado)
+            reciclar = self._vigiar_memoria(cidade)
 
             # Check cancellation immediately after processing to stop before next iteration
             if self._cancelado:
                 print(f"\nProcessamento cancelado após processar {cidade}")
                 break
 
-            if i < len(cidades) and not self.voltar_pagina_inicial():
+            # Próxima cidade: página inicial, ou navegador novo se o atual passou do limite de memória, caiu ou travou
+            if i < len(cidades) and not self._restaurar_estado_inicial(reciclar):
+                print("Erro crítico: Impossível continuar o lote")
+                self._registrar_sessao_perdida(cidades[i:], stats)
                 break
 
-            if not self._cancelado:
-                time.sleep(0.5)
-
         ReportGenerator.calcular_taxa_sucesso(stats)
         ReportGenerator.imprimir_estatisticas(stats, "LOTE CONCLUÍDO")
+        self._imprimir_resumo_memoria()
         return {'sucesso': True, 'estatisticas': stats}
 
+    def iniciar_sessao(self) -> bool:
+        """Abre o navegador já na página inicial (uso no motor paralelo)"""
+        return self.configurar_navegador() and self.abrir_pagina_inicial()
+
+    def processar_item(self, item: Dict) -> Dict:
+        """Processa o item {'municipio', 'data_inicial', 'data_final'} sem relatório individual"""
+        return self.processar_cidade(item['municipio'], item['data_inicial'], item['data_final'],
+                                     gerar_relatorio=False)
+
+    def _registrar_sessao_perdida(self, cidades: List[str], estatisticas: Dict):
+        """Conta como erro as cidades que ficaram sem navegador (não somem do relatório nem do diário)"""
+        for cidade in cidades:
+            resultado = {'sucesso': False, 'municipio': cidade, 'erro': ERRO_SESSAO_PERDIDA}
+            ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+            self._registrar_diario(resultado)
+
+    def preparar_proximo_item(self) -> bool:
+        """Volta para a página inicial e aguarda o formulário ficar pronto"""
+        if not self.voltar_pagina_inicial():
+            return False
+        self._aguardar_pronto('bbdaf_entre_cidades', self._formulario_pronto(),
+                              SISTEMA_CONFIG['pausa_entre_cidades'])
+        return True
+
+    def processar_fila_cidades(self, obter_proxima_cidade, data_inicial: str, data_final: str,
+                               callback_resultado=None) -> Dict[str, any]:
+        """
+        Processa cidades retiradas sob demanda de uma fila compartilhada (uso paralelo)
+
+        Args:
+            obter_proxima_cidade (callable): Retorna a próxima cidade ou None quando a fila acabar
+            data_inicial (str): Data inicial no formato DD/MM/AAAA
+            data_final (str): Data final no formato DD/MM/AAAA
+            callback_resultado (callable): Chamado com o resultado de cada cidade assim que termina
+
+        Returns:
+            Dict: Sucesso e estatísticas das cidades processadas por esta instância
+        """
+        def obter_proximo_item():
+            cidade = obter_proxima_cidade()
+            if cidade is None:
+                return None
+            return {'municipio': cidade, 'data_inicial': data_inicial, 'data_final': data_final}
+
+        return self.processar_fila(obter_proximo_item, callback_resultado)
+
     def executar_completo(self, cidades: List[str] = None, data_inicial: str = None, 
-                         data_final: str = None, arquivo_cidades: str = None):
+                         data_final: str = None, arquivo_cidades: str = None, retomar: bool = False):
         """
         Executa o processamento completo com todos os passos
         
@@ -497,6 +636,7 @@ class BotBBDAF(BotBase):
             data_inicial: Data inicial ou None para calcular automaticamente
             data_final: Data final ou None para calcular automaticamente
             arquivo_cidades: Arquivo de cidades customizado
+            retomar: Pula as cidades já concluídas numa execução anterior com as mesmas datas
         
         Returns:
             dict: Estatísticas do processamento
@@ -520,6 +660,7 @@ class BotBBDAF(BotBase):
             
             print(f"Período: {data_inicial} até {data_final}")
             print(f"Total de cidades: {len(cidades)}")
+            self.configurar_diario({'data_inicial': data_inicial, 'data_final': data_final}, retomar)
             
             # 3. Configura navegador
             if not self.configurar_navegador():
@@ -547,7 +688,7 @@ class BotBBDAF(BotBase):
             return {'sucesso': False, 'erro': str(e)}
     
     def executar_paralelo(self, num_instancias: int, data_inicial: str = None, 
-                         data_final: str = None):
+                         data_final: str = None, retomar: bool = False):
         """
         Executa processamento paralelo com múltiplas instâncias
         
@@ -555,71 +696,33 @@ class BotBBDAF(BotBase):
             num_instancias: Número de instâncias paralelas
             data_inicial: Data inicial ou None para calcular automaticamente
             data_final: Data final ou None para calcular automaticamente
+            retomar: Pula as cidades já concluídas numa execução anterior com as mesmas datas
         
         Returns:
             dict: Resultados consolidados de todas as instâncias
         """
         try:
-            # 1. Prepara divisão de cidades
-            city_splitter = CitySplitter()
-            resultado_divisao = city_splitter.dividir_cidades(num_instancias)
-            
-            if not resultado_divisao.get('sucesso'):
-                return {'sucesso': False, 'erro': resultado_divisao.get('erro')}
-            
-            # 2. Calcula datas se necessário
+            # Instâncias consomem uma fila compartilhada de cidades (sem divisão estática)
+            from src.classes.methods.parallel_processor import ProcessadorParalelo
             if data_inicial is None or data_final is None:
-                date_calculator = DateCalculator()
-                data_inicial, data_final = date_calculator.obter_datas_formatadas()
+                data_inicial, data_final = DateCalculator().obter_datas_formatadas()
             
-            arquivos_criados = resultado_divisao['arquivos_criados']
-            resultados = []
-            
-            # 3. Executa instâncias em paralelo
-            with concurrent.futures.ThreadPoolExecutor(max_workers=num_instancias) as executor:
-                futures = []
-                
-                for arquivo_info in arquivos_criados:
-                    # Cria nova instância do bot para cada thread
-                    bot = BotBBDAF()
-                    bot.configurar_extrator_dados(DataExtractor("bbdaf"))
-                    
-                    # Submete para execução
-                    future = executor.submit(
-                        bot.executar_completo,
-                        arquivo_cidades=arquivo_info['arquivo'],
-                        data_inicial=data_inicial,
-                        data_final=data_final
-                    )
-                    futures.append((future, arquivo_info))
-                
-                # Coleta resultados
-                for future, arquivo_info in futures:
-                    resultado = future.result()
-                    resultado['instancia'] = arquivo_info['instancia']
-                    resultados.append(resultado)
-                    
-                    # Remove arquivo temporário
-                    try:
-                        os.remove(arquivo_info['arquivo'])
-                    except:
-                        pass
+            processador = ProcessadorParalelo()
+            processador.diario = self.configurar_diario(
+                {'data_inicial': data_inicial, 'data_final': data_final}, retomar
+            )
+            resultado = processador.executar_paralelo_threads(
+                num_instancias, data_inicial, data_final
+            )
             
-            # 4. Consolida estatísticas
-            total_sucessos = sum(r['estatisticas']['sucessos'] for r in resultados if r.get('sucesso'))
-            total_erros = sum(r['estatisticas']['erros'] for r in resultados if r.get('sucesso'))
-            total_cidades = sum(r['estatisticas']['total'] for r in resultados if r.get('sucesso'))
+            if not resultado.get('sucesso'):
+                return {'sucesso': False, 'erro': resultado.get('erro')}
             
             return {
                 'sucesso': True,
-                'resultados_instancias': resultados,
-                'estatisticas_consolidadas': {
-                    'total': total_cidades,
-                    'sucessos': total_sucessos,
-                    'erros': total_erros,
-                    'taxa_sucesso': (total_sucessos / total_cidades * 100) if total_cidades > 0 else 0
-                }
+                'resultados_instancias': resultado['detalhes'],
+                'estatisticas_consolidadas': resultado['estatisticas']
             }
             
         except Exception as e:
-            return {'sucesso': False, 'erro': str(e)} 
\ No newline at end of file
+            return {'sucesso': False, 'erro': str(e)}
@@ -6,21 +6,19 @@ Contém toda a lógica de scraping e navegação
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
 from selenium.common.exceptions import TimeoutException
 import sys
 import os
-import time
 from typing import Dict, Optional
 from datetime import datetime
 import unicodedata
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from src.classes.chrome_driver import ChromeDriverSimples
 from src.classes.file.file_converter import FileConverter
 from src.classes.methods.cancel_method import BotBase
+from src.classes.methods.waits import AngularEstavel, DomEstavel, RedeOciosa, ElementoPresente, Todas
 
 
 class BotBetha(BotBase):
@@ -64,11 +62,9 @@ class BotBetha(BotBase):
             file_converter = FileConverter(nome_cidade_normalizado)
             download_dir = file_converter.obter_pasta_temp()
             
-            driver_simples = ChromeDriverSimples(download_dir=download_dir)
-            self.navegador = driver_simples.conectar()
-            
-            if self.navegador:
-                self.wait = WebDriverWait(self.navegador, self.timeout)
+            # Cada relatório usa um bot novo: o navegador vem do pool em vez de abrir outro Chrome
+            if self._emprestar_navegador(download_dir=download_dir, headless=False, site='betha'):
+                self.wait = self._espera(self.navegador, self.timeout)
                 print("✓ Navegador configurado com sucesso")
                 return True
             else:
@@ -88,8 +84,8 @@ class BotBetha(BotBase):
         """
         try:
             print(f"Navegando para: {self.url}")
-            self.navegador.get(self.url)
-            time.sleep(0.3)  # Aguarda carregamento inicial
+            self._navegar(self.url)
+            self._aguardar_pronto('betha_pagina_login', ElementoPresente(By.ID, "login:iUsuarios"), 0.3)
             print("✓ Página carregada")
             return True
             
@@ -125,7 +121,7 @@ class BotBetha(BotBase):
             print("  - Clicando em Acessar...")
             botao_acessar = self.navegador.find_element(By.XPATH, "//span[@class='text' and text()='Acessar']")
             botao_acessar.click()
-            time.sleep(0.8)  # Aguarda login processar
+            self._aguardar_pronto('betha_login', Todas(RedeOciosa(), AngularEstavel()), 0.8)
 
             print("✓ Login realizado com sucesso")
             return True
@@ -146,19 +142,19 @@ class BotBetha(BotBase):
             bool: True se fechou a propaganda, False se não encontrou
         """
         try:
-            # Aguarda um pouco para o popup aparecer
-            time.sleep(1)
+            # Aguarda a página assentar para o popup aparecer
+            self._aguardar_pronto('betha_propaganda', Todas(RedeOciosa(), DomEstavel()), 1)
 
             # Tenta encontrar o botão de fechar propaganda com timeout curto
             print("  - Verificando propaganda...")
-            botao_fechar = WebDriverWait(self.navegador, 3).until(
+            botao_fechar = self._espera(self.navegador, 3).until(
                 EC.element_to_be_clickable((By.ID, "btn-banner-close-rankingStn2025"))
             )
 
             # Clica no botão "Não mostrar novamente"
             botao_fechar.click()
             print("  ✓ Propaganda fechada")
-            time.sleep(0.5)  # Aguarda fechar
+            self._aguardar_pronto('betha_fechar_propaganda', DomEstavel(), 0.5)
             return True
 
         except TimeoutException:
@@ -187,7 +183,7 @@ class BotBetha(BotBase):
                 EC.element_to_be_clickable((By.XPATH, f"//h3[@class='ng-binding' and text()='{municipio_texto}']"))
             )
             municipio.click()
-            time.sleep(0.2)  # Aguarda carregar
+            self._aguardar_pronto('betha_navegacao', AngularEstavel(), 0.2)
 
             print(f"✓ {municipio_texto} selecionado")
 
@@ -219,7 +215,7 @@ class BotBetha(BotBase):
                 EC.element_to_be_clickable((By.XPATH, f"//h3[@class='ng-binding' and text()='{exercicio_texto}']"))
             )
             exercicio.click()
-            time.sleep(0.2)  # Aguarda carregar
+            self._aguardar_pronto('betha_navegacao', AngularEstavel(), 0.2)
             
             print(f"✓ {exercicio_texto} selecionado")
             return True
@@ -244,7 +240,7 @@ class BotBetha(BotBase):
             # Envia F4 para o body da página
             body = self.navegador.find_element(By.TAG_NAME, "body")
             body.send_keys(Keys.F4)
-            time.sleep(0.2)  # Aguarda ação ser processada
+            self._aguardar_pronto('betha_f4', DomEstavel(), 0.2)
             
             print("✓ F4 pressionado")
             return True
@@ -268,7 +264,7 @@ class BotBetha(BotBase):
                 EC.element_to_be_clickable((By.XPATH, "//a[@data-ng-click=\"executandoCtrl.alterarVisualizacao('RELATORIOSFAVORITOS')\"]"))
             )
             relatorios_favoritos.click()
-            time.sleep(0.2)  # Aguarda carregar
+            self._aguardar_pronto('betha_navegacao', AngularEstavel(), 0.2)
 
             print("✓ Relatórios Favoritos acessado")
             return True
@@ -430,6 +426,37 @@ class BotBetha(BotBase):
             print(f"\n✗ Erro inesperado: {e}")
             return resultado
     
+    def iniciar_sessao(self) -> bool:
+        """O script de cada cidade cria seus próprios navegadores - nada a preparar"""
+        return True
+
+    def processar_item(self, item: Dict) -> Dict:
+        """
+        Processa o item {'cidade_config', 'ano'} com executar_completo
+
+        Returns:
+            Dict: Resultado no formato do motor paralelo (municipio, ano, sucesso, erro)
+        """
+        cidade_config = item['cidade_config']
+        self.nome_cidade = cidade_config.get('nome', '')
+        self.usuario = cidade_config.get('Login', '')
+        self.senha = cidade_config.get('Senha', '')
+        self.ano = item['ano']
+
+        resultado = self.executar_completo()
+        self.fechar_navegador()
+
+        return {
+            'municipio': self.nome_cidade,
+            'ano': self.ano,
+            'sucesso': resultado['sucesso'],
+            'erro': None if resultado['sucesso'] else resultado['mensagem']
+        }
+
+    def descrever_item(self, item: Dict) -> str:
+        """Cidade e ano da tarefa"""
+        return f"{item['cidade_config'].get('nome', '')} - {item['ano']}"
+
     # Métodos de cancelamento e fechamento herdados de BotBase
     
     def _remover_acentos(self, texto):
@@ -487,7 +514,8 @@ class BotBetha(BotBase):
                     try:
                         # Tentar passar o callback de cancelamento
                         return funcao_script(None, None, self.ano, nome_cidade_normalizado,
-                                           cancelado_callback=lambda: self._cancelado)
+                                           cancelado_callback=lambda: self._cancelado,
+                                           token=self.token)
                     except TypeError:
                         # Se o script não aceita o parâmetro cancelado_callback, executar sem ele
                         print("  → Script não suporta cancelamento, executando sem callback")
@@ -3,20 +3,19 @@
 Bot de scraping para o sistema de Consulta de saldo do FNS (Fundo Nacional de Saúde) extraindo dados de contas bancárias para municípios de Minas Gerais
 """
 
-from selenium import webdriver
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from src.classes.chrome_driver import ChromeDriverSimples
 from src.classes.methods.cancel_method import BotBase
+from src.classes.chrome_driver import relatorio_bloqueio
+from src.classes.methods.waits import AngularEstavel, RedeOciosa, ElementoPronto, Todas
+from src.classes.methods.dom_extract import textos_opcoes
 from src.classes.central import CONSFNS_CONFIG, SELETORES_CONSFNS, MENSAGENS
 from src.classes.report_generator import ReportGenerator
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import os
 import glob
 from datetime import datetime
@@ -55,6 +54,7 @@ class BotConsFNS(BotBase):
         self._criar_diretorios()
         self.report_gen = ReportGenerator(self.diretorio_consfns, "RELATORIO_CONSFNS")
         self.processador_paralelo = None
+        self.diretorio_download = self.diretorio_saida
 
     def _criar_diretorios(self):
         """Cria estrutura de diretórios necessária"""
@@ -75,18 +75,12 @@ class BotConsFNS(BotBase):
         return False
 
     def configurar_navegador(self) -> bool:
-        """Configura o navegador Chrome com diretório de download personalizado"""
+        """Empresta um navegador Chrome headless do pool, com downloads no diretório desta instância"""
         try:
-            # Configura Chrome em modo headless (execução em background)
-            opcoes = webdriver.ChromeOptions()
-            opcoes.add_argument("--headless=new")
-            opcoes.add_argument("--disable-gpu")
-            opcoes.add_argument("--window-size=1920,1080")
-
-            driver_simples = ChromeDriverSimples(download_dir=self.diretorio_saida)
-            self.navegador = driver_simples.conectar(chrome_options=opcoes)
-            if self.navegador:
-                self.wait = WebDriverWait(self.navegador, self.timeout)
+            self.diretorio_download = self._diretorio_download(self.diretorio_saida)
+            if self._emprestar_navegador(download_dir=self.diretorio_download, headless=True, site='consfns',
+                                         acompanhar_downloads=True):
+                self.wait = self._espera(self.navegador, self.timeout)
                 print("✓ Navegador Chrome configurado com sucesso")
                 return True
             else:
@@ -100,9 +94,9 @@ class BotConsFNS(BotBase):
         """Abre a página Consulta FNS"""
         try:
             print(f"Abrindo página Consulta FNS...")
-            self.navegador.get(self.base_url)
+            self._navegar(self.base_url)
             self.wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, SELETORES_CONSFNS['select_estado'])))
-            time.sleep(1.5)
+            self._aguardar_pronto('consfns_abrir_pagina', Todas(RedeOciosa(), AngularEstavel()), 1.5)
             print("✓ Página Consulta FNS carregada com sucesso")
             return True
         except TimeoutException:
@@ -117,13 +111,16 @@ class BotConsFNS(BotBase):
         try:
             print(f"Preenchendo formulário para {municipio}")
             print("Selecionando estado MINAS GERAIS...")
-            time.sleep(1)
+            self._aguardar_pronto('consfns_antes_estado',
+                                  Todas(ElementoPronto(By.CSS_SELECTOR, SELETORES_CONSFNS['select_estado']),
+                                        AngularEstavel()), 1)
             select_estado = Select(self.navegador.find_element(By.CSS_SELECTOR, SELETORES_CONSFNS['select_estado']))
             select_estado.select_by_visible_text(CONSFNS_CONFIG['uf_padrao'])
-            WebDriverWait(self.navegador, 10).until(
+            self._espera(self.navegador, 10).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, SELETORES_CONSFNS['select_municipio']))
             )
-            time.sleep(1)
+            # Lista de municípios vem de uma requisição do AngularJS
+            self._aguardar_pronto('consfns_lista_municipios', Todas(RedeOciosa(), AngularEstavel()), 1)
             if not self._selecionar_municipio(municipio):
                 print(f"✗ Município '{municipio}' não encontrado na lista")
                 return False
@@ -142,11 +139,11 @@ class BotConsFNS(BotBase):
         try:
             select_municipio = Select(self.navegador.find_element(By.CSS_SELECTOR, SELETORES_CONSFNS['select_municipio']))
             nome_procurado = nome_municipio.upper().strip()
-            for opcao in select_municipio.options:
-                texto_opcao = opcao.text.upper().strip()
-                if nome_procurado == texto_opcao or nome_procurado in texto_opcao:
-                    select_municipio.select_by_visible_text(opcao.text)
-                    print(f"✓ Município selecionado: {opcao.text}")
+            # Textos de todas as opções numa única chamada ao navegador
+            for texto_opcao in textos_opcoes(self.navegador, SELETORES_CONSFNS['select_municipio']):
+                if nome_procurado in texto_opcao.upper():
+                    select_municipio.select_by_visible_text(texto_opcao)
+                    print(f"✓ Município selecionado: {texto_opcao}")
                     return True
             return False
         except Exception as e:
@@ -156,14 +153,15 @@ class BotConsFNS(BotBase):
     def _verificar_e_selecionar_esfera(self) -> bool:
         """Verifica se o campo 'esfera' aparece e seleciona 'MUNICIPAL' (campo condicional)"""
         try:
-            WebDriverWait(self.navegador, 1).until(
+            self._espera(self.navegador, 1).until(
                 EC.presence_of_element_located((By.CSS_SELECTOR, SELETORES_CONSFNS['select_esfera']))
             )
             print("Campo 'esfera' detectado - selecionando MUNICIPAL...")
             select_esfera = Select(self.navegador.find_element(By.CSS_SELECTOR, SELETORES_CONSFNS['select_esfera']))
             select_esfera.select_by_value("MUNICIPAL")
             if CONSFNS_CONFIG['pausa_apos_selecao_esfera'] > 0:
-                time.sleep(CONSFNS_CONFIG['pausa_apos_selecao_esfera'])
+                self._aguardar_pronto('consfns_apos_esfera', AngularEstavel(),
+                                      CONSFNS_CONFIG['pausa_apos_selecao_esfera'])
             self._campo_esfera_presente = True
             print("✓ Esfera selecionada: MUNICIPAL")
             return True
@@ -180,12 +178,14 @@ class BotConsFNS(BotBase):
             botao_consultar = self.navegador.find_element(By.CSS_SELECTOR, SELETORES_CONSFNS['botao_consultar'])
             botao_consultar.click()
             print(MENSAGENS['consfns_aguardando'])
-            WebDriverWait(self.navegador, self.timeout_carregamento_max).until(
+            self._espera(self.navegador, self.timeout_carregamento_max).until(
                 EC.element_to_be_clickable((By.CSS_SELECTOR, SELETORES_CONSFNS['botao_gerar_planilha']))
             )
             if self._campo_esfera_presente:
-                print("⏳ Campo 'esfera' detectado - aguardando 30s para garantir carregamento completo...")
-                time.sleep(30)
+                print("⏳ Campo 'esfera' detectado - aguardando o carregamento completo (até 30s)...")
+                if not self._aguardar_pronto('consfns_resultado_esfera',
+                                             Todas(RedeOciosa(quieto_ms=1500), AngularEstavel()), 30):
+                    return False
                 print("✓ Aguardo concluído")
             print("✓ Consulta executada e resultados carregados")
             return True
@@ -205,61 +205,39 @@ class BotConsFNS(BotBase):
                     print(MENSAGENS['consfns_download'])
                 else:
                     print(f"⚠️ Tentativa {tentativa}/{max_tentativas} - Tentando baixar novamente...")
-                arquivos_antes = set(os.listdir(self.diretorio_saida))
+                marca = self._marcar_download()
                 botao_gerar = self.navegador.find_element(By.CSS_SELECTOR, SELETORES_CONSFNS['botao_gerar_planilha'])
                 botao_gerar.click()
                 if CONSFNS_CONFIG['pausa_antes_download'] > 0:
-                    time.sleep(CONSFNS_CONFIG['pausa_antes_download'])
-                arquivo_baixado = self._aguardar_download(arquivos_antes, timeout=30)
-                if arquivo_baixado:
-                    arquivo_final = self._renomear_arquivo(arquivo_baixado, municipio)
+                    self._aguardar(CONSFNS_CONFIG['pausa_antes_download'])
+                download = self._aguardar_download(marca, 30, ('.xlsx',))
+                if download:
+                    print(f"✓ Arquivo .xlsx baixado: {download['nome']} ({download['bytes']} bytes)")
+                    arquivo_final = self._renomear_arquivo(download['caminho'], municipio, download['nome'])
                     print(f"✓ Planilha gerada: {arquivo_final}")
                     return arquivo_final
                 else:
                     if tentativa < max_tentativas:
                         print(f"⚠️ Arquivo .xlsx não foi baixado - aguardando antes de tentar novamente...")
-                        time.sleep(2)
+                        self._aguardar(2)
                     else:
                         print(f"✗ Falha após {max_tentativas} tentativas - arquivo .xlsx não foi baixado")
                         return None
             except Exception as e:
                 if tentativa < max_tentativas:
                     print(f"⚠️ Erro na tentativa {tentativa}: {e} - tentando novamente...")
-                    time.sleep(2)
+                    self._aguardar(2)
                 else:
                     print(f"✗ Erro ao gerar planilha após {max_tentativas} tentativas: {e}")
                     return None
         return None
 
-    def _aguardar_download(self, arquivos_antes: set, timeout: int = 30) -> Optional[str]:
-        """Aguarda um arquivo .xlsx ser baixado no diretório"""
-        tempo_inicio = time.time()
-        while time.time() - tempo_inicio < timeout:
-            if self._cancelado:
-                return None
-            arquivos_agora = set(os.listdir(self.diretorio_saida))
-            novos_arquivos = arquivos_agora - arquivos_antes
-            arquivos_xlsx = [f for f in novos_arquivos
-                           if f.endswith('.xlsx') and not f.endswith(('.crdownload', '.tmp', '.html'))]
-            if arquivos_xlsx:
-                arquivo_path = os.path.join(self.diretorio_saida, arquivos_xlsx[0])
-                if os.path.exists(arquivo_path) and os.path.getsize(arquivo_path) > 0:
-                    time.sleep(1)
-                    print(f"✓ Arquivo .xlsx detectado: {arquivos_xlsx[0]} ({os.path.getsize(arquivo_path)} bytes)")
-                    return arquivo_path
-            time.sleep(0.5)
-        return None
-
-    def _renomear_arquivo(self, arquivo_original: str, municipio: str) -> str:
-        """Renomeia arquivo baixado com nome do município"""
+    def _renomear_arquivo(self, arquivo_original: str, municipio: str, nome_sugerido: str = None) -> str:
+        """Renomeia arquivo baixado com nome do município (extensão do nome sugerido pelo site, se houver)"""
         try:
-            nome_municipio_limpo = municipio.replace(" ", "_").replace("/", "_").upper()
-            _, extensao = os.path.splitext(arquivo_original)
-            if not extensao:
-                extensao = '.xlsx'
-            novo_nome = f"{nome_municipio_limpo}{extensao}"
-            caminho_final = os.path.join(self.diretorio_saida, novo_nome)
-            # Rename in place (file already in diretorio_saida)
+            _, extensao = os.path.splitext(nome_sugerido or arquivo_original)
+            caminho_final = self._caminho_planilha(municipio, extensao or '.xlsx')
+            # Move para diretorio_saida (em execução paralela o download fica na subpasta da instância)
             if arquivo_original != caminho_final:
                 os.rename(arquivo_original, caminho_final)
             return caminho_final
@@ -267,6 +245,37 @@ class BotConsFNS(BotBase):
             print(f"Aviso: Erro ao renomear arquivo - {e}")
             return arquivo_original
 
+    def _caminho_planilha(self, municipio: str, extensao: str = '.xlsx') -> str:
+        """Caminho final da planilha do município (CONSFNS/<data>/<MUNICIPIO>.xlsx)"""
+        nome_municipio_limpo = municipio.replace(" ", "_").replace("/", "_").upper()
+        return os.path.join(self.diretorio_saida, f"{nome_municipio_limpo}{extensao}")
+
+    def _consultar_selenium(self, municipio: str, resultado: Dict) -> Optional[str]:
+        """Consulta pelo navegador: abre o Chrome, preenche, consulta e baixa a planilha"""
+        print("Abrindo Chrome para este município...")
+        if self._verificar_cancelamento(resultado) or not self.configurar_navegador():
+            resultado['erro'] = resultado.get('erro') or "Falha ao configurar navegador Chrome"
+            return None
+
+        if self._verificar_cancelamento(resultado) or not self.abrir_pagina_consfns():
+            resultado['erro'] = resultado.get('erro') or "Falha ao abrir página ConsFNS"
+            return None
+
+        if self._verificar_cancelamento(resultado) or not self.preencher_formulario(municipio):
+            resultado['erro'] = resultado.get('erro') or "Falha ao preencher formulário"
+            return None
+
+        if self._verificar_cancelamento(resultado) or not self.executar_consulta():
+            resultado['erro'] = resultado.get('erro') or "Falha ao executar consulta"
+            return None
+
+        if self._verificar_cancelamento(resultado):
+            return None
+        arquivo_salvo = self.gerar_planilha(municipio)
+        if not arquivo_salvo:
+            resultado['erro'] = "Falha ao gerar planilha"
+        return arquivo_salvo
+
     def processar_municipio(self, municipio: str) -> Dict[str, any]:
         """Processa um município específico com sessão Chrome dedicada"""
         resultado = {'municipio': municipio, 'sucesso': False, 'erro': None, 'arquivo': None}
@@ -277,28 +286,8 @@ class BotConsFNS(BotBase):
             self._em_execucao = True
             print(f"\n=== Processando: {municipio} ===")
 
-            print("Abrindo Chrome para este município...")
-            if self._verificar_cancelamento(resultado) or not self.configurar_navegador():
-                resultado['erro'] = resultado.get('erro') or "Falha ao configurar navegador Chrome"
-                return resultado
-
-            if self._verificar_cancelamento(resultado) or not self.abrir_pagina_consfns():
-                resultado['erro'] = resultado.get('erro') or "Falha ao abrir página ConsFNS"
-                return resultado
-
-            if self._verificar_cancelamento(resultado) or not self.preencher_formulario(municipio):
-                resultado['erro'] = resultado.get('erro') or "Falha ao preencher formulário"
-                return resultado
-
-            if self._verificar_cancelamento(resultado) or not self.executar_consulta():
-                resultado['erro'] = resultado.get('erro') or "Falha ao executar consulta"
-                return resultado
-
-            if self._verificar_cancelamento(resultado):
-                return resultado
-            arquivo_salvo = self.gerar_planilha(municipio)
+            arquivo_salvo = self._consultar_selenium(municipio, resultado)
             if not arquivo_salvo:
-                resultado['erro'] = "Falha ao gerar planilha"
                 return resultado
 
             resultado['sucesso'] = True
@@ -330,20 +319,23 @@ class BotConsFNS(BotBase):
 
         return resultado
 
-    def processar_todos_municipios(self) -> Dict[str, any]:
-        """Processa todos os municípios de MG"""
+    def processar_todos_municipios(self, retomar: bool = False) -> Dict[str, any]:
+        """Processa todos os municípios de MG (retomar pula os já concluídos hoje)"""
         print(f"\n{MENSAGENS['inicio_consfns']}")
         print(f"{MENSAGENS['consfns_todos_municipios']}")
-        print(f"Total de municípios: {len(self.municipios_mg)}")
-        estatisticas = ReportGenerator.criar_estatisticas(len(self.municipios_mg))
+        self.configurar_diario(self._parametros_diario(), retomar)
+        municipios = self._itens_pendentes(self.municipios_mg)
+        print(f"Total de municípios: {len(municipios)}")
+        estatisticas = ReportGenerator.criar_estatisticas(len(municipios))
         try:
-            for i, municipio in enumerate(self.municipios_mg, 1):
+            for i, municipio in enumerate(municipios, 1):
                 if self._cancelado:
                     print(f"\nProcessamento cancelado no município {i}")
                     break
-                print(f"\nProgresso: {i}/{len(self.municipios_mg)} municípios")
+                print(f"\nProgresso: {i}/{len(municipios)} municípios")
                 resultado = self.processar_municipio(municipio)
                 ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+                self._registrar_diario(resultado)
         except Exception as e:
             print(f"Erro durante processamento em lote: {e}")
         ReportGenerator.calcular_taxa_sucesso(estatisticas)
@@ -356,9 +348,15 @@ class BotConsFNS(BotBase):
         ReportGenerator.imprimir_estatisticas(estatisticas)
         return estatisticas
 
+    def _parametros_diario(self) -> Dict[str, str]:
+        """A consulta não tem parâmetros - o diário vale para os downloads do dia"""
+        return {'data': datetime.now().strftime('%Y-%m-%d')}
+
     def limpar_recursos(self):
         """Limpa todos os recursos e fecha navegador com segurança"""
         try:
+            if self._liberar_navegador(descartar=self._cancelado):
+                return
             if hasattr(self, 'navegador') and self.navegador:
                 try:
                     for handle in self.navegador.window_handles:
@@ -366,6 +364,7 @@ class BotConsFNS(BotBase):
                         self.navegador.close()
                 except:
                     pass
+                relatorio_bloqueio(self.navegador)
                 self.navegador.quit()
                 self.navegador = None
                 self.wait = None
@@ -390,6 +389,10 @@ class BotConsFNS(BotBase):
         """Mantido para compatibilidade - usar cancelar(forcado=True)"""
         self.cancelar(forcado=True)
 
+    def iniciar_sessao(self) -> bool:
+        """Cada município abre sua própria sessão Chrome - nada a preparar"""
+        return True
+
     def processar_lote_municipios(self, municipios: List[str]) -> Dict[str, any]:
         """Processa lote para uso paralelo - sem lógica de threading"""
         print(f"\n=== LOTE CONSFNS: {len(municipios)} municípios ===")
@@ -407,19 +410,21 @@ class BotConsFNS(BotBase):
                 break
 
             if not self._cancelado:
-                time.sleep(0.5)
+                self._aguardar(0.5)
         ReportGenerator.calcular_taxa_sucesso(stats)
         ReportGenerator.imprimir_estatisticas(stats, "LOTE CONCLUÍDO")
         return {'sucesso': True, 'estatisticas': stats}
 
-    def executar_paralelo(self, num_instancias: int = 2) -> Dict[str, any]:
+    def executar_paralelo(self, num_instancias: int = 2, autoescalar: bool = False,
+                          retomar: bool = False) -> Dict[str, any]:
         """Executa processamento paralelo de municípios usando ProcessadorParalelo"""
         try:
             from src.classes.methods.parallel_processor import ProcessadorParalelo
             print(f"\n=== INICIANDO PROCESSAMENTO PARALELO CONSFNS ===")
             print(f"Instâncias: {num_instancias}")
             self.processador_paralelo = ProcessadorParalelo()
-            resultado = self.processador_paralelo.executar_paralelo_consfns(self, num_instancias)
+            self.processador_paralelo.diario = self.configurar_diario(self._parametros_diario(), retomar)
+            resultado = self.processador_paralelo.executar_paralelo_consfns(self, num_instancias, autoescalar)
             resultado['processador'] = self.processador_paralelo
             if resultado['sucesso']:
                 stats = resultado['estatisticas']
@@ -8,27 +8,35 @@ from selenium import webdriver
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
-from src.classes.chrome_driver import ChromeDriverSimples
-from src.classes.methods.cancel_method import BotBase
+from src.classes.chrome_driver import ChromeDriverSimples, relatorio_bloqueio
+from src.classes.methods.waits import DomEstavel
+from src.classes.methods.cancel_method import BotBase, ExecucaoCancelada
+from src.classes.methods.http_session import SessaoHTTP
+from src.classes.central import FNDE_CONFIG
 from src.classes.report_generator import ReportGenerator
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
 from bs4 import BeautifulSoup
 import pandas as pd
+import requests
 import os
 import sys
 import platform
-import time
 import io
+import threading
 from datetime import datetime
+from urllib.parse import urljoin
 from typing import List, Dict, Optional
 from src.classes.file.path_manager import obter_caminho_dados
 from src.classes.city_manager import CityManager
 
 
+class FormularioDevolvido(ValueError):
+    """Servidor respondeu ao envio com o próprio formulário (sessão ou formulário em cache vencido)"""
+    pass
+
+
 class BotFNDE(BotBase):
     """
     Bot de scraping para o site do FNDE
@@ -39,18 +47,29 @@ class BotFNDE(BotBase):
     - Extrai tabela de resultados preservando formatação
     - Salva em Excel com nome personalizado
     - Processa múltiplas cidades automaticamente
+    - Motor HTTP: envia o formulário direto ao servidor, sem abrir o navegador
     """
+
+    # Formulário do FNDE por ano (ação, método, campos e códigos dos municípios), compartilhado entre instâncias
+    _formularios_http = {}
+    _formularios_lock = threading.Lock()
+    _formularios_locks_ano = {}  # Um lock por ano: só uma instância baixa o formulário, as outras aguardam
     
-    def __init__(self, timeout=8):
+    def __init__(self, timeout=8, motor=None):
         """
         Inicializa o bot FNDE
 
         Args:
             timeout (int): Tempo limite para aguardar elementos (segundos) - otimizado para 8s
+            motor (str): 'http' (requisições diretas) ou 'selenium'; padrão em FNDE_CONFIG['motor']
         """
         super().__init__()  # Inicializa BotBase
         self.base_url = "https://www.fnde.gov.br/pls/simad/internet_fnde.LIBERACOES_01_PC"
         self.timeout = timeout
+        self.motor = motor or FNDE_CONFIG['motor']
+        if self.motor not in ('http', 'selenium'):
+            raise ValueError(f"Motor FNDE desconhecido: {self.motor}")
+        self.sessao_http = None
         self.city_manager = CityManager()
         self.municipios_mg = self.city_manager.obter_municipios_mg()
         
@@ -94,10 +113,10 @@ class BotFNDE(BotBase):
 
             # Usa a classe simples para conectar direto ao ChromeDriver
             driver_simples = ChromeDriverSimples()
-            self.navegador = driver_simples.conectar(chrome_options=opcoes)
+            self.navegador = driver_simples.conectar(chrome_options=opcoes, perfil_bloqueio='scraping', site='fnde')
 
             if self.navegador:
-                self.wait = WebDriverWait(self.navegador, self.timeout)
+                self.wait = self._espera(self.navegador, self.timeout)
                 print("✓ Navegador Chrome configurado com sucesso")
                 return True
             else:
@@ -124,7 +143,7 @@ class BotFNDE(BotBase):
             url_completa = f"{self.base_url}?p_ano={ano}&p_programa=&p_uf=MG"
             
             print(f"Abrindo página FNDE para ano {ano}...")
-            self.navegador.get(url_completa)
+            self._navegar(url_completa)
             
             # Aguarda formulário carregar
             select_ano = self.wait.until(
@@ -155,26 +174,20 @@ class BotFNDE(BotBase):
         try:
             print(f"Preenchendo formulário para {municipio} - {ano}")
             
-            # 1. Seleciona o ano
-            select_ano = Select(self.navegador.find_element(By.NAME, "p_ano"))
-            select_ano.select_by_value(ano)
-            time.sleep(0.2)
-            
-            # 2. Aguarda dropdown de municípios carregar e seleciona município
-            # Aguarda explicitamente o dropdown carregar após mudança do ano
-            WebDriverWait(self.navegador, 5).until(
-                EC.element_to_be_clickable((By.NAME, "p_municipio"))
+            # Ano recarrega a lista de municípios; município (exato, senão "contém") e entidade PREFEITURA ("02")
+            # vão num único script depois da recarga
+            preenchimento = self._preencher_formulario(
+                [('select[name="p_ano"]', ano),
+                 ('select[name="p_municipio"]', {'texto': municipio, 'parcial': True}),
+                 ('select[name="p_tp_entidade"]', '02')],
+                dependentes={'select[name="p_ano"]': 'select[name="p_municipio"]'},
+                etapa='fnde_apos_selecao', pausa_antiga=0.2
             )
-            
-            municipio_encontrado = self._selecionar_municipio(municipio)
-            if not municipio_encontrado:
-                print(f"Município '{municipio}' não encontrado na lista")
+            if not preenchimento['sucesso']:
+                print(f"Não foi possível preencher o formulário: {preenchimento['erro']}")
                 return False
-            
-            # 3. Seleciona entidade como PREFEITURA (sempre "02")
-            select_entidade = Select(self.navegador.find_element(By.NAME, "p_tp_entidade"))
-            select_entidade.select_by_value("02")  # PREFEITURA
-            time.sleep(0.1)
+            print(f"Município selecionado: {preenchimento['campos'][1]['texto']}")
+            self._aguardar_pronto('fnde_apos_entidade', DomEstavel(), 0.1)
             
             print("Formulário preenchido com sucesso")
             return True
@@ -186,44 +199,6 @@ class BotFNDE(BotBase):
             print(f"Erro ao preencher formulário: {e}")
             return False
     
-    def _selecionar_municipio(self, nome_municipio: str) -> bool:
-        """
-        Seleciona município no dropdown
-        
-        Args:
-            nome_municipio (str): Nome do município a ser selecionado
-            
-        Returns:
-            bool: True se município foi encontrado e selecionado
-        """
-        try:
-            select_municipio = Select(self.navegador.find_element(By.NAME, "p_municipio"))
-            
-            # Procura pelo município na lista de opções (otimizado)
-            nome_procurado = nome_municipio.upper().strip()
-            
-            # Primeiro tenta busca exata para economia de tempo
-            for opcao in select_municipio.options:
-                texto_opcao = opcao.text.upper().strip()
-                if nome_procurado == texto_opcao:
-                    select_municipio.select_by_visible_text(opcao.text)
-                    print(f"Município selecionado: {opcao.text}")
-                    return True
-            
-            # Se não encontrou exato, tenta busca por contém
-            for opcao in select_municipio.options:
-                texto_opcao = opcao.text.upper().strip()
-                if nome_procurado in texto_opcao:
-                    select_municipio.select_by_visible_text(opcao.text)
-                    print(f"Município selecionado: {opcao.text}")
-                    return True
-            
-            return False
-            
-        except Exception as e:
-            print(f"Erro ao selecionar município: {e}")
-            return False
-    
     def executar_busca(self) -> bool:
         """
         Clica no botão Buscar e aguarda resultado
@@ -234,19 +209,20 @@ class BotFNDE(BotBase):
         try:
             print("Executando busca...")
             
-            # Clica no botão Buscar
-            botao_buscar = self.navegador.find_element(By.NAME, "buscar")
-            botao_buscar.click()
-            
-            # Aguarda página de resultados carregar (otimizado para 6s)
-            # Procura por uma tabela ou indicador de que os dados carregaram
-            WebDriverWait(self.navegador, 6).until(
-                EC.any_of(
-                    EC.presence_of_element_located((By.TAG_NAME, "table")),
-                    EC.presence_of_element_located((By.CLASS_NAME, "tabela")),
-                    EC.presence_of_element_located((By.XPATH, "//table"))
+            # Clica no botão Buscar (consulta passa pelo governador do site)
+            with self._acesso_site(self.base_url):
+                botao_buscar = self.navegador.find_element(By.NAME, "buscar")
+                botao_buscar.click()
+                
+                # Aguarda página de resultados carregar (otimizado para 6s)
+                # Procura por uma tabela ou indicador de que os dados carregaram
+                self._espera(self.navegador, 6).until(
+                    EC.any_of(
+                        EC.presence_of_element_located((By.TAG_NAME, "table")),
+                        EC.presence_of_element_located((By.CLASS_NAME, "tabela")),
+                        EC.presence_of_element_located((By.XPATH, "//table"))
+                    )
                 )
-            )
             
             print("Busca executada e resultados carregados")
             return True
@@ -269,26 +245,214 @@ class BotFNDE(BotBase):
             print("Extraindo tabela HTML...")
             
             # Obtém HTML completo da página
-            html_pagina = self.navegador.page_source
-            
-            # Usa BeautifulSoup para encontrar e extrair tabelas
-            soup = BeautifulSoup(html_pagina, 'html.parser')
-            
-            # Procura por tabelas na página
-            tabelas = soup.find_all('table')
-            
-            if tabelas:
-                # Pega a maior tabela (provavelmente a de dados)
-                tabela_principal = max(tabelas, key=lambda t: len(str(t)))
-                print(f"Tabela extraída com {len(tabela_principal.find_all('tr'))} linhas")
-                return str(tabela_principal)
-            else:
-                print("Nenhuma tabela encontrada na página")
-                return ""
+            return self._maior_tabela(self.navegador.page_source)
                 
         except Exception as e:
             print(f"Erro ao extrair tabela HTML: {e}")
             return ""
+
+    def _maior_tabela(self, html_pagina: str) -> str:
+        """
+        Retorna o HTML da maior tabela da página (a de dados)
+
+        Args:
+            html_pagina (str): HTML completo da página de resultados
+
+        Returns:
+            str: HTML da tabela ou string vazia se não houver tabela
+        """
+        # Usa BeautifulSoup para encontrar e extrair tabelas
+        soup = BeautifulSoup(html_pagina, 'html.parser')
+        
+        # Procura por tabelas na página
+        tabelas = soup.find_all('table')
+        
+        if tabelas:
+            # Pega a maior tabela (provavelmente a de dados)
+            tabela_principal = max(tabelas, key=lambda t: len(str(t)))
+            print(f"Tabela extraída com {len(tabela_principal.find_all('tr'))} linhas")
+            return str(tabela_principal)
+        else:
+            print("Nenhuma tabela encontrada na página")
+            return ""
+
+    def _obter_sessao_http(self) -> SessaoHTTP:
+        """Cria (uma vez) a sessão HTTP do bot, com conexões reaproveitadas entre municípios"""
+        if self.sessao_http is None:
+            self.sessao_http = SessaoHTTP(token=self.token)
+        # Token pode ter sido trocado pelo do ProcessadorParalelo
+        self.sessao_http.token = self.token
+        return self.sessao_http
+
+    def carregar_formulario_http(self, ano: str) -> Optional[Dict]:
+        """
+        Lê o formulário FNDE do ano sem navegador (uma vez por ano, compartilhado entre instâncias)
+
+        Args:
+            ano (str): Ano para consulta
+
+        Returns:
+            Dict: 'acao', 'metodo', 'campos' (valores padrão) e 'municipios' (nome -> valor de p_municipio),
+                  ou None se o formulário não foi encontrado
+        """
+        with self._formularios_lock:
+            lock_ano = self._formularios_locks_ano.setdefault(ano, threading.Lock())
+
+        with lock_ano:
+            with self._formularios_lock:
+                if ano in self._formularios_http:
+                    return self._formularios_http[ano]
+            return self._baixar_formulario_http(ano)
+
+    def _baixar_formulario_http(self, ano: str) -> Optional[Dict]:
+        """Baixa e interpreta o formulário do ano (chamado com o lock do ano); guarda no cache se deu certo"""
+        url = (f"{self.base_url}?p_ano={ano}&p_programa={FNDE_CONFIG['programa_padrao']}"
+               f"&p_uf={FNDE_CONFIG['uf_padrao']}")
+        try:
+            resposta = self._obter_sessao_http().get(url)
+        except requests.RequestException as e:
+            print(f"Erro ao carregar formulário FNDE {ano}: {e}")
+            return None
+        soup = BeautifulSoup(resposta.text, 'html.parser')
+
+        select_municipio = soup.find('select', attrs={'name': 'p_municipio'})
+        if select_municipio is None:
+            print("Formulário FNDE sem lista de municípios")
+            return None
+        form = select_municipio.find_parent('form')
+
+        # Valores padrão de todos os campos, como o navegador enviaria ao clicar em Buscar
+        campos = {}
+        if form is not None:
+            for entrada in form.find_all('input'):
+                nome = entrada.get('name')
+                tipo = (entrada.get('type') or 'text').lower()
+                if not nome or tipo in ('button', 'reset', 'image', 'file'):
+                    continue
+                if tipo == 'submit' and nome != 'buscar':
+                    continue
+                if tipo in ('checkbox', 'radio') and not entrada.has_attr('checked'):
+                    continue
+                campos[nome] = entrada.get('value', '')
+            for select in form.find_all('select'):
+                nome = select.get('name')
+                opcao = select.find('option', selected=True) or select.find('option')
+                if nome and opcao is not None:
+                    campos[nome] = opcao.get('value', opcao.get_text(strip=True))
+
+        municipios = {}
+        for opcao in select_municipio.find_all('option'):
+            valor = opcao.get('value')
+            if valor:
+                municipios[opcao.get_text(strip=True).upper()] = valor
+
+        acao = form.get('action') if form is not None else None
+        formulario = {
+            'acao': urljoin(resposta.url, acao) if acao else self.base_url,
+            'metodo': ((form.get('method') if form is not None else None) or 'get').upper(),
+            'campos': campos,
+            'municipios': municipios
+        }
+        with self._formularios_lock:
+            self._formularios_http[ano] = formulario
+        print(f"Formulário FNDE {ano} carregado ({len(municipios)} municípios)")
+        return formulario
+
+    def _descartar_formulario_http(self, ano: str):
+        """Remove o formulário do ano do cache (o próximo município baixa de novo)"""
+        with self._formularios_lock:
+            self._formularios_http.pop(ano, None)
+
+    def _codigo_municipio(self, municipios: Dict[str, str], nome_municipio: str) -> Optional[str]:
+        """Valor de p_municipio do município (busca exata e depois por contém, como no dropdown)"""
+        nome_procurado = nome_municipio.upper().strip()
+        if nome_procurado in municipios:
+            return municipios[nome_procurado]
+        for texto_opcao, valor in municipios.items():
+            if nome_procurado in texto_opcao:
+                return valor
+        return None
+
+    def _tabela_resultado_http(self, html_pagina: str) -> str:
+        """
+        Tabela de liberações da resposta HTTP, conferida antes de ser salva como resultado
+
+        Args:
+            html_pagina (str): HTML devolvido pelo envio do formulário
+
+        Returns:
+            str: HTML da tabela de resultados
+
+        Raises:
+            FormularioDevolvido: servidor devolveu o formulário (sessão expirada, formulário em cache vencido)
+            ValueError: resposta não é a página de resultados (tabela ausente ou sem o cabeçalho esperado)
+        """
+        soup = BeautifulSoup(html_pagina, 'html.parser')
+        if soup.find('select', attrs={'name': 'p_municipio'}) is not None:
+            raise FormularioDevolvido("servidor devolveu o formulário em vez dos resultados")
+
+        html_tabela = self._maior_tabela(html_pagina)
+        if not html_tabela:
+            raise ValueError("resposta sem tabela de resultados")
+        tabela = BeautifulSoup(html_tabela, 'html.parser')
+        celulas = tabela.find_all('th') or (tabela.find('tr').find_all('td') if tabela.find('tr') else [])
+        cabecalho = " ".join(celula.get_text(" ", strip=True) for celula in celulas).upper()
+        faltando = [texto for texto in FNDE_CONFIG['cabecalhos_resultado'] if texto not in cabecalho]
+        if faltando:
+            raise ValueError(f"tabela sem as colunas esperadas ({', '.join(faltando)})")
+        return html_tabela
+
+    def consultar_http(self, ano: str, municipio: str) -> str:
+        """
+        Consulta as liberações do município enviando o formulário direto ao servidor
+
+        Args:
+            ano (str): Ano para consulta
+            municipio (str): Nome do município
+
+        Returns:
+            str: HTML da tabela de resultados ou string vazia se falhou
+        """
+        try:
+            print(f"Consultando {municipio} - {ano} via HTTP...")
+            formulario = self.carregar_formulario_http(ano)
+            if not formulario:
+                return ""
+
+            codigo = self._codigo_municipio(formulario['municipios'], municipio)
+            if codigo is None:
+                print(f"Município '{municipio}' não encontrado na lista")
+                return ""
+
+            campos = dict(formulario['campos'])
+            campos.update({
+                'p_ano': ano,
+                'p_uf': FNDE_CONFIG['uf_padrao'],
+                'p_programa': FNDE_CONFIG['programa_padrao'],
+                'p_municipio': codigo,
+                'p_tp_entidade': FNDE_CONFIG['entidade_padrao'],
+            })
+
+            sessao = self._obter_sessao_http()
+            if formulario['metodo'] == 'POST':
+                resposta = sessao.post(formulario['acao'], data=campos)
+            else:
+                resposta = sessao.get(formulario['acao'], params=campos)
+            try:
+                return self._tabela_resultado_http(resposta.text)
+            except FormularioDevolvido:
+                # Campos ou ação do formulário guardado podem ter mudado: o próximo município recarrega
+                self._descartar_formulario_http(ano)
+                raise
+
+        except ExecucaoCancelada:
+            return ""
+        except requests.RequestException as e:
+            print(f"Erro na consulta HTTP: {e}")
+            return ""
+        except Exception as e:
+            print(f"Erro ao processar resposta HTTP: {e}")
+            return ""
     
     def salvar_excel(self, html_tabela: str, municipio: str, ano: str) -> bool:
         """
@@ -359,6 +523,56 @@ class BotFNDE(BotBase):
             print(f"Erro ao salvar arquivo Excel: {e}")
             return False
     
+    def _consultar_selenium(self, ano: str, municipio: str, resultado: Dict) -> str:
+        """
+        Consulta a tabela pelo navegador (abre, preenche, busca e extrai)
+
+        Args:
+            ano (str): Ano para consulta
+            municipio (str): Nome do município
+            resultado (Dict): Resultado do processamento (recebe o erro da etapa que falhar)
+
+        Returns:
+            str: HTML da tabela ou string vazia se falhou
+        """
+        # Motor HTTP abre o navegador só quando precisa refazer uma consulta
+        if self.navegador is None and not self.configurar_navegador():
+            resultado['erro'] = "Falha ao configurar navegador"
+            return ""
+
+        # 1. Abre página FNDE
+        if self._cancelado:
+            resultado['erro'] = "Processamento cancelado"
+            return ""
+        if not self.abrir_pagina_fnde(ano, municipio):
+            resultado['erro'] = "Falha ao abrir página FNDE"
+            return ""
+        
+        # 2. Preenche formulário
+        if self._cancelado:
+            resultado['erro'] = "Processamento cancelado"
+            return ""
+        if not self.preencher_formulario(ano, municipio):
+            resultado['erro'] = "Falha ao preencher formulário"
+            return ""
+        
+        # 3. Executa busca
+        if self._cancelado:
+            resultado['erro'] = "Processamento cancelado"
+            return ""
+        if not self.executar_busca():
+            resultado['erro'] = "Falha ao executar busca"
+            return ""
+        
+        # 4. Extrai tabela
+        if self._cancelado:
+            resultado['erro'] = "Processamento cancelado"
+            return ""
+        html_tabela = self.extrair_tabela_html()
+        if not html_tabela:
+            resultado['erro'] = "Falha ao extrair tabela"
+        return html_tabela
+
     def processar_municipio(self, ano: str, municipio: str) -> Dict[str, any]:
         """
         Processa um município específico
@@ -387,37 +601,17 @@ class BotFNDE(BotBase):
             self._em_execucao = True
             print(f"\n=== Processando: {municipio} ({ano}) ===")
             
-            # 1. Abre página FNDE
-            if self._cancelado:
-                resultado['erro'] = "Processamento cancelado"
-                return resultado
-            if not self.abrir_pagina_fnde(ano, municipio):
-                resultado['erro'] = "Falha ao abrir página FNDE"
-                return resultado
-            
-            # 2. Preenche formulário
-            if self._cancelado:
-                resultado['erro'] = "Processamento cancelado"
-                return resultado
-            if not self.preencher_formulario(ano, municipio):
-                resultado['erro'] = "Falha ao preencher formulário"
-                return resultado
-            
-            # 3. Executa busca
-            if self._cancelado:
-                resultado['erro'] = "Processamento cancelado"
-                return resultado
-            if not self.executar_busca():
-                resultado['erro'] = "Falha ao executar busca"
-                return resultado
-            
-            # 4. Extrai tabela
-            if self._cancelado:
-                resultado['erro'] = "Processamento cancelado"
-                return resultado
-            html_tabela = self.extrair_tabela_html()
+            # 1-4. Consulta a tabela (motor HTTP, com o Selenium como reserva)
+            html_tabela = ""
+            if self.motor == 'http':
+                resultado['motor'] = 'http'
+                html_tabela = self.consultar_http(ano, municipio)
+                if not html_tabela and not self._cancelado:
+                    print("Consulta HTTP sem resultado - refazendo pelo navegador")
+            if not html_tabela:
+                resultado['motor'] = 'selenium'
+                html_tabela = self._consultar_selenium(ano, municipio, resultado)
             if not html_tabela:
-                resultado['erro'] = "Falha ao extrair tabela"
                 return resultado
             
             # 5. Salva Excel
@@ -455,37 +649,49 @@ class BotFNDE(BotBase):
         
         return resultado
     
-    def processar_todos_municipios(self, ano: str) -> Dict[str, any]:
+    def processar_todos_municipios(self, ano: str, retomar: bool = False) -> Dict[str, any]:
         """
         Processa todos os municípios de MG para um ano específico
         
         Args:
             ano (str): Ano para consulta
+            retomar (bool): Pula os municípios já concluídos numa execução anterior do mesmo ano
             
         Returns:
             Dict: Estatísticas do processamento
         """
         print(f"\n=== INICIANDO PROCESSAMENTO DE TODOS OS MUNICÍPIOS - ANO {ano} ===")
-        print(f"Total de municípios: {len(self.municipios_mg)}")
+        self.configurar_diario({'ano': ano}, retomar)
+        municipios = self._itens_pendentes(self.municipios_mg)
+        print(f"Total de municípios: {len(municipios)}")
 
-        estatisticas = ReportGenerator.criar_estatisticas(len(self.municipios_mg))
+        estatisticas = ReportGenerator.criar_estatisticas(len(municipios))
+        self._reinicios_sessao = 0
         
         try:
-            for i, municipio in enumerate(self.municipios_mg, 1):
+            for i, municipio in enumerate(municipios, 1):
                 # Verifica cancelamento antes de processar cada município
                 if self._cancelado:
                     print(f"\nProcessamento cancelado no município {i}")
                     break
                 
-                print(f"\nProgresso: {i}/{len(self.municipios_mg)} municípios")
+                print(f"\nProgresso: {i}/{len(municipios)} municípios")
 
-                resultado = self.processar_municipio(ano, municipio)
+                # Navegador caído ou travado durante o município: reabre e repete o município
+                resultado = self._processar_supervisionado(lambda: self.processar_municipio(ano, municipio), municipio)
 
                 ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+                self._registrar_diario(resultado)
+
+                # Navegador acima do limite de memória, caído ou travado: troca por um novo antes do próximo município
+                reciclar = self._vigiar_memoria(municipio)
+                if i < len(municipios) and not self._restaurar_estado_inicial(reciclar):
+                    print("Erro crítico: navegador não reabriu - impossível continuar o lote")
+                    break
                 
                 # Pequena pausa entre municípios (otimizada)
                 if not self._cancelado:
-                    time.sleep(0.2)
+                    self._aguardar(0.2)
         
         except Exception as e:
             print(f"Erro durante processamento em lote: {e}")
@@ -515,6 +721,7 @@ class BotFNDE(BotBase):
         print(f"\n=== PROCESSANDO LOTE DE {len(municipios)} MUNICÍPIOS - ANO {ano} ===")
 
         estatisticas = ReportGenerator.criar_estatisticas(len(municipios))
+        self._reinicios_sessao = 0
         
         try:
             for i, municipio in enumerate(municipios, 1):
@@ -525,13 +732,21 @@ class BotFNDE(BotBase):
                 
                 print(f"\nProgresso do lote: {i}/{len(municipios)} - {municipio}")
 
-                resultado = self.processar_municipio(ano, municipio)
+                # Navegador caído ou travado durante o município: reabre e repete o município
+                resultado = self._processar_supervisionado(lambda: self.processar_municipio(ano, municipio), municipio)
 
                 ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+                self._registrar_diario(resultado)
+
+                # Navegador acima do limite de memória, caído ou travado: troca por um novo antes do próximo município
+                reciclar = self._vigiar_memoria(municipio)
+                if i < len(municipios) and not self._restaurar_estado_inicial(reciclar):
+                    print("Erro crítico: navegador não reabriu - impossível continuar o lote")
+                    break
                 
                 # Pequena pausa entre municípios (otimizada)
                 if not self._cancelado:
-                    time.sleep(0.2)
+                    self._aguardar(0.2)
         
         except Exception as e:
             print(f"Erro durante processamento do lote: {e}")
@@ -539,12 +754,15 @@ class BotFNDE(BotBase):
 
         ReportGenerator.calcular_taxa_sucesso(estatisticas)
         ReportGenerator.imprimir_estatisticas(estatisticas, "LOTE CONCLUÍDO")
+        self._imprimir_resumo_memoria()
 
         return {'sucesso': True, 'estatisticas': estatisticas}
     
-    def executar_paralelo(self, ano: str, num_instancias: int = 2) -> Dict[str, any]:
+    def executar_paralelo(self, ano: str, num_instancias: int = 2, autoescalar: bool = False,
+                          retomar: bool = False, motor: str = None) -> Dict[str, any]:
     
         # Executa processamento paralelo de municípios usando ProcessadorParalelo
+        # motor: 'http' ou 'selenium' para todas as instâncias (padrão: o motor deste bot)
         
         try:
             from src.classes.methods.parallel_processor import ProcessadorParalelo
@@ -552,10 +770,14 @@ class BotFNDE(BotBase):
             print(f"\n=== INICIANDO PROCESSAMENTO PARALELO FNDE ===")
             print(f"Ano: {ano}")
             print(f"Instâncias: {num_instancias}")
+            print(f"Motor: {motor or self.motor}")
             
             # Armazena referência do processador para cancelamento
             self.processador_paralelo = ProcessadorParalelo()
-            resultado = self.processador_paralelo.executar_paralelo_fnde(self, ano, num_instancias)
+            self.processador_paralelo.diario = self.configurar_diario({'ano': ano}, retomar)
+            resultado = self.processador_paralelo.executar_paralelo_fnde(
+                self, ano, num_instancias, autoescalar, motor=motor or self.motor
+            )
             
             # Adiciona referência do processador ao resultado
             resultado['processador'] = self.processador_paralelo
@@ -576,8 +798,18 @@ class BotFNDE(BotBase):
         except Exception as e:
             return {'sucesso': False, 'erro': f'Erro ao iniciar processamento paralelo: {str(e)}'}
     
+    def iniciar_sessao(self) -> bool:
+        """Motor HTTP só abre a sessão de requisições; o navegador fica para as consultas refeitas"""
+        if self.motor == 'http':
+            self._obter_sessao_http()
+            return True
+        return self.configurar_navegador()
+
     def limpar_recursos(self):
         """Limpa todos os recursos e fecha navegador com segurança"""
+        if getattr(self, 'sessao_http', None):
+            self.sessao_http.fechar()
+            self.sessao_http = None
         try:
             if hasattr(self, 'navegador') and self.navegador:
                 # Fecha todas as abas abertas
@@ -589,6 +821,7 @@ class BotFNDE(BotBase):
                     pass  # Ignora erros ao fechar abas
                 
                 # Encerra o processo do navegador
+                relatorio_bloqueio(self.navegador)
                 self.navegador.quit()
                 self.navegador = None
                 self.wait = None
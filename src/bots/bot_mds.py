@@ -9,9 +9,7 @@ URLs:
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
@@ -21,7 +19,6 @@ from selenium.common.exceptions import (
 )
 import sys
 import os
-import time
 import threading
 from datetime import datetime
 from typing import List, Dict, Optional
@@ -29,7 +26,8 @@ from typing import List, Dict, Optional
 # Adiciona o diretório raiz do projeto ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.classes.chrome_driver import ChromeDriverSimples
+from src.classes.chrome_driver import ChromeDriverSimples, relatorio_bloqueio
+from src.classes.methods.form_fill import por_id
 from src.classes.methods.cancel_method import BotBase
 from src.classes.report_generator import ReportGenerator
 from src.classes.file.path_manager import obter_caminho_dados
@@ -102,9 +100,10 @@ class BotMDS(BotBase):
             opcoes_parcelas.add_argument("--disable-gpu")
             opcoes_parcelas.add_argument("--window-size=1920,1080")
 
-            driver_parcelas = ChromeDriverSimples(download_dir=self.dir_parcela)
-            self.navegador_parcelas = driver_parcelas.conectar(chrome_options=opcoes_parcelas)
-            self.wait_parcelas = WebDriverWait(self.navegador_parcelas, self.timeout)
+            driver_parcelas = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_parcela))
+            self.navegador_parcelas = driver_parcelas.conectar(chrome_options=opcoes_parcelas, perfil_bloqueio='scraping', site='mds',
+                                                               acompanhar_downloads=True)
+            self.wait_parcelas = self._espera(self.navegador_parcelas, self.timeout)
 
             # Navegador 2: Saldo por Conta (baixa direto em mds/saldo/)
             opcoes_saldo = webdriver.ChromeOptions()
@@ -112,14 +111,14 @@ class BotMDS(BotBase):
             opcoes_saldo.add_argument("--disable-gpu")
             opcoes_saldo.add_argument("--window-size=1920,1080")
 
-            driver_saldo = ChromeDriverSimples(download_dir=self.dir_saldo)
-            self.navegador_saldo = driver_saldo.conectar(chrome_options=opcoes_saldo)
-            self.wait_saldo = WebDriverWait(self.navegador_saldo, self.timeout)
+            driver_saldo = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_saldo))
+            self.navegador_saldo = driver_saldo.conectar(chrome_options=opcoes_saldo, perfil_bloqueio='scraping', site='mds')
+            self.wait_saldo = self._espera(self.navegador_saldo, self.timeout)
 
             # Abre as URLs
             print("Abrindo URLs do MDS...")
-            self.navegador_parcelas.get(self.url_parcelas)
-            self.navegador_saldo.get(self.url_saldo)
+            self._navegar(self.url_parcelas, self.navegador_parcelas)
+            self._navegar(self.url_saldo, self.navegador_saldo)
 
             print("✓ Navegadores configurados com sucesso (modo headless)")
             return True
@@ -128,14 +127,6 @@ class BotMDS(BotBase):
             print(f"✗ Erro ao configurar navegadores: {e}")
             return False
 
-    def _sleep_cancelavel(self, segundos: float):
-        # Sleep que pode ser interrompido por cancelamento
-        inicio = time.time()
-        while time.time() - inicio < segundos:
-            if self._cancelado:
-                return
-            time.sleep(0.1)  # Verifica a cada 100ms
-
     def esperar_elemento_disponivel(self, navegador, wait, by, seletor, acao_callback, max_tentativas=None):
         # Tenta realizar ação até N vezes devido ao loading do site MDS (central.py)
         max_tentativas = max_tentativas or self.max_tentativas
@@ -158,7 +149,7 @@ class BotMDS(BotBase):
                 if tentativa == max_tentativas:
                     print(f"  ✗ Timeout após {max_tentativas} tentativas")
                     return False
-                time.sleep(MDS_CONFIG['pausa_tentativa_espera'])  # Aguarda antes de tentar novamente (central.py)
+                self._aguardar(MDS_CONFIG['pausa_tentativa_espera'])  # Aguarda antes de tentar novamente (central.py)
 
         return False
 
@@ -166,13 +157,10 @@ class BotMDS(BotBase):
         # Verifica se a pesquisa retornou "Nenhum registro encontrado"
         try:
             # Tenta encontrar a mensagem de "sem registros" com timeout curto (2 segundos)
-            mensagem = WebDriverWait(navegador, 2).until(
+            mensagem = self._espera(navegador, 2).until(
                 EC.presence_of_element_located((By.XPATH, "//span[@id='mensagens']//div[@class='info']"))
             )
-            texto = mensagem.text.strip().lower()
-
-            # Verifica se contém "nenhum registro" ou similar
-            if "nenhum registro" in texto or "sem registros" in texto or "not found" in texto:
+            if self._texto_sem_registros(mensagem.text):
                 print(f"  ⓘ Nenhum registro encontrado para este município")
                 return True
 
@@ -182,6 +170,23 @@ class BotMDS(BotBase):
 
         return False
 
+    @staticmethod
+    def _texto_sem_registros(texto: str) -> bool:
+        # Verifica se a mensagem contém "nenhum registro" ou similar
+        texto = texto.strip().lower()
+        return "nenhum registro" in texto or "sem registros" in texto or "not found" in texto
+
+    @staticmethod
+    def _resultado_saldo_sem_arquivo(municipio: str) -> Dict:
+        # Saldo cuja pesquisa passou de espera_saldo: município processado, sem CSV
+        return {
+            'sucesso': True,  # Considera sucesso (município processado)
+            'municipio': municipio,
+            'tipo': 'saldo',
+            'arquivo': None,  # Arquivo não gerado (pesquisa além de espera_saldo)
+            'timeout_60s': True  # Flag indicando timeout
+        }
+
     def processar_parcelas(self, municipio: str, ano: str, max_retries=None) -> Dict:
         # Processa URL de Parcelas Pagas: seleciona ano, UF=MG, município, pesquisar, gerar CSV, renomear (central.py)
         if self._cancelado:
@@ -197,51 +202,18 @@ class BotMDS(BotBase):
             try:
                 print(f"  [PARCELAS] Processando {municipio} (tentativa {tentativa})")
 
-                # Passo 1: Selecionar ano (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_parcelas,
-                    self.wait_parcelas,
-                    By.ID,
-                    SELETORES_MDS_PARCELAS['select_ano'],
-                    lambda el: Select(el).select_by_value(ano)
-                ):
-                    raise Exception("Timeout ao selecionar ano")
-
-                # Aguarda UF dropdown carregar após seleção de ano
-                try:
-                    self.wait_parcelas.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_PARCELAS['select_uf']))
-                    )
-                except:
-                    pass
-
-                # Passo 2: Selecionar UF = MG (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_parcelas,
-                    self.wait_parcelas,
-                    By.ID,
-                    SELETORES_MDS_PARCELAS['select_uf'],
-                    lambda el: Select(el).select_by_value(MDS_CONFIG['uf_padrao'])
-                ):
-                    raise Exception("Timeout ao selecionar UF")
-
-                # Aguarda Município dropdown carregar após seleção de UF
-                try:
-                    self.wait_parcelas.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_PARCELAS['select_municipio']))
-                    )
-                except:
-                    pass
-
-                # Passo 3: Selecionar município (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_parcelas,
-                    self.wait_parcelas,
-                    By.ID,
-                    SELETORES_MDS_PARCELAS['select_municipio'],
-                    lambda el: Select(el).select_by_visible_text(municipio_upper)
-                ):
-                    raise Exception("Timeout ao selecionar município")
+                # Passos 1-3: ano, UF = MG e município num script por etapa do AJAX do JSF (central.py)
+                # Cada select recarrega o seguinte; a espera só acontece quando o valor realmente mudou
+                ano_css = por_id(SELETORES_MDS_PARCELAS['select_ano'])
+                uf_css = por_id(SELETORES_MDS_PARCELAS['select_uf'])
+                municipio_css = por_id(SELETORES_MDS_PARCELAS['select_municipio'])
+                preenchimento = self._preencher_formulario(
+                    [(ano_css, ano), (uf_css, MDS_CONFIG['uf_padrao']), (municipio_css, {'texto': municipio_upper})],
+                    dependentes={ano_css: uf_css, uf_css: municipio_css},
+                    etapa='mds_formulario', navegador=self.navegador_parcelas
+                )
+                if not preenchimento['sucesso']:
+                    raise Exception(f"Formulário não preenchido: {preenchimento['erro']}")
 
                 # Aguarda botão Pesquisar estar disponível após seleção de município
                 try:
@@ -273,6 +245,7 @@ class BotMDS(BotBase):
                     }
 
                 # Passo 5: Clicar gerar CSV (central.py)
+                marca = self._marcar_download(self.navegador_parcelas)
                 if not self.esperar_elemento_disponivel(
                     self.navegador_parcelas,
                     self.wait_parcelas,
@@ -282,13 +255,11 @@ class BotMDS(BotBase):
                 ):
                     raise Exception("Timeout ao gerar CSV")
 
-                # Aguarda download (central.py)
-                self._sleep_cancelavel(MDS_CONFIG['pausa_aguarda_download'])
-
-                # Passo 6: Renomear arquivo (central.py)
-                arquivo_renomeado = self._renomear_ultimo_download(
-                    self.dir_parcela,
-                    MDS_CONFIG['formato_arquivo'].format(municipio=municipio)
+                # Passo 6: Aguardar o CSV deste clique e renomear (central.py)
+                arquivo_renomeado = self._renomear_download(
+                    marca,
+                    MDS_CONFIG['formato_arquivo'].format(municipio=municipio),
+                    self.dir_parcela
                 )
 
                 print(f"  ✓ [PARCELAS] {municipio} processado com sucesso")
@@ -335,90 +306,21 @@ class BotMDS(BotBase):
             try:
                 print(f"  [SALDO] Processando {municipio} (tentativa {tentativa})")
 
-                # Passo 1: Selecionar ano (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_saldo,
-                    self.wait_saldo,
-                    By.ID,
-                    SELETORES_MDS_SALDO['select_ano'],
-                    lambda el: Select(el).select_by_value(ano)
-                ):
-                    raise Exception("Timeout ao selecionar ano")
-
-                # Aguarda UF dropdown carregar após seleção de ano
-                try:
-                    self.wait_saldo.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_SALDO['select_uf']))
-                    )
-                except:
-                    pass
-
-                # Passo 2: Selecionar UF = MG (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_saldo,
-                    self.wait_saldo,
-                    By.ID,
-                    SELETORES_MDS_SALDO['select_uf'],
-                    lambda el: Select(el).select_by_value(MDS_CONFIG['uf_padrao'])
-                ):
-                    raise Exception("Timeout ao selecionar UF")
-
-                # Aguarda Mês dropdown carregar após seleção de UF
-                try:
-                    self.wait_saldo.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_SALDO['select_mes']))
-                    )
-                except:
-                    pass
-
-                # Aguarda dropdown mês ficar completamente interativo
-                time.sleep(1)
-
-                # Passo 3: Selecionar mês (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_saldo,
-                    self.wait_saldo,
-                    By.ID,
-                    SELETORES_MDS_SALDO['select_mes'],
-                    lambda el: Select(el).select_by_visible_text(mes)
-                ):
-                    raise Exception("Timeout ao selecionar mês")
-
-                # Aguarda Esfera dropdown carregar após seleção de mês
-                try:
-                    self.wait_saldo.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_SALDO['select_esfera']))
-                    )
-                except:
-                    pass
-
-                # Passo 4: Selecionar Esfera = MUNICIPAL (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_saldo,
-                    self.wait_saldo,
-                    By.ID,
-                    SELETORES_MDS_SALDO['select_esfera'],
-                    lambda el: Select(el).select_by_value(MDS_CONFIG['esfera_padrao'])
-                ):
-                    raise Exception("Timeout ao selecionar esfera")
-
-                # Aguarda Município dropdown carregar após seleção de esfera
-                try:
-                    self.wait_saldo.until(
-                        EC.presence_of_element_located((By.ID, SELETORES_MDS_SALDO['select_municipio']))
-                    )
-                except:
-                    pass
-
-                # Passo 5: Selecionar município (central.py)
-                if not self.esperar_elemento_disponivel(
-                    self.navegador_saldo,
-                    self.wait_saldo,
-                    By.ID,
-                    SELETORES_MDS_SALDO['select_municipio'],
-                    lambda el: Select(el).select_by_visible_text(municipio_upper)
-                ):
-                    raise Exception("Timeout ao selecionar município")
+                # Passos 1-5: ano, UF = MG, mês, esfera = MUNICIPAL e município (central.py)
+                # Cada select recarrega o seguinte pelo AJAX do JSF; a espera só acontece quando o valor mudou
+                ano_css = por_id(SELETORES_MDS_SALDO['select_ano'])
+                uf_css = por_id(SELETORES_MDS_SALDO['select_uf'])
+                mes_css = por_id(SELETORES_MDS_SALDO['select_mes'])
+                esfera_css = por_id(SELETORES_MDS_SALDO['select_esfera'])
+                municipio_css = por_id(SELETORES_MDS_SALDO['select_municipio'])
+                preenchimento = self._preencher_formulario(
+                    [(ano_css, ano), (uf_css, MDS_CONFIG['uf_padrao']), (mes_css, {'texto': mes}),
+                     (esfera_css, MDS_CONFIG['esfera_padrao']), (municipio_css, {'texto': municipio_upper})],
+                    dependentes={ano_css: uf_css, uf_css: mes_css, mes_css: esfera_css, esfera_css: municipio_css},
+                    etapa='mds_formulario', navegador=self.navegador_saldo
+                )
+                if not preenchimento['sucesso']:
+                    raise Exception(f"Formulário não preenchido: {preenchimento['erro']}")
 
                 # Aguarda botão Pesquisar estar disponível após seleção de município
                 try:
@@ -438,14 +340,15 @@ class BotMDS(BotBase):
                 ):
                     raise Exception("Timeout ao clicar pesquisar")
 
-                # Aguardar 60 segundos após pesquisar
-                print("  ⏱ [SALDO] Aguardando 60 segundos após pesquisa...")
-                self._sleep_cancelavel(60)
+                # Aguarda a pesquisa pelo prazo do saldo (espera_saldo)
+                espera = MDS_CONFIG['espera_saldo']
+                print(f"  ⏱ [SALDO] Aguardando {espera} segundos após pesquisa...")
+                self._aguardar(espera)
 
-                # APÓS 60 SEGUNDOS: Recarrega URL e passa para próxima cidade
-                print(f"  ⏭ [SALDO] Tempo esgotado (60s) - recarregando página e passando para próxima cidade")
+                # Prazo esgotado: recarrega URL e passa para próxima cidade
+                print(f"  ⏭ [SALDO] Tempo esgotado ({espera}s) - recarregando página e passando para próxima cidade")
                 try:
-                    self.navegador_saldo.get(self.url_saldo)
+                    self._navegar(self.url_saldo, self.navegador_saldo)
                     # Aguarda formulário carregar completamente antes de passar para próxima cidade
                     self.wait_saldo.until(
                         EC.presence_of_element_located((By.ID, SELETORES_MDS_SALDO['select_ano']))
@@ -453,16 +356,10 @@ class BotMDS(BotBase):
                 except Exception as e:
                     print(f"  ⚠ Aviso ao recarregar página de saldo: {e}")
 
-                return {
-                    'sucesso': True,  # Considera sucesso (município processado)
-                    'municipio': municipio,
-                    'tipo': 'saldo',
-                    'arquivo': None,  # Arquivo não gerado (timeout 60s)
-                    'timeout_60s': True  # Flag indicando timeout
-                }
+                return self._resultado_saldo_sem_arquivo(municipio)
 
             except Exception as e:
-                print(f"  ✗ [SALDO] Erro ANTES dos 60s em {municipio}: {e}")
+                print(f"  ✗ [SALDO] Erro antes do fim da espera em {municipio}: {e}")
 
                 if tentativa < max_retries:
                     # Fecha e reabre navegador
@@ -494,7 +391,8 @@ class BotMDS(BotBase):
             'mes': mes,
             'parcelas': None,
             'saldo': None,
-            'sucesso': False
+            'sucesso': False,
+            'erro': None
         }
 
         # Thread 1: Parcelas Pagas
@@ -522,7 +420,8 @@ class BotMDS(BotBase):
                     'mes': mes,
                     'parcelas': None,
                     'saldo': None,
-                    'sucesso': False
+                    'sucesso': False,
+                    'erro': 'Cancelado'
                 }
             thread_parcelas.join(timeout=0.1)
             thread_saldo.join(timeout=0.1)
@@ -533,19 +432,25 @@ class BotMDS(BotBase):
             resultado_consolidado['sucesso'] = True
             print(f"✓ {municipio} processado com SUCESSO em ambas as URLs")
         else:
+            erros = [r.get('erro') for r in (resultado_consolidado['parcelas'], resultado_consolidado['saldo'])
+                     if r and not r['sucesso']]
+            resultado_consolidado['erro'] = "; ".join(e for e in erros if e) or "Falha em pelo menos uma URL"
             print(f"✗ {municipio} teve falha em pelo menos uma URL")
 
         return resultado_consolidado
 
-    def processar_todos_municipios(self, ano: str, mes: str) -> Dict:
-        # Processa todos os 853 municípios de MG e retorna estatísticas
+    def processar_todos_municipios(self, ano: str, mes: str, retomar: bool = False) -> Dict:
+        # Processa todos os 853 municípios de MG e retorna estatísticas (retomar pula os já concluídos)
+        self.configurar_diario({'ano': ano, 'mes': mes}, retomar)
+        municipios = self._itens_pendentes(self.municipios_mg)
+
         print(f"\n{'='*60}")
         print(f"PROCESSANDO TODOS OS MUNICÍPIOS - {mes}/{ano}")
-        print(f"Total de municípios: {len(self.municipios_mg)}")
+        print(f"Total de municípios: {len(municipios)}")
         print(f"{'='*60}\n")
 
         estatisticas = {
-            'total': len(self.municipios_mg),
+            'total': len(municipios),
             'sucessos': 0,
             'erros': 0,
             'parcelas_ok': 0,
@@ -553,14 +458,15 @@ class BotMDS(BotBase):
             'taxa_sucesso': 0.0
         }
 
-        for i, municipio in enumerate(self.municipios_mg, 1):
+        for i, municipio in enumerate(municipios, 1):
             if self._cancelado:
                 print("\n⚠ Processamento cancelado pelo usuário")
                 break
 
-            print(f"\n[{i}/{len(self.municipios_mg)}] {municipio}")
+            print(f"\n[{i}/{len(municipios)}] {municipio}")
 
             resultado = self.processar_municipio(ano, mes, municipio)
+            self._registrar_diario(resultado)
 
             if resultado['sucesso']:
                 estatisticas['sucessos'] += 1
@@ -589,31 +495,42 @@ class BotMDS(BotBase):
 
         return estatisticas
 
-    def _renomear_ultimo_download(self, diretorio: str, novo_nome: str) -> str:
-        # Renomeia o último arquivo CSV baixado no diretório (central.py)
-        for _ in range(MDS_CONFIG['timeout_renomear_arquivo']):
-            if self._cancelado:
-                raise Exception("Cancelado pelo usuário")
+    def executar_paralelo(self, ano: str, mes: str, num_instancias: int = 2, retomar: bool = False) -> Dict:
+        # Processa todos os municípios com várias instâncias (cada uma com seus dois navegadores)
+        try:
+            from src.classes.methods.parallel_processor import ProcessadorParalelo, gerar_itens_trabalho
 
-            try:
-                arquivos = [f for f in os.listdir(diretorio) if f.endswith('.csv') and not f.startswith('.')]
-                if arquivos:
-                    # Pega o arquivo mais recente
-                    arquivo_mais_recente = max(
-                        [os.path.join(diretorio, f) for f in arquivos],
-                        key=os.path.getctime
-                    )
+            print(f"\n=== INICIANDO PROCESSAMENTO PARALELO MDS ===")
+            print(f"Período: {mes}/{ano} | Instâncias: {num_instancias}")
 
-                    # Renomeia no mesmo diretório (já está no lugar final)
-                    caminho_final = os.path.join(diretorio, novo_nome)
-                    os.rename(arquivo_mais_recente, caminho_final)
-                    return caminho_final
-            except Exception:
-                pass
+            # Armazena referência do processador para cancelamento
+            self.processador_paralelo = ProcessadorParalelo()
+            self.processador_paralelo.diario = self.configurar_diario({'ano': ano, 'mes': mes}, retomar)
+            itens = gerar_itens_trabalho(municipios=self.municipios_mg, ano=ano, mes=mes)
+            resultado = self.processador_paralelo.executar_paralelo_generico(BotMDS, itens, num_instancias,
+                                                                             nome_bot='BotMDS')
+            resultado['processador'] = self.processador_paralelo
 
-            time.sleep(MDS_CONFIG['pausa_tentativa_espera'])  # Aguarda antes de tentar novamente (central.py)
+            if resultado['sucesso']:
+                ReportGenerator.imprimir_estatisticas(resultado['estatisticas'], "PROCESSAMENTO PARALELO CONCLUÍDO")
+            else:
+                print(f"\n✗ Erro no processamento paralelo: {resultado['erro']}")
+            return resultado
 
-        raise Exception("Arquivo CSV não foi baixado")
+        except Exception as e:
+            return {'sucesso': False, 'erro': f'Erro ao iniciar processamento paralelo: {str(e)}'}
+
+    def _renomear_download(self, marca: Dict, novo_nome: str, diretorio_final: str) -> str:
+        # Aguarda o CSV disparado depois da marca e move para diretorio_final com o nome final (central.py)
+        download = self._aguardar_download(marca, MDS_CONFIG['timeout_aguarda_download'], ('.csv',))
+        if download is None:
+            if self._cancelado:
+                raise Exception("Cancelado pelo usuário")
+            raise Exception("Arquivo CSV não foi baixado")
+
+        caminho_final = os.path.join(diretorio_final, novo_nome)
+        os.replace(download['caminho'], caminho_final)
+        return caminho_final
 
     def _reconfigurar_navegador_parcelas(self):
         # Reconfigura navegador de parcelas após erro (central.py)
@@ -622,10 +539,11 @@ class BotMDS(BotBase):
         opcoes.add_argument("--disable-gpu")
         opcoes.add_argument("--window-size=1920,1080")
 
-        driver = ChromeDriverSimples(download_dir=self.dir_parcela)
-        self.navegador_parcelas = driver.conectar(chrome_options=opcoes)
-        self.wait_parcelas = WebDriverWait(self.navegador_parcelas, self.timeout)
-        self.navegador_parcelas.get(self.url_parcelas)
+        driver = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_parcela))
+        self.navegador_parcelas = driver.conectar(chrome_options=opcoes, perfil_bloqueio='scraping', site='mds',
+                                                  acompanhar_downloads=True)
+        self.wait_parcelas = self._espera(self.navegador_parcelas, self.timeout)
+        self._navegar(self.url_parcelas, self.navegador_parcelas)
 
     def _reconfigurar_navegador_saldo(self):
         # Reconfigura navegador de saldo após erro (central.py)
@@ -634,10 +552,10 @@ class BotMDS(BotBase):
         opcoes.add_argument("--disable-gpu")
         opcoes.add_argument("--window-size=1920,1080")
 
-        driver = ChromeDriverSimples(download_dir=self.dir_saldo)
-        self.navegador_saldo = driver.conectar(chrome_options=opcoes)
-        self.wait_saldo = WebDriverWait(self.navegador_saldo, self.timeout)
-        self.navegador_saldo.get(self.url_saldo)
+        driver = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_saldo))
+        self.navegador_saldo = driver.conectar(chrome_options=opcoes, perfil_bloqueio='scraping', site='mds')
+        self.wait_saldo = self._espera(self.navegador_saldo, self.timeout)
+        self._navegar(self.url_saldo, self.navegador_saldo)
 
     def fechar_navegador(self):
         # Método compatível com GUI7 - fecha AMBOS os navegadores
@@ -647,6 +565,7 @@ class BotMDS(BotBase):
         # Fecha ambos os navegadores
         try:
             if self.navegador_parcelas:
+                relatorio_bloqueio(self.navegador_parcelas)
                 self.navegador_parcelas.quit()
                 print("✓ Navegador parcelas fechado")
         except Exception as e:
@@ -654,6 +573,7 @@ class BotMDS(BotBase):
 
         try:
             if self.navegador_saldo:
+                relatorio_bloqueio(self.navegador_saldo)
                 self.navegador_saldo.quit()
                 print("✓ Navegador saldo fechado")
         except Exception as e:
@@ -667,6 +587,11 @@ class BotMDS(BotBase):
         self._cancelado = True
         print("\n⚠ Cancelamento forçado iniciado...")
 
+        # Cancela também as instâncias da execução paralela, se houver
+        if getattr(self, 'processador_paralelo', None):
+            self.processador_paralelo.cancelar()
+            self.processador_paralelo = None
+
         # Fecha navegador parcelas de forma agressiva
         if self.navegador_parcelas:
             print("  → Fechando navegador parcelas...")
@@ -736,7 +661,7 @@ class BotMDS(BotBase):
             print(f"    ⚠ Erro ao limpar processos: {e}")
 
         # Aguarda processos terminarem completamente
-        time.sleep(1)
+        self._aguardar(1)
         print("✓ Cancelamento forçado concluído - todos os processos Chrome fechados")
 
 
@@ -8,9 +8,7 @@ URLs:
 
 from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import Select
 from selenium.common.exceptions import (
     TimeoutException,
     NoSuchElementException,
@@ -18,18 +16,27 @@ from selenium.common.exceptions import (
     ElementClickInterceptedException,
     StaleElementReferenceException
 )
+import csv
+import functools
+import re
 import sys
 import os
-import time
 import threading
 from datetime import datetime
 from typing import List, Dict, Optional
 
+import requests
+from bs4 import BeautifulSoup
+
 # Adiciona o diretório raiz do projeto ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
-from src.classes.chrome_driver import ChromeDriverSimples
-from src.classes.methods.cancel_method import BotBase
+from src.classes.chrome_driver import ChromeDriverSimples, relatorio_bloqueio
+from src.classes.methods.waits import RedeOciosa, DomEstavel, Todas
+from src.classes.methods.form_fill import por_id
+from src.classes.methods.cancel_method import BotBase, ExecucaoCancelada
+from src.classes.methods.http_session import SessaoHTTP
+from src.classes.methods.html_form import FormularioHTML, ErroFormulario
 from src.classes.report_generator import ReportGenerator
 from src.classes.file.path_manager import obter_caminho_dados
 from src.classes.city_manager import CityManager
@@ -44,9 +51,16 @@ from src.classes.central import (
 class BotPagamentosRes(BotBase):
     """Bot de scraping Pagamentos de Resoluções com sincronização de duas URLs simultâneas"""
 
-    def __init__(self, timeout=None):
-        """Inicializa o bot Pagamentos de Resoluções usando configurações centralizadas de central.py"""
+    # Cabeçalho do CSV exportado pelo navegador, por tipo (referência do motor HTTP, comum às instâncias)
+    _colunas_csv = {}
+    _colunas_lock = threading.Lock()
+
+    def __init__(self, timeout=None, motor=None):
+        """Inicializa o bot usando central.py (motor: 'http' ou 'selenium'; padrão em PAGAMENTOS_RES_CONFIG['motor'])"""
         super().__init__()
+        self.motor = motor or PAGAMENTOS_RES_CONFIG['motor']
+        if self.motor not in ('http', 'selenium'):
+            raise ValueError(f"Motor Pagamentos de Resoluções desconhecido: {self.motor}")
 
         # URLs do sistema (central.py)
         self.url_orcamentarios = PAGAMENTOS_RES_CONFIG['url_orcamentarios']
@@ -58,6 +72,10 @@ class BotPagamentosRes(BotBase):
         self.wait_orcamentarios = None
         self.wait_restos = None
 
+        # Motor HTTP: uma sessão e um formulário por URL
+        self._sessoes_http = {}       # tipo -> SessaoHTTP
+        self._formularios_http = {}   # tipo -> FormularioHTML
+
         # Configurações (central.py)
         self.timeout = timeout or PAGAMENTOS_RES_CONFIG['timeout_selenium']
         self.max_tentativas = PAGAMENTOS_RES_CONFIG['max_tentativas_espera']
@@ -100,70 +118,13 @@ class BotPagamentosRes(BotBase):
             os.makedirs(self.dir_orcamentarios, exist_ok=True)
             os.makedirs(self.dir_restos_a_pagar, exist_ok=True)
 
-            # Navegador 1: Pagamentos Orçamentários
-            opcoes_orcamentarios = webdriver.ChromeOptions()
-            #opcoes_orcamentarios.add_argument("--headless=new")
-            opcoes_orcamentarios.add_argument("--disable-gpu")
-            opcoes_orcamentarios.add_argument("--window-size=1920,1080")
-
-            # Opções para forçar HTTP e evitar redirecionamento HTTPS/403
-            opcoes_orcamentarios.add_argument("--ignore-certificate-errors")
-            opcoes_orcamentarios.add_argument("--allow-insecure-localhost")
-            opcoes_orcamentarios.add_argument("--allow-running-insecure-content")
-            opcoes_orcamentarios.add_argument("--disable-web-security")
-            opcoes_orcamentarios.add_argument("--no-proxy-server")
-            opcoes_orcamentarios.add_argument("--disable-features=InsecureDownloadWarnings")
-            opcoes_orcamentarios.add_argument("--unsafely-treat-insecure-origin-as-secure=http://pagamentoderesolucoes.saude.mg.gov.br")
-
-            # User-Agent customizado para evitar bloqueio
-            opcoes_orcamentarios.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-
-            # Preferências para desabilitar upgrade automático HTTPS
-            prefs_orcamentarios = {
-                "profile.default_content_setting_values.mixed_content": 1,
-                "profile.block_third_party_cookies": False,
-                "profile.cookie_controls_mode": 0,
-            }
-            opcoes_orcamentarios.add_experimental_option("prefs", prefs_orcamentarios)
-
-            driver_orcamentarios = ChromeDriverSimples(download_dir=self.dir_orcamentarios)
-            self.navegador_orcamentarios = driver_orcamentarios.conectar(chrome_options=opcoes_orcamentarios)
-            self.wait_orcamentarios = WebDriverWait(self.navegador_orcamentarios, self.timeout)
-
-            # Navegador 2: Restos a Pagar
-            opcoes_restos = webdriver.ChromeOptions()
-            #opcoes_restos.add_argument("--headless=new")
-            opcoes_restos.add_argument("--disable-gpu")
-            opcoes_restos.add_argument("--window-size=1920,1080")
-
-            # Opções para forçar HTTP e evitar redirecionamento HTTPS/403
-            opcoes_restos.add_argument("--ignore-certificate-errors")
-            opcoes_restos.add_argument("--allow-insecure-localhost")
-            opcoes_restos.add_argument("--allow-running-insecure-content")
-            opcoes_restos.add_argument("--disable-web-security")
-            opcoes_restos.add_argument("--no-proxy-server")
-            opcoes_restos.add_argument("--disable-features=InsecureDownloadWarnings")
-            opcoes_restos.add_argument("--unsafely-treat-insecure-origin-as-secure=http://pagamentoderesolucoes.saude.mg.gov.br")
-
-            # User-Agent customizado para evitar bloqueio
-            opcoes_restos.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
-
-            # Preferências para desabilitar upgrade automático HTTPS
-            prefs_restos = {
-                "profile.default_content_setting_values.mixed_content": 1,
-                "profile.block_third_party_cookies": False,
-                "profile.cookie_controls_mode": 0,
-            }
-            opcoes_restos.add_experimental_option("prefs", prefs_restos)
-
-            driver_restos = ChromeDriverSimples(download_dir=self.dir_restos_a_pagar)
-            self.navegador_restos = driver_restos.conectar(chrome_options=opcoes_restos)
-            self.wait_restos = WebDriverWait(self.navegador_restos, self.timeout)
+            # Motor HTTP: navegadores só são abertos se algum município precisar ser refeito pelo Selenium
+            if self.motor == 'http':
+                print("✓ Motor HTTP configurado (sem navegador)")
+                return True
 
-            # Abre as URLs
-            print("Abrindo URLs do sistema Pagamentos de Resoluções...")
-            self.navegador_orcamentarios.get(self.url_orcamentarios)
-            self.navegador_restos.get(self.url_restos_a_pagar)
+            self._configurar_navegador_orcamentarios()
+            self._configurar_navegador_restos()
 
             print("✓ Navegadores configurados com sucesso")
             return True
@@ -172,13 +133,49 @@ class BotPagamentosRes(BotBase):
             print(f"✗ Erro ao configurar navegadores: {e}")
             return False
 
-    def _sleep_cancelavel(self, segundos: float):
-        """Sleep que pode ser interrompido por cancelamento"""
-        inicio = time.time()
-        while time.time() - inicio < segundos:
-            if self._cancelado:
-                return
-            time.sleep(0.1)  # Verifica a cada 100ms
+    def _opcoes_chrome(self):
+        """Opções do Chrome para o site (HTTP sem upgrade para HTTPS)"""
+        opcoes = webdriver.ChromeOptions()
+        #opcoes.add_argument("--headless=new")
+        opcoes.add_argument("--disable-gpu")
+        opcoes.add_argument("--window-size=1920,1080")
+
+        # Opções para forçar HTTP e evitar redirecionamento HTTPS/403
+        opcoes.add_argument("--ignore-certificate-errors")
+        opcoes.add_argument("--allow-insecure-localhost")
+        opcoes.add_argument("--allow-running-insecure-content")
+        opcoes.add_argument("--disable-web-security")
+        opcoes.add_argument("--no-proxy-server")
+        opcoes.add_argument("--disable-features=InsecureDownloadWarnings")
+        opcoes.add_argument("--unsafely-treat-insecure-origin-as-secure=http://pagamentoderesolucoes.saude.mg.gov.br")
+
+        # User-Agent customizado para evitar bloqueio
+        opcoes.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+
+        # Preferências para desabilitar upgrade automático HTTPS
+        prefs = {
+            "profile.default_content_setting_values.mixed_content": 1,
+            "profile.block_third_party_cookies": False,
+            "profile.cookie_controls_mode": 0,
+        }
+        opcoes.add_experimental_option("prefs", prefs)
+        return opcoes
+
+    def _configurar_navegador_orcamentarios(self):
+        """Navegador 1: Pagamentos Orçamentários"""
+        driver = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_orcamentarios))
+        self.navegador_orcamentarios = driver.conectar(chrome_options=self._opcoes_chrome(), perfil_bloqueio='scraping',
+                                                       site='pagamentos_res', acompanhar_downloads=True)
+        self.wait_orcamentarios = self._espera(self.navegador_orcamentarios, self.timeout)
+        self._navegar(self.url_orcamentarios, self.navegador_orcamentarios)
+
+    def _configurar_navegador_restos(self):
+        """Navegador 2: Restos a Pagar"""
+        driver = ChromeDriverSimples(download_dir=self._diretorio_download(self.dir_restos_a_pagar))
+        self.navegador_restos = driver.conectar(chrome_options=self._opcoes_chrome(), perfil_bloqueio='scraping',
+                                                site='pagamentos_res', acompanhar_downloads=True)
+        self.wait_restos = self._espera(self.navegador_restos, self.timeout)
+        self._navegar(self.url_restos_a_pagar, self.navegador_restos)
 
     def esperar_elemento_disponivel(self, navegador, wait, by, seletor, acao_callback, max_tentativas=None):
         """Tenta realizar ação até N vezes devido ao loading do site (central.py)"""
@@ -203,7 +200,7 @@ class BotPagamentosRes(BotBase):
                 if tentativa == max_tentativas:
                     print(f"  ✗ Timeout após {max_tentativas} tentativas")
                     return False
-                time.sleep(PAGAMENTOS_RES_CONFIG['pausa_tentativa_espera'])  # Aguarda antes de tentar novamente (central.py)
+                self._aguardar(PAGAMENTOS_RES_CONFIG['pausa_tentativa_espera'])  # Aguarda antes de tentar novamente (central.py)
 
         return False
 
@@ -211,7 +208,7 @@ class BotPagamentosRes(BotBase):
         """Verifica se a pesquisa retornou 'Nenhum registro encontrado'"""
         try:
             # Tenta encontrar a mensagem de "sem registros" com timeout curto (2 segundos)
-            mensagem = WebDriverWait(navegador, 2).until(
+            mensagem = self._espera(navegador, 2).until(
                 EC.presence_of_element_located((By.XPATH, "//td[@class='dataTables_empty']"))
             )
             texto = mensagem.text.strip().lower()
@@ -227,44 +224,180 @@ class BotPagamentosRes(BotBase):
 
         return False
 
+    def _sessao_http(self, tipo: str) -> SessaoHTTP:
+        """Uma sessão (cookies e conexões) por URL: as duas threads não dividem a mesma sessão"""
+        if tipo not in self._sessoes_http:
+            self._sessoes_http[tipo] = SessaoHTTP(token=self.token)
+        self._sessoes_http[tipo].token = self.token
+        return self._sessoes_http[tipo]
+
+    def _formulario_http(self, tipo: str) -> FormularioHTML:
+        """Formulário de consulta da URL (aberto uma vez; cada resposta traz o formulário de volta)"""
+        if tipo not in self._formularios_http:
+            seletores = SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS if tipo == 'orcamentarios' else SELETORES_PAGAMENTOS_RES_RESTOS
+            url = self.url_orcamentarios if tipo == 'orcamentarios' else self.url_restos_a_pagar
+            formulario = FormularioHTML(self._sessao_http(tipo), url, campo_referencia=seletores['select_ano'])
+            formulario.abrir()
+            self._formularios_http[tipo] = formulario
+        return self._formularios_http[tipo]
+
+    @staticmethod
+    def _tabela_resultados(html: str):
+        """Cabeçalho e linhas da tabela de resultados (a maior tabela da página), como o DataTables exporta"""
+        soup = BeautifulSoup(html, 'html.parser')
+
+        # Tabela preenchida pelo navegador (DataTables com ajax/serverSide): não há dados no HTML
+        for script in soup.find_all('script'):
+            if re.search(r"serverSide\s*:\s*true|\bajax\s*:", script.string or ''):
+                raise ErroFormulario("Tabela carregada por AJAX no navegador")
+
+        tabelas = soup.find_all('table')
+        if not tabelas:
+            raise ErroFormulario("Página sem tabela de resultados")
+        tabela = max(tabelas, key=lambda t: len(t.find_all('tr')))
+
+        def texto(celula):
+            return ' '.join(celula.get_text(' ').split())
+
+        thead = tabela.find('thead')
+        linha_cabecalho = (thead or tabela).find('tr')
+        cabecalho = [texto(c) for c in linha_cabecalho.find_all(['th', 'td'])] if linha_cabecalho else []
+
+        corpo = tabela.find('tbody') or tabela
+        linhas = []
+        for tr in corpo.find_all('tr'):
+            if tr is linha_cabecalho or tr.find_parent('tfoot') is not None:
+                continue
+            celulas = tr.find_all('td')
+            # Linha "Nenhum registro encontrado" do DataTables
+            if not celulas or (len(celulas) == 1 and 'dataTables_empty' in (celulas[0].get('class') or [])):
+                continue
+            linhas.append([texto(c) for c in celulas])
+        return cabecalho, linhas
+
+    @staticmethod
+    def _normalizar_colunas(colunas: List[str]) -> List[str]:
+        """Nomes de coluna comparáveis (espaços colapsados, maiúsculas)"""
+        return [' '.join(str(coluna).split()).upper() for coluna in colunas]
+
+    def _colunas_esperadas(self, tipo: str) -> Optional[List[str]]:
+        """Colunas que o CSV do tipo deve ter (central.py ou aprendidas do CSV baixado pelo navegador)"""
+        colunas = PAGAMENTOS_RES_CONFIG['colunas_orcamentarios' if tipo == 'orcamentarios' else 'colunas_restos']
+        if colunas:
+            return self._normalizar_colunas(colunas)
+        with self._colunas_lock:
+            return self._colunas_csv.get(tipo)
+
+    def _registrar_colunas_csv(self, tipo: str, caminho: str):
+        """Guarda o cabeçalho do CSV exportado pelo DataTables como referência para o motor HTTP"""
+        with self._colunas_lock:
+            if tipo in self._colunas_csv:
+                return
+        try:
+            with open(caminho, encoding='utf-8-sig', newline='') as arquivo:
+                cabecalho = next(csv.reader(arquivo), None)
+        except (OSError, UnicodeDecodeError, csv.Error):
+            return
+        if cabecalho:
+            with self._colunas_lock:
+                self._colunas_csv.setdefault(tipo, self._normalizar_colunas(cabecalho))
+
+    def _conferir_resposta_http(self, tipo: str, html: str, ano: str, municipio: str, cabecalho: List[str]):
+        """Confere se a resposta é a consulta pedida (ano e município selecionados, colunas do CSV do navegador)"""
+        seletores = SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS if tipo == 'orcamentarios' else SELETORES_PAGAMENTOS_RES_RESTOS
+        soup = BeautifulSoup(html, 'html.parser')
+        for campo, esperado in ((seletores['select_ano'], ano), (seletores['select_municipio'], municipio)):
+            select = soup.find('select', id=campo)
+            opcao = select.find('option', selected=True) if select is not None else None
+            if opcao is not None and opcao.get_text(strip=True).upper() != str(esperado).strip().upper():
+                raise ErroFormulario(f"Resposta é de outra consulta ({campo}={opcao.get_text(strip=True)})")
+
+        colunas = self._colunas_esperadas(tipo)
+        if colunas is None:
+            raise ErroFormulario("Colunas ainda não conferidas com o CSV do navegador")
+        if self._normalizar_colunas(cabecalho) != colunas:
+            raise ErroFormulario(f"Colunas da tabela diferentes do CSV do navegador: {cabecalho}")
+
+    def _processar_http(self, tipo: str, municipio: str, ano: str) -> Dict:
+        """Motor HTTP: envia a consulta e grava o CSV da tabela direto na pasta final (mesmo formato do botão CSV)"""
+        seletores = SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS if tipo == 'orcamentarios' else SELETORES_PAGAMENTOS_RES_RESTOS
+        rotulo = 'ORÇAMENTÁRIOS' if tipo == 'orcamentarios' else 'RESTOS A PAGAR'
+
+        try:
+            print(f"  [{rotulo}] Processando {municipio} via HTTP")
+            formulario = self._formulario_http(tipo)
+            formulario.selecionar(seletores['select_ano'], texto=ano)
+            formulario.selecionar(seletores['select_municipio'], texto=municipio.upper())
+            resposta = formulario.enviar(texto=seletores['texto_botao_consultar'],
+                                         timeout=PAGAMENTOS_RES_CONFIG['timeout_http_consulta'])
+
+            cabecalho, linhas = self._tabela_resultados(resposta.text)
+            self._conferir_resposta_http(tipo, resposta.text, ano, municipio, cabecalho)
+            if not linhas:
+                print(f"  ⓘ [{rotulo}] Sem dados para {municipio} - continuando")
+                return {'sucesso': True, 'municipio': municipio, 'tipo': tipo, 'arquivo': None,
+                        'sem_dados': True, 'motor': 'http'}
+
+            # Grava em arquivo temporário e renomeia: nunca fica um CSV pela metade na pasta final
+            if tipo == 'orcamentarios':
+                diretorio, formato = self.dir_orcamentarios, PAGAMENTOS_RES_CONFIG['formato_arquivo_orcamentarios']
+            else:
+                diretorio, formato = self.dir_restos_a_pagar, PAGAMENTOS_RES_CONFIG['formato_arquivo_restos']
+            caminho_final = os.path.join(diretorio, formato.format(municipio=municipio.replace(" ", "_").upper()))
+            temporario = caminho_final + '.tmp'
+            with open(temporario, 'w', encoding='utf-8', newline='') as arquivo:
+                escritor = csv.writer(arquivo, quoting=csv.QUOTE_ALL, lineterminator='\r\n' if os.name == 'nt' else '\n')
+                escritor.writerow(cabecalho)
+                escritor.writerows(linhas)
+            os.replace(temporario, caminho_final)
+
+            print(f"  ✓ [{rotulo}] {municipio} processado com sucesso ({len(linhas)} linhas)")
+            return {'sucesso': True, 'municipio': municipio, 'tipo': tipo, 'arquivo': caminho_final, 'motor': 'http'}
+
+        except ExecucaoCancelada:
+            return {'sucesso': False, 'municipio': municipio, 'tipo': tipo, 'erro': 'Cancelado'}
+        except (requests.RequestException, ErroFormulario, OSError) as e:
+            # Estado do formulário incerto: a próxima consulta recomeça da página inicial
+            self._formularios_http.pop(tipo, None)
+            return {'sucesso': False, 'municipio': municipio, 'tipo': tipo, 'erro': str(e)}
+
+    def _fechar_sessoes_http(self):
+        """Fecha as sessões do motor HTTP"""
+        for sessao in self._sessoes_http.values():
+            sessao.fechar()
+        self._sessoes_http.clear()
+        self._formularios_http.clear()
+
     def processar_orcamentarios(self, municipio: str, ano: str) -> Dict:
         """Processa URL de Pagamentos Orçamentários: seleciona ano, município, consultar, gerar CSV, renomear (central.py)"""
         if self._cancelado:
             return {'sucesso': False, 'municipio': municipio, 'tipo': 'orcamentarios', 'erro': 'Cancelado'}
 
+        if self.motor == 'http':
+            resultado = self._processar_http('orcamentarios', municipio, ano)
+            if resultado['sucesso'] or self._cancelado:
+                return resultado
+            print(f"  ⚠ [ORÇAMENTÁRIOS] Motor HTTP falhou ({resultado['erro']}) - refazendo pelo navegador")
+            if self.navegador_orcamentarios is None:
+                try:
+                    self._configurar_navegador_orcamentarios()
+                except Exception as e:
+                    return {'sucesso': False, 'municipio': municipio, 'tipo': 'orcamentarios', 'erro': str(e)}
+
         municipio_upper = municipio.upper()
         municipio_arquivo = municipio.replace(" ", "_").upper()
 
         try:
             print(f"  [ORÇAMENTÁRIOS] Processando {municipio}")
 
-            # Passo 1: Selecionar ano
-            if not self.esperar_elemento_disponivel(
-                self.navegador_orcamentarios,
-                self.wait_orcamentarios,
-                By.ID,
-                SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS['select_ano'],
-                lambda el: Select(el).select_by_visible_text(ano)
-            ):
-                raise Exception("Timeout ao selecionar ano")
-
-            # Aguarda dropdown de município carregar
-            try:
-                self.wait_orcamentarios.until(
-                    EC.presence_of_element_located((By.ID, SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS['select_municipio']))
-                )
-            except:
-                pass
-
-            # Passo 2: Selecionar município
-            if not self.esperar_elemento_disponivel(
-                self.navegador_orcamentarios,
-                self.wait_orcamentarios,
-                By.ID,
-                SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS['select_municipio'],
-                lambda el: Select(el).select_by_visible_text(municipio_upper)
-            ):
-                raise Exception("Timeout ao selecionar município")
+            # Passos 1-2: ano e município num único script (a lista de municípios não depende do ano)
+            preenchimento = self._preencher_formulario(
+                [(por_id(SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS['select_ano']), {'texto': ano}),
+                 (por_id(SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS['select_municipio']), {'texto': municipio_upper})],
+                etapa='pagamentos_res_formulario', navegador=self.navegador_orcamentarios
+            )
+            if not preenchimento['sucesso']:
+                raise Exception(f"Formulário não preenchido: {preenchimento['erro']}")
 
             # Aguarda botão Consultar estar disponível
             try:
@@ -284,15 +417,16 @@ class BotPagamentosRes(BotBase):
             ):
                 raise Exception("Timeout ao clicar consultar")
 
-            # Aguarda após consulta
-            self._sleep_cancelavel(PAGAMENTOS_RES_CONFIG['pausa_apos_consulta'])
+            # Aguarda a consulta terminar (rede ociosa e tabela sem alterações)
+            self._aguardar_pronto('pagamentos_res_apos_consulta', Todas(RedeOciosa(), DomEstavel()),
+                                  PAGAMENTOS_RES_CONFIG['pausa_apos_consulta'], navegador=self.navegador_orcamentarios)
 
             # Verificar se retornou registros
             if self.verificar_resultado_vazio(self.navegador_orcamentarios, self.wait_orcamentarios):
                 print(f"  ⓘ [ORÇAMENTÁRIOS] Sem dados para {municipio} - continuando")
 
                 # Recarrega página para voltar ao estado inicial (próximo município)
-                self.navegador_orcamentarios.get(self.url_orcamentarios)
+                self._navegar(self.url_orcamentarios, self.navegador_orcamentarios)
 
                 return {
                     'sucesso': True,
@@ -303,6 +437,7 @@ class BotPagamentosRes(BotBase):
                 }
 
             # Passo 4: Clicar gerar CSV e aguardar download
+            marca = self._marcar_download(self.navegador_orcamentarios)
             if not self.esperar_elemento_disponivel(
                 self.navegador_orcamentarios,
                 self.wait_orcamentarios,
@@ -314,21 +449,22 @@ class BotPagamentosRes(BotBase):
 
             # Passo 5: Aguardar arquivo CSV e renomear imediatamente (atomic operation)
             arquivo_renomeado = self._aguardar_e_renomear_download(
-                self.dir_orcamentarios,
+                marca,
                 PAGAMENTOS_RES_CONFIG['formato_arquivo_orcamentarios'].format(municipio=municipio_arquivo),
-                timeout=30
+                self.dir_orcamentarios
             )
 
             if arquivo_renomeado is None:
                 if self._cancelado:
                     raise Exception("Download cancelado pelo usuário")
                 else:
-                    raise Exception("Arquivo CSV não foi baixado (timeout 30s)")
+                    raise Exception("Arquivo CSV não foi baixado no prazo")
 
             print(f"  ✓ [ORÇAMENTÁRIOS] {municipio} processado com sucesso")
+            self._registrar_colunas_csv('orcamentarios', arquivo_renomeado)
 
             # Recarrega página para voltar ao estado inicial (próximo município)
-            self.navegador_orcamentarios.get(self.url_orcamentarios)
+            self._navegar(self.url_orcamentarios, self.navegador_orcamentarios)
 
             return {
                 'sucesso': True,
@@ -342,7 +478,7 @@ class BotPagamentosRes(BotBase):
 
             # Recarrega página mesmo em caso de erro (próximo município)
             try:
-                self.navegador_orcamentarios.get(self.url_orcamentarios)
+                self._navegar(self.url_orcamentarios, self.navegador_orcamentarios)
             except:
                 pass
 
@@ -358,39 +494,31 @@ class BotPagamentosRes(BotBase):
         if self._cancelado:
             return {'sucesso': False, 'municipio': municipio, 'tipo': 'restos_a_pagar', 'erro': 'Cancelado'}
 
+        if self.motor == 'http':
+            resultado = self._processar_http('restos_a_pagar', municipio, ano)
+            if resultado['sucesso'] or self._cancelado:
+                return resultado
+            print(f"  ⚠ [RESTOS A PAGAR] Motor HTTP falhou ({resultado['erro']}) - refazendo pelo navegador")
+            if self.navegador_restos is None:
+                try:
+                    self._configurar_navegador_restos()
+                except Exception as e:
+                    return {'sucesso': False, 'municipio': municipio, 'tipo': 'restos_a_pagar', 'erro': str(e)}
+
         municipio_upper = municipio.upper()
         municipio_arquivo = municipio.replace(" ", "_").upper()
 
         try:
             print(f"  [RESTOS A PAGAR] Processando {municipio}")
 
-            # Passo 1: Selecionar ano
-            if not self.esperar_elemento_disponivel(
-                self.navegador_restos,
-                self.wait_restos,
-                By.ID,
-                SELETORES_PAGAMENTOS_RES_RESTOS['select_ano'],
-                lambda el: Select(el).select_by_visible_text(ano)
-            ):
-                raise Exception("Timeout ao selecionar ano")
-
-            # Aguarda dropdown de município carregar
-            try:
-                self.wait_restos.until(
-                    EC.presence_of_element_located((By.ID, SELETORES_PAGAMENTOS_RES_RESTOS['select_municipio']))
-                )
-            except:
-                pass
-
-            # Passo 2: Selecionar município
-            if not self.esperar_elemento_disponivel(
-                self.navegador_restos,
-                self.wait_restos,
-                By.ID,
-                SELETORES_PAGAMENTOS_RES_RESTOS['select_municipio'],
-                lambda el: Select(el).select_by_visible_text(municipio_upper)
-            ):
-                raise Exception("Timeout ao selecionar município")
+            # Passos 1-2: ano e município num único script (a lista de municípios não depende do ano)
+            preenchimento = self._preencher_formulario(
+                [(por_id(SELETORES_PAGAMENTOS_RES_RESTOS['select_ano']), {'texto': ano}),
+                 (por_id(SELETORES_PAGAMENTOS_RES_RESTOS['select_municipio']), {'texto': municipio_upper})],
+                etapa='pagamentos_res_formulario', navegador=self.navegador_restos
+            )
+            if not preenchimento['sucesso']:
+                raise Exception(f"Formulário não preenchido: {preenchimento['erro']}")
 
             # Aguarda botão Consultar estar disponível
             try:
@@ -410,15 +538,16 @@ class BotPagamentosRes(BotBase):
             ):
                 raise Exception("Timeout ao clicar consultar")
 
-            # Aguarda após consulta
-            self._sleep_cancelavel(PAGAMENTOS_RES_CONFIG['pausa_apos_consulta'])
+            # Aguarda a consulta terminar (rede ociosa e tabela sem alterações)
+            self._aguardar_pronto('pagamentos_res_apos_consulta', Todas(RedeOciosa(), DomEstavel()),
+                                  PAGAMENTOS_RES_CONFIG['pausa_apos_consulta'], navegador=self.navegador_restos)
 
             # Verificar se retornou registros
             if self.verificar_resultado_vazio(self.navegador_restos, self.wait_restos):
                 print(f"  ⓘ [RESTOS A PAGAR] Sem dados para {municipio} - continuando")
 
                 # Recarrega página para voltar ao estado inicial (próximo município)
-                self.navegador_restos.get(self.url_restos_a_pagar)
+                self._navegar(self.url_restos_a_pagar, self.navegador_restos)
 
                 return {
                     'sucesso': True,
@@ -429,6 +558,7 @@ class BotPagamentosRes(BotBase):
                 }
 
             # Passo 4: Clicar gerar CSV e aguardar download
+            marca = self._marcar_download(self.navegador_restos)
             if not self.esperar_elemento_disponivel(
                 self.navegador_restos,
                 self.wait_restos,
@@ -440,21 +570,22 @@ class BotPagamentosRes(BotBase):
 
             # Passo 5: Aguardar arquivo CSV e renomear imediatamente (atomic operation)
             arquivo_renomeado = self._aguardar_e_renomear_download(
-                self.dir_restos_a_pagar,
+                marca,
                 PAGAMENTOS_RES_CONFIG['formato_arquivo_restos'].format(municipio=municipio_arquivo),
-                timeout=30
+                self.dir_restos_a_pagar
             )
 
             if arquivo_renomeado is None:
                 if self._cancelado:
                     raise Exception("Download cancelado pelo usuário")
                 else:
-                    raise Exception("Arquivo CSV não foi baixado (timeout 30s)")
+                    raise Exception("Arquivo CSV não foi baixado no prazo")
 
             print(f"  ✓ [RESTOS A PAGAR] {municipio} processado com sucesso")
+            self._registrar_colunas_csv('restos_a_pagar', arquivo_renomeado)
 
             # Recarrega página para voltar ao estado inicial (próximo município)
-            self.navegador_restos.get(self.url_restos_a_pagar)
+            self._navegar(self.url_restos_a_pagar, self.navegador_restos)
 
             return {
                 'sucesso': True,
@@ -468,7 +599,7 @@ class BotPagamentosRes(BotBase):
 
             # Recarrega página mesmo em caso de erro (próximo município)
             try:
-                self.navegador_restos.get(self.url_restos_a_pagar)
+                self._navegar(self.url_restos_a_pagar, self.navegador_restos)
             except:
                 pass
 
@@ -490,7 +621,8 @@ class BotPagamentosRes(BotBase):
             'ano': ano,
             'orcamentarios': None,
             'restos_a_pagar': None,
-            'sucesso': False
+            'sucesso': False,
+            'erro': None
         }
 
         # Thread 1: Pagamentos Orçamentários
@@ -517,7 +649,8 @@ class BotPagamentosRes(BotBase):
                     'ano': ano,
                     'orcamentarios': None,
                     'restos_a_pagar': None,
-                    'sucesso': False
+                    'sucesso': False,
+                    'erro': 'Cancelado'
                 }
             thread_orcamentarios.join(timeout=0.1)
             thread_restos.join(timeout=0.1)
@@ -528,6 +661,9 @@ class BotPagamentosRes(BotBase):
             resultado_consolidado['sucesso'] = True
             print(f"✓ {municipio} processado com SUCESSO em ambas as URLs")
         else:
+            erros = [r.get('erro') for r in (resultado_consolidado['orcamentarios'], resultado_consolidado['restos_a_pagar'])
+                     if r and not r['sucesso']]
+            resultado_consolidado['erro'] = "; ".join(e for e in erros if e) or "Falha em pelo menos uma URL"
             print(f"✗ {municipio} teve falha em pelo menos uma URL")
 
         return resultado_consolidado
@@ -584,55 +720,61 @@ class BotPagamentosRes(BotBase):
 
         return estatisticas
 
-    def _aguardar_e_renomear_download(self, diretorio: str, novo_nome: str, timeout: int = 30) -> Optional[str]:
-        """Aguarda download e renomeia IMEDIATAMENTE (previne Chrome overwrite) - MDS style"""
-        self._sleep_cancelavel(3.0)
+    def executar_paralelo(self, ano: str, num_instancias: int = 2, motor: str = None) -> Dict:
+        """Processa todos os municípios com várias instâncias (motor: padrão o deste bot)"""
+        try:
+            from src.classes.methods.parallel_processor import ProcessadorParalelo, gerar_itens_trabalho
 
-        for tentativa in range(timeout):
-            if self._cancelado:
-                return None
+            print("\n=== INICIANDO PROCESSAMENTO PARALELO PAGAMENTOS DE RESOLUÇÕES ===")
+            print(f"Ano: {ano} | Instâncias: {num_instancias}")
 
-            try:
-                # APENAS Chrome default names (previne detectar renamed files)
-                arquivos = [f for f in os.listdir(diretorio)
-                           if f.endswith('.csv') and not f.endswith(('.crdownload', '.tmp'))
-                           and not f.startswith('.') and 'Pagamento de Resoluções' in f]
-
-                if arquivos:
-                    arquivo_mais_recente = max([os.path.join(diretorio, f) for f in arquivos], key=os.path.getctime)
-
-                    if os.path.exists(arquivo_mais_recente) and os.path.getsize(arquivo_mais_recente) > 0:
-                        # RENOMEIA IMEDIATAMENTE (atomic operation)
-                        caminho_final = os.path.join(diretorio, novo_nome)
-
-                        # Retry loop para Windows file locking
-                        for retry in range(3):
-                            try:
-                                os.rename(arquivo_mais_recente, caminho_final)
-                                print(f"  ✓ CSV detectado e renomeado: {novo_nome} ({os.path.getsize(caminho_final)} bytes)")
-                                return caminho_final
-                            except PermissionError:
-                                if retry < 2:
-                                    time.sleep(0.5)
-                                else:
-                                    raise
-            except:
-                if tentativa % 5 == 0:
-                    print(f"  ⓘ Aguardando CSV ({tentativa}s/{timeout}s)...")
+            # Armazena referência do processador para cancelamento
+            self.processador_paralelo = ProcessadorParalelo()
+            itens = gerar_itens_trabalho(municipios=self.municipios_mg, ano=ano)
+            criar_bot = functools.partial(BotPagamentosRes, motor=motor or self.motor)
+            resultado = self.processador_paralelo.executar_paralelo_generico(criar_bot, itens, num_instancias,
+                                                                             nome_bot='BotPagamentosRes')
+            resultado['processador'] = self.processador_paralelo
 
-            time.sleep(1.0)
+            if resultado['sucesso']:
+                ReportGenerator.imprimir_estatisticas(resultado['estatisticas'], "PROCESSAMENTO PARALELO CONCLUÍDO")
+            else:
+                print(f"\n✗ Erro no processamento paralelo: {resultado['erro']}")
+            return resultado
 
-        print(f"  ✗ Timeout ({timeout}s) - CSV não baixado")
-        return None
+        except Exception as e:
+            return {'sucesso': False, 'erro': f'Erro ao iniciar processamento paralelo: {str(e)}'}
+
+    def _aguardar_e_renomear_download(self, marca: Dict, novo_nome: str, diretorio_final: str) -> Optional[str]:
+        """Aguarda o CSV disparado depois da marca e o move para o nome final (caminho exato do download)"""
+        timeout = PAGAMENTOS_RES_CONFIG['timeout_aguarda_download']
+        download = self._aguardar_download(marca, timeout, ('.csv',))
+        if download is None:
+            if not self._cancelado:
+                print(f"  ✗ Timeout ({timeout}s) - CSV não baixado")
+            return None
+
+        caminho_final = os.path.join(diretorio_final, novo_nome)
+        # Retry loop para Windows file locking
+        for retry in range(3):
+            try:
+                os.replace(download['caminho'], caminho_final)
+                print(f"  ✓ CSV baixado e renomeado: {novo_nome} ({download['bytes']} bytes)")
+                return caminho_final
+            except PermissionError:
+                if retry == 2 or not self._aguardar(0.5):
+                    raise
 
     def fechar_navegador(self):
         """Método compatível com GUI6 - fecha AMBOS os navegadores"""
         self.fechar_navegadores()
 
     def fechar_navegadores(self):
-        """Fecha ambos os navegadores"""
+        """Fecha ambos os navegadores (e as sessões do motor HTTP)"""
+        self._fechar_sessoes_http()
         try:
             if self.navegador_orcamentarios:
+                relatorio_bloqueio(self.navegador_orcamentarios)
                 self.navegador_orcamentarios.quit()
                 print("✓ Navegador orçamentários fechado")
         except Exception as e:
@@ -640,6 +782,7 @@ class BotPagamentosRes(BotBase):
 
         try:
             if self.navegador_restos:
+                relatorio_bloqueio(self.navegador_restos)
                 self.navegador_restos.quit()
                 print("✓ Navegador restos a pagar fechado")
         except Exception as e:
@@ -653,6 +796,13 @@ class BotPagamentosRes(BotBase):
         self._cancelado = True
         print("\n⚠ Cancelamento forçado iniciado...")
 
+        # Cancela também as instâncias da execução paralela, se houver
+        if getattr(self, 'processador_paralelo', None):
+            self.processador_paralelo.cancelar()
+            self.processador_paralelo = None
+
+        self._fechar_sessoes_http()
+
         # Fecha navegador orçamentários de forma agressiva
         if self.navegador_orcamentarios:
             print("  → Fechando navegador orçamentários...")
@@ -722,7 +872,7 @@ class BotPagamentosRes(BotBase):
             print(f"    ⚠ Erro ao limpar processos: {e}")
 
         # Aguarda processos terminarem completamente
-        time.sleep(1)
+        self._aguardar(1)
         print("✓ Cancelamento forçado concluído - todos os processos Chrome fechados")
 
 
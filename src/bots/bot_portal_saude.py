@@ -4,7 +4,6 @@ Bot de scraping para o Portal Saude MG - Resolucoes PDF
 Extrai documentos PDF do portal antigo de saude de Minas Gerais
 """
 
-from selenium import webdriver
 import sys
 import os
 
@@ -16,17 +15,19 @@ if not hasattr(sys, '_MEIPASS'):
     if project_root not in sys.path:
         sys.path.insert(0, project_root)
 
-from src.classes.chrome_driver import ChromeDriverSimples
 from src.classes.methods.cancel_method import BotBase
+from src.classes.chrome_driver import relatorio_bloqueio
+from src.classes.methods.waits import RedeOciosa, DomEstavel, ItensNovos, Todas
+from src.classes.methods.dom_extract import extrair_elementos
+from src.classes.methods.pdf_downloader import BaixadorPDF
+from src.classes.methods.download_index import IndiceDownloads
 from src.classes.central import PORTAL_SAUDE_CONFIG, SELETORES_PORTAL_SAUDE
 from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import TimeoutException, NoSuchElementException
-import time
 import os
 import shutil
-import requests
+import hashlib
 from datetime import datetime
 from typing import List, Dict, Optional, Callable
 from urllib.parse import urljoin
@@ -204,20 +205,10 @@ class BotPortalSaude(BotBase):
         return False
 
     def configurar_navegador(self) -> bool:
-        """Configura o navegador Chrome em modo headless"""
+        """Empresta um navegador Chrome headless do pool compartilhado (um por periodo)"""
         try:
-            opcoes = webdriver.ChromeOptions()
-            opcoes.add_argument("--headless=new")  # Modo headless habilitado
-            opcoes.add_argument("--disable-gpu")
-            opcoes.add_argument("--window-size=1920,1080")
-            opcoes.add_argument("--no-sandbox")
-            opcoes.add_argument("--disable-dev-shm-usage")
-
-            driver_simples = ChromeDriverSimples()
-            self.navegador = driver_simples.conectar(chrome_options=opcoes)
-
-            if self.navegador:
-                self.wait = WebDriverWait(self.navegador, self.timeout)
+            if self._emprestar_navegador(headless=True, site='portal_saude'):
+                self.wait = self._espera(self.navegador, self.timeout)
                 self.navegador.implicitly_wait(PORTAL_SAUDE_CONFIG['timeout_selenium'])
                 print("Navegador Chrome configurado com sucesso")
                 return True
@@ -259,13 +250,14 @@ class BotPortalSaude(BotBase):
         try:
             url = self._construir_url(ano, mes)
             print(f"Abrindo pagina: {url}")
-            self.navegador.get(url)
+            self._navegar(url)
 
             # Aguarda carregamento da pagina
-            WebDriverWait(self.navegador, PORTAL_SAUDE_CONFIG['timeout_carregamento_maximo']).until(
+            self._espera(self.navegador, PORTAL_SAUDE_CONFIG['timeout_carregamento_maximo']).until(
                 lambda driver: driver.execute_script("return document.readyState") == "complete"
             )
-            time.sleep(2)  # Aguardo adicional para conteudo dinamico
+            # Conteudo dinamico: aguarda rede ociosa e DOM sem alteracoes
+            self._aguardar_pronto('portal_saude_conteudo', Todas(RedeOciosa(), DomEstavel()), 2)
 
             # Verifica se pagina carregou corretamente
             if self._verificar_pagina_carregada():
@@ -292,90 +284,73 @@ class BotPortalSaude(BotBase):
         except Exception:
             return False
 
-    def _carregar_todos_resultados(self) -> int:
+    def _carregar_todos_resultados(self, diretorio_saida: str = None) -> int:
         """
-        Executa scroll infinito para carregar todos os resultados usando recursao
+        Executa scroll infinito iterativo: um MutationObserver na pagina junta os links novos de cada scroll
+
+        Para depois de scrolls_sem_conteudo_max scrolls sem itens novos ou, com o indice de downloads,
+        quando um lote inteiro ja foi baixado antes (a listagem vem do mais novo para o mais antigo).
+        Se o periodo (diretorio_saida) tem downloads que falharam antes, carrega a listagem ate o fim
+        para que eles sejam tentados de novo
         """
         print("Iniciando scroll infinito para carregar resultados...")
 
-        contagem_inicial = self._contar_resultados()
-        print(f"Resultados iniciais: {contagem_inicial}")
-
-        # Inicia recursao
-        total_scrolls = self._scroll_recursivo(
-            contagem_anterior=contagem_inicial,
-            scrolls_sem_conteudo=0,
-            scroll_count=0
-        )
+        coletor = ItensNovos(SELETORES_PORTAL_SAUDE['link_documento'])
+        coletor.iniciar(self.navegador)
+        indice = None
+        if PORTAL_SAUDE_CONFIG['usar_indice_downloads'] and PORTAL_SAUDE_CONFIG['parar_em_conhecidos']:
+            indice = IndiceDownloads()
+            pendentes = indice.falhas_pendentes(diretorio_saida) if diretorio_saida else set()
+            if pendentes:
+                print(f"{len(pendentes)} documentos com falha em execucao anterior - carregando a listagem inteira")
+                indice.fechar()
+                indice = None
+
+        lote = coletor.retirar(self.navegador) or []
+        total = len(lote)
+        scrolls = 0
+        scrolls_sem_conteudo = 0
+        print(f"Resultados iniciais: {total}")
 
-        contagem_final = self._contar_resultados()
-        print(f"Scroll concluido: {contagem_final} itens em {total_scrolls} scrolls")
-        return contagem_final
-
-    def _scroll_recursivo(
-        self,
-        contagem_anterior: int,
-        scrolls_sem_conteudo: int,
-        scroll_count: int
-    ) -> int:
-        """
-        Funcao recursiva para scroll infinito
+        try:
+            while True:
+                if lote and indice and len(indice.conhecidas(item['url'] for item in lote)) == len(lote):
+                    print(f"Lote de {len(lote)} documentos ja conhecidos - itens mais antigos nao serao carregados")
+                    break
 
-        Args:
-            contagem_anterior: Numero de resultados na iteracao anterior
-            scrolls_sem_conteudo: Contador de scrolls consecutivos sem novos resultados
-            scroll_count: Contador total de scrolls executados
+                if scrolls_sem_conteudo >= PORTAL_SAUDE_CONFIG['scrolls_sem_conteudo_max']:
+                    print(f"Nenhum conteudo novo por {scrolls_sem_conteudo} scrolls consecutivos - finalizando")
+                    break
 
-        Returns:
-            Numero total de scrolls executados
-        """
-        # Condicao de parada: 3 scrolls sem conteudo novo
-        if scrolls_sem_conteudo >= 3:
-            print(f"Nenhum conteudo novo por 3 scrolls consecutivos - finalizando")
-            return scroll_count
+                if self._verificar_cancelamento():
+                    print("Scroll cancelado pelo usuario")
+                    break
 
-        # Verifica cancelamento
-        if self._verificar_cancelamento():
-            print("Scroll cancelado pelo usuario")
-            return scroll_count
-
-        # Executa scroll ate o fim da pagina
-        self.navegador.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(1)  # Pausa fixa de 1 segundo
-
-        # Conta resultados apos scroll
-        nova_contagem = self._contar_resultados()
-        scroll_count += 1
-
-        # Verifica se houve novo conteudo
-        if nova_contagem > contagem_anterior:
-            novos_itens = nova_contagem - contagem_anterior
-            print(f"  Scroll #{scroll_count}: +{novos_itens} itens (total: {nova_contagem})")
-
-            # Recursao: continua scrollando (reseta contador de scrolls vazios)
-            return self._scroll_recursivo(
-                contagem_anterior=nova_contagem,
-                scrolls_sem_conteudo=0,
-                scroll_count=scroll_count
-            )
-        else:
-            # Nenhum conteudo novo: incrementa contador e tenta novamente
-            print(f"  Scroll #{scroll_count}: sem novos itens ({scrolls_sem_conteudo + 1}/3)")
-
-            # Recursao: continua mas incrementa contador de scrolls vazios
-            return self._scroll_recursivo(
-                contagem_anterior=nova_contagem,
-                scrolls_sem_conteudo=scrolls_sem_conteudo + 1,
-                scroll_count=scroll_count
-            )
+                # Scroll ate o fim da pagina e espera o observador avisar que o lote novo chegou
+                self.navegador.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+                self._aguardar_pronto('portal_saude_scroll', coletor, PORTAL_SAUDE_CONFIG['pausa_entre_scrolls'])
+                scrolls += 1
+
+                lote = coletor.retirar(self.navegador)
+                if lote is None:
+                    # Pagina recarregou: o coletor novo devolve tudo o que estiver na pagina
+                    coletor.iniciar(self.navegador)
+                    lote = coletor.retirar(self.navegador) or []
+
+                if lote:
+                    total += len(lote)
+                    scrolls_sem_conteudo = 0
+                    print(f"  Scroll #{scrolls}: +{len(lote)} itens (total: {total})")
+                else:
+                    scrolls_sem_conteudo += 1
+                    print(f"  Scroll #{scrolls}: sem novos itens "
+                          f"({scrolls_sem_conteudo}/{PORTAL_SAUDE_CONFIG['scrolls_sem_conteudo_max']})")
+        finally:
+            if indice:
+                indice.fechar()
 
-    def _contar_resultados(self) -> int:
-        """Conta numero atual de resultados na pagina"""
-        try:
-            links = self.navegador.find_elements(By.CSS_SELECTOR, SELETORES_PORTAL_SAUDE['link_documento'])
-            return len(links)
-        except Exception:
-            return 0
+        print(f"Scroll concluido: {total} itens em {scrolls} scrolls")
+        return total
 
     def _esta_no_fim_pagina(self) -> bool:
         """Verifica se esta no fim da pagina"""
@@ -396,24 +371,22 @@ class BotPortalSaude(BotBase):
         try:
             print("Coletando links de documentos...")
 
-            links_elementos = self.navegador.find_elements(By.CSS_SELECTOR, SELETORES_PORTAL_SAUDE['link_documento'])
+            # href e texto de todos os links numa unica chamada ao navegador
+            links = extrair_elementos(self.navegador, SELETORES_PORTAL_SAUDE['link_documento'], ['href', 'texto'])
             pdf_links = []
             urls_vistas = set()
 
-            for link in links_elementos:
-                try:
-                    href = link.get_attribute("href")
-                    texto = link.text.strip()
-
-                    if href and texto and href not in urls_vistas:
-                        urls_vistas.add(href)
-                        pdf_links.append({
-                            'url': href,
-                            'titulo': texto,
-                            'texto': texto
-                        })
-                except Exception:
-                    continue
+            for link in links:
+                href = link['href']
+                texto = link['texto']
+
+                if href and texto and href not in urls_vistas:
+                    urls_vistas.add(href)
+                    pdf_links.append({
+                        'url': href,
+                        'titulo': texto,
+                        'texto': texto
+                    })
 
             print(f"Coletados {len(pdf_links)} links unicos de documentos")
             return pdf_links
@@ -422,52 +395,6 @@ class BotPortalSaude(BotBase):
             print(f"Erro ao coletar links: {e}")
             return []
 
-    def _baixar_arquivo(self, url: str, filepath: str, max_tentativas: int = 3) -> bool:
-        """
-        Baixa arquivo com retry logic
-
-        Args:
-            url: URL do arquivo
-            filepath: Caminho destino
-            max_tentativas: Numero maximo de tentativas
-
-        Returns:
-            True se download bem sucedido
-        """
-        for tentativa in range(1, max_tentativas + 1):
-            try:
-                if self._verificar_cancelamento():
-                    return False
-
-                # Garante URL absoluta
-                if not url.startswith('http'):
-                    url = urljoin(self.base_url, url)
-
-                response = requests.get(
-                    url,
-                    stream=True,
-                    timeout=30,
-                    headers={'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'}
-                )
-                response.raise_for_status()
-
-                # Salva arquivo
-                with open(filepath, 'wb') as f:
-                    for chunk in response.iter_content(chunk_size=8192):
-                        if chunk:
-                            f.write(chunk)
-
-                return True
-
-            except Exception as e:
-                if tentativa < max_tentativas:
-                    print(f"  Tentativa {tentativa}/{max_tentativas} falhou: {e}")
-                    time.sleep(2 * tentativa)  # Backoff exponencial
-                else:
-                    print(f"  Falha apos {max_tentativas} tentativas: {url}")
-
-        return False
-
     def _validar_pdf(self, filepath: str) -> bool:
         """
         Valida se arquivo e um PDF valido
@@ -543,7 +470,7 @@ class BotPortalSaude(BotBase):
         callback_progresso: Callable = None
     ) -> List[Dict[str, str]]:
         """
-        Baixa todos os PDFs da lista usando nomes originais
+        Baixa todos os PDFs da lista (varios ao mesmo tempo) usando nomes originais
 
         Args:
             links: Lista de links para baixar
@@ -563,59 +490,83 @@ class BotPortalSaude(BotBase):
 
         print(f"Iniciando download de {len(links)} PDFs para {diretorio_saida}")
 
-        for ordem, link_info in enumerate(links, 1):
-            if self._verificar_cancelamento():
-                print("Downloads cancelados pelo usuario")
-                break
-
-            try:
-                # Usa nome original do arquivo
-                nome_arquivo = self._extrair_nome_arquivo(link_info['url'], link_info['titulo'])
-                filepath = os.path.join(diretorio_saida, nome_arquivo)
-
-                # Verifica se ja existe
-                if os.path.exists(filepath) and self._validar_pdf(filepath):
-                    print(f"  [{ordem}/{len(links)}] Ja existe: {nome_arquivo}")
-                    arquivos_baixados.append({
-                        'caminho': filepath,
-                        'url': link_info['url'],
-                        'titulo': link_info['titulo']
-                    })
-                    continue
-
-                print(f"  [{ordem}/{len(links)}] Baixando: {link_info['titulo'][:50]}...")
-
-                # Callback de progresso
-                if callback_progresso:
-                    callback_progresso("downloading", f"Baixando {ordem}/{len(links)}", ordem, len(links))
-
-                # Baixa arquivo
-                if self._baixar_arquivo(link_info['url'], filepath):
-                    # Valida PDF
-                    if self._validar_pdf(filepath):
-                        arquivos_baixados.append({
-                            'caminho': filepath,
-                            'url': link_info['url'],
-                            'titulo': link_info['titulo']
-                        })
-                        print(f"  [{ordem}/{len(links)}] Sucesso: {nome_arquivo}")
-                    else:
-                        # Remove arquivo invalido
-                        if os.path.exists(filepath):
-                            os.remove(filepath)
-                        print(f"  [{ordem}/{len(links)}] PDF invalido removido")
-                else:
-                    print(f"  [{ordem}/{len(links)}] Falha no download")
-
-                time.sleep(PORTAL_SAUDE_CONFIG['pausa_entre_downloads'])
+        # Com o indice, so vem pela rede o que mudou desde a ultima execucao (requisicoes condicionais)
+        indice = IndiceDownloads() if PORTAL_SAUDE_CONFIG['usar_indice_downloads'] else None
+
+        # Arquivos ja baixados em execucoes anteriores nao sao baixados de novo
+        tarefas = []
+        destinos = set()
+        for link_info in links:
+            nome_arquivo = self._extrair_nome_arquivo(link_info['url'], link_info['titulo'])
+            filepath = os.path.join(diretorio_saida, nome_arquivo)
+            url = urljoin(self.base_url, link_info['url'])
+            if os.path.exists(filepath) and self._validar_pdf(filepath):
+                print(f"  Ja existe: {nome_arquivo}")
+                arquivos_baixados.append({'caminho': filepath, 'url': link_info['url'], 'titulo': link_info['titulo']})
+                if indice:
+                    self._registrar_existente(indice, url, filepath)
+            elif filepath not in destinos:
+                destinos.add(filepath)
+                tarefas.append({'url': url, 'caminho': filepath, 'titulo': link_info['titulo']})
+
+        inalterados = []
+
+        def progresso(concluidos: int, total: int, resultado: Dict):
+            nome_arquivo = os.path.basename(resultado['caminho'])
+            if resultado['sucesso'] and resultado['inalterado']:
+                # Ja baixado (e processado) em execucao anterior e nao mudou no portal
+                inalterados.append(resultado['url'])
+                print(f"  [{concluidos}/{total}] Inalterado desde a ultima execucao: {nome_arquivo}")
+            elif resultado['sucesso']:
+                arquivos_baixados.append({
+                    'caminho': resultado['caminho'],
+                    'url': resultado['url'],
+                    'titulo': resultado['titulo']
+                })
+                print(f"  [{concluidos}/{total}] Sucesso: {nome_arquivo} ({resultado['bytes']} bytes)")
+            else:
+                print(f"  [{concluidos}/{total}] Falha em {nome_arquivo}: {resultado['erro']}")
+                if indice:
+                    # Pendente: a proxima execucao carrega a listagem do periodo inteira para tentar de novo
+                    indice.registrar_falha(resultado['url'], resultado['caminho'], resultado['erro'])
+            if callback_progresso:
+                callback_progresso("downloading", f"Baixando {concluidos}/{total}", concluidos, total)
+
+        # Downloads simultaneos pela mesma sessao (conexoes keep-alive), limitados por host pelo governador
+        baixador = BaixadorPDF(
+            token=self.token,
+            tentativas=PORTAL_SAUDE_CONFIG['max_tentativas_download'],
+            tamanho_minimo=PORTAL_SAUDE_CONFIG['tamanho_minimo_pdf'],
+            indice=indice
+        )
+        try:
+            baixador.baixar_todos(tarefas, progresso)
+        finally:
+            baixador.fechar()
+            if indice:
+                indice.fechar()
 
-            except Exception as e:
-                print(f"  [{ordem}/{len(links)}] Erro: {e}")
-                continue
+        if self._verificar_cancelamento():
+            print("Downloads cancelados pelo usuario")
 
-        print(f"Downloads concluidos: {len(arquivos_baixados)}/{len(links)} arquivos")
+        print(f"Downloads concluidos: {len(arquivos_baixados)}/{len(links)} arquivos"
+              f"{f' ({len(inalterados)} inalterados)' if inalterados else ''}")
         return arquivos_baixados
 
+    @staticmethod
+    def _registrar_existente(indice: IndiceDownloads, url: str, filepath: str):
+        """Poe no indice um PDF baixado antes de o indice existir (sem validadores HTTP, so tamanho e SHA-256)"""
+        if indice.obter(url) is not None:
+            return
+        resumo = hashlib.sha256()
+        try:
+            with open(filepath, 'rb') as arquivo:
+                for bloco in iter(lambda: arquivo.read(1024 * 1024), b''):
+                    resumo.update(bloco)
+            indice.registrar(url, tamanho=os.path.getsize(filepath), sha256=resumo.hexdigest(), caminho=filepath)
+        except OSError as e:
+            print(f"  Aviso: nao foi possivel registrar {os.path.basename(filepath)} no indice - {e}")
+
     # def call_pdf2excel_converter
 
     def _processar_periodo_unico(
@@ -676,7 +627,7 @@ class BotPortalSaude(BotBase):
             if self._verificar_cancelamento(resultado):
                 return resultado
 
-            total_itens = self._carregar_todos_resultados()
+            total_itens = self._carregar_todos_resultados(self._obter_diretorio_saida(ano, mes))
 
             # 4. Coleta links de PDFs
             if callback_progresso:
@@ -717,6 +668,63 @@ class BotPortalSaude(BotBase):
 
         return resultado
 
+    def _gerar_excel_consolidado(self, resultado_final: Dict, periodos: List[tuple]):
+        """
+        Processa os PDFs baixados com IA e gera o Excel consolidado
+
+        Args:
+            resultado_final: Resultado consolidado (recebe as chaves do Excel gerado)
+            periodos: Lista de tuplas (ano, mes) processadas
+        """
+        if resultado_final['total_baixados'] > 0 and resultado_final['arquivos_baixados']:
+            print(f"{'='*60}")
+            print(f"PROCESSAMENTO DE PDFs COM IA")
+            print(f"{'='*60}\n")
+
+            try:
+                from src.classes.methods.pdf_to_table import PDFToTableConverter
+
+                # Determine appropriate output directory for consolidated Excel
+                output_dir = self._determinar_diretorio_excel_consolidado(periodos)
+                print(f"Diretorio para Excel consolidado: {output_dir}")
+
+                # Create converter instance
+                converter = PDFToTableConverter()
+
+                # Process all accumulated PDFs
+                excel_result = converter.process_file_list(
+                    pdf_files=resultado_final['arquivos_baixados'],
+                    output_dir=output_dir
+                )
+
+                if excel_result['success']:
+                    # Add Excel info to result
+                    resultado_final['excel_consolidado'] = excel_result['excel_path']
+                    resultado_final['pdfs_processados'] = excel_result['total_processed']
+                    resultado_final['pdfs_com_sucesso'] = excel_result['successful']
+                    resultado_final['pdfs_com_falha'] = excel_result['failed']
+                    resultado_final['pdfs_deletados'] = excel_result.get('pdfs_deleted', 0)
+                    resultado_final['pastas_deletadas'] = excel_result.get('total_folders_deleted', 0)
+
+                    print(f"\n{'='*60}")
+                    print(f"PROCESSAMENTO DE PDFs COM IA - CONCLUIDO")
+                    print(f"{'='*60}")
+                    print(f"  Excel consolidado: {excel_result['excel_path']}")
+                    print(f"  PDFs processados: {excel_result['total_processed']}")
+                    print(f"  Sucessos: {excel_result['successful']}")
+                    print(f"  Falhas: {excel_result['failed']}")
+                    print(f"  PDFs deletados: {excel_result.get('pdfs_deleted', 0)}")
+                    print(f"  Pastas deletadas: {excel_result.get('total_folders_deleted', 0)}")
+                    print(f"{'='*60}\n")
+                else:
+                    print(f"\n[AVISO] Falha ao gerar Excel: {excel_result.get('error')}")
+
+            except Exception as e:
+                # Don't fail the entire bot run if Excel generation fails
+                print(f"\n[AVISO] Erro ao processar PDFs com IA: {e}")
+                import traceback
+                traceback.print_exc()
+
     def processar(
         self,
         ano: str,
@@ -806,76 +814,126 @@ class BotPortalSaude(BotBase):
                 print(f"{'='*60}\n")
 
             # Process PDFs with AI if downloads succeeded (moved outside success check)
-            if resultado_final['total_baixados'] > 0 and resultado_final['arquivos_baixados']:
-                print(f"{'='*60}")
-                print(f"PROCESSAMENTO DE PDFs COM IA")
-                print(f"{'='*60}\n")
+            self._gerar_excel_consolidado(resultado_final, periodos)
 
-                try:
-                    from src.classes.methods.pdf_to_table import PDFToTableConverter
+        except Exception as e:
+            resultado_final['erro'] = f"Erro inesperado: {str(e)}"
+            print(f"Erro durante processamento: {e}")
 
-                    # Determine appropriate output directory for consolidated Excel
-                    output_dir = self._determinar_diretorio_excel_consolidado(periodos)
-                    print(f"Diretorio para Excel consolidado: {output_dir}")
+        finally:
+            self._em_execucao = False
+            # Garante que navegador esta fechado
+            self.fechar_navegador()
+
+        return resultado_final
 
-                    # Create converter instance
-                    converter = PDFToTableConverter()
+    def iniciar_sessao(self) -> bool:
+        """Cada periodo abre sua propria sessao Chrome - nada a preparar"""
+        return True
 
-                    # Process all accumulated PDFs
-                    excel_result = converter.process_file_list(
-                        pdf_files=resultado_final['arquivos_baixados'],
-                        output_dir=output_dir
-                    )
+    def processar_item(self, item: Dict) -> Dict:
+        """Processa o item {'ano', 'mes'} como um periodo unico"""
+        return self._processar_periodo_unico(item['ano'], item['mes'])
+
+    def descrever_item(self, item: Dict) -> str:
+        """Periodo no formato mes/ano"""
+        return f"{item['mes']}/{item['ano']}"
+
+    def executar_paralelo(
+        self,
+        ano: str,
+        mes: str = None,
+        num_instancias: int = 2
+    ) -> Dict:
+        """
+        Executa o processamento distribuindo os periodos entre varias instancias
+
+        Args:
+            ano: Ano para filtrar ou "Todos os Anos"
+            mes: Mes para filtrar ou "Todos os Meses" ou None
+            num_instancias: Numero de navegadores simultaneos
+
+        Returns:
+            Dicionario com resultado consolidado (mesmo formato de processar())
+        """
+        resultado_final = {
+            'sucesso': False,
+            'erro': None,
+            'arquivos_baixados': [],
+            'total_links': 0,
+            'total_baixados': 0,
+            'diretorio_saida': self.diretorio_base,
+            'periodos_processados': 0,
+            'periodos_total': 0
+        }
+
+        try:
+            from src.classes.methods.parallel_processor import ProcessadorParalelo, gerar_itens_periodos
 
-                    if excel_result['success']:
-                        # Add Excel info to result
-                        resultado_final['excel_consolidado'] = excel_result['excel_path']
-                        resultado_final['pdfs_processados'] = excel_result['total_processed']
-                        resultado_final['pdfs_com_sucesso'] = excel_result['successful']
-                        resultado_final['pdfs_com_falha'] = excel_result['failed']
-                        resultado_final['pdfs_deletados'] = excel_result.get('pdfs_deleted', 0)
-                        resultado_final['pastas_deletadas'] = excel_result.get('total_folders_deleted', 0)
-
-                        print(f"\n{'='*60}")
-                        print(f"PROCESSAMENTO DE PDFs COM IA - CONCLUIDO")
-                        print(f"{'='*60}")
-                        print(f"  Excel consolidado: {excel_result['excel_path']}")
-                        print(f"  PDFs processados: {excel_result['total_processed']}")
-                        print(f"  Sucessos: {excel_result['successful']}")
-                        print(f"  Falhas: {excel_result['failed']}")
-                        print(f"  PDFs deletados: {excel_result.get('pdfs_deleted', 0)}")
-                        print(f"  Pastas deletadas: {excel_result.get('total_folders_deleted', 0)}")
-                        print(f"{'='*60}\n")
-                    else:
-                        print(f"\n[AVISO] Falha ao gerar Excel: {excel_result.get('error')}")
-
-                except Exception as e:
-                    # Don't fail the entire bot run if Excel generation fails
-                    print(f"\n[AVISO] Erro ao processar PDFs com IA: {e}")
-                    import traceback
-                    traceback.print_exc()
+            self._em_execucao = True
+            self._cancelado = False
+
+            periodos = self._gerar_periodos(ano, mes)
+            resultado_final['periodos_total'] = len(periodos)
+
+            if not periodos:
+                resultado_final['erro'] = "Nenhum periodo para processar"
+                return resultado_final
+
+            # Armazena referencia do processador para cancelamento
+            self.processador_paralelo = ProcessadorParalelo()
+            resultado = self.processador_paralelo.executar_paralelo_generico(
+                BotPortalSaude,
+                gerar_itens_periodos(periodos),
+                num_instancias
+            )
+
+            if not resultado['sucesso']:
+                resultado_final['erro'] = resultado['erro']
+                return resultado_final
+
+            # Acumula resultados de todos os periodos (na ordem em que terminaram)
+            for resultado_periodo in self.processador_paralelo.resultados_itens:
+                resultado_final['total_links'] += resultado_periodo.get('total_links', 0)
+                resultado_final['total_baixados'] += resultado_periodo.get('total_baixados', 0)
+                resultado_final['arquivos_baixados'].extend(
+                    resultado_periodo.get('arquivos_baixados', [])
+                )
+            resultado_final['periodos_processados'] = len(self.processador_paralelo.resultados_itens)
+
+            if not self._cancelado:
+                resultado_final['sucesso'] = True
+                print(f"\n{'='*60}")
+                print(f"PROCESSAMENTO PARALELO CONCLUIDO!")
+                print(f"  Periodos processados: {resultado_final['periodos_processados']}/{len(periodos)}")
+                print(f"  Total de arquivos: {resultado_final['total_baixados']}")
+                print(f"{'='*60}\n")
+
+            self._gerar_excel_consolidado(resultado_final, periodos)
 
         except Exception as e:
             resultado_final['erro'] = f"Erro inesperado: {str(e)}"
-            print(f"Erro durante processamento: {e}")
+            print(f"Erro durante processamento paralelo: {e}")
 
         finally:
             self._em_execucao = False
-            # Garante que navegador esta fechado
-            self.fechar_navegador()
+            self.processador_paralelo = None
 
         return resultado_final
 
     def fechar_navegador(self):
-        """Fecha o navegador e libera recursos"""
+        """Devolve o navegador ao pool (ou fecha, se nao veio do pool) e libera recursos"""
         try:
-            if self.navegador:
+            if self._liberar_navegador(descartar=self._cancelado):
+                print("Navegador devolvido ao pool")
+            elif self.navegador:
                 try:
                     for handle in self.navegador.window_handles:
                         self.navegador.switch_to.window(handle)
                         self.navegador.close()
                 except Exception:
                     pass
+                relatorio_bloqueio(self.navegador)
                 self.navegador.quit()
                 self.navegador = None
                 self.wait = None
@@ -887,6 +945,8 @@ class BotPortalSaude(BotBase):
         """Cancela execucao em andamento"""
         self._cancelado = True
         self._em_execucao = False
+        if getattr(self, 'processador_paralelo', None):
+            self.processador_paralelo.cancelar()
         if forcado:
             self.fechar_navegador()
         super().cancelar(forcado=forcado)
@@ -1,7 +1,7 @@
 # Pacote classes para organização do projeto de web scraping
 # Contém todas as classes necessárias para automação web
 
-from .chrome_driver import ChromeDriverSimples
+from .chrome_driver import ChromeDriverSimples, PoolNavegadores, obter_pool_navegadores
 from .data_extractor import DataExtractor
 from .date_calculator import DateCalculator
 from .file.file_manager import FileManager
@@ -9,19 +9,31 @@ from .file.file_converter import FileConverter
 from .file.path_manager import obter_caminho_dados, obter_caminho_recurso, copiar_arquivo_cidades_se_necessario
 from .city_manager import CitySplitter
 from .methods.parallel_processor import ProcessadorParalelo
+from .methods.autoscaler import AutoEscalador
 from .methods.cancel_method import BotBase
+from .methods.journal import DiarioExecucao
+from .methods.governor import GovernadorSites, obter_governador
+from .methods.waits import MedidorEsperas, obter_medidor_esperas
 from .methods.auto_execution import AutomaticExecutor
 from .central import *
 
 __all__ = [
     'ChromeDriverSimples',
+    'PoolNavegadores',
+    'obter_pool_navegadores',
     'DataExtractor',
     'DateCalculator',
     'FileManager',
     'FileConverter',
     'CitySplitter',
     'ProcessadorParalelo',
+    'AutoEscalador',
     'BotBase',
+    'DiarioExecucao',
+    'GovernadorSites',
+    'obter_governador',
+    'MedidorEsperas',
+    'obter_medidor_esperas',
     'AutomaticExecutor',
     'obter_caminho_dados',
     'obter_caminho_recurso',
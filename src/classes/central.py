@@ -16,6 +16,22 @@ SISTEMA_CONFIG = {
     'pausa_esc_calendario': 0.05,      # Reduzido de 0.5s para 0.05s
 }
 
+# Captura dos resultados BB DAF a partir das respostas JSON (XHR) da aplicação Angular
+BBDAF_XHR_CONFIG = {
+    # False: sempre lê a tabela do HTML (page_source). Desligado até os nomes de campo abaixo serem conferidos
+    # com as respostas reais do site; ao ligar, restringir padroes_url ao endpoint dos lançamentos
+    'ativo': False,
+    'padroes_url': ['*bb.com.br*'],    # Respostas consideradas ('*' é curinga)
+    # Nomes de campo aceitos no JSON para cada coluna (comparação sem maiúsculas/minúsculas)
+    'campos': {
+        'data': ['data', 'datalancamento', 'datacredito', 'dtlancamento', 'datarepasse', 'datamovimento'],
+        'parcela': ['parcela', 'nomeparcela', 'descricaoparcela', 'descricao', 'historico'],
+        'valor_distribuido': ['valordistribuido', 'valorlancamento', 'vllancamento', 'valor'],
+        'natureza': ['natureza', 'indicadordebitocredito', 'debitocredito', 'sinal', 'dc'],
+    },
+    'formato_data': '%d.%m.%Y',        # Mesmo formato exibido na tabela do site
+}
+
 # Configurações de arquivos
 ARQUIVOS_CONFIG = {
     # Nome do arquivo com todas as 852 cidades de MG
@@ -46,6 +62,177 @@ SELETORES_CSS = {
     'campos_data': 'input[placeholder="DD / MM / AAAA"]',
 }
 
+# Configurações de execução paralela (ProcessadorParalelo)
+PARALELO_CONFIG = {
+    # Limite de instâncias no modo manual (antes fixo em 5)
+    'max_instancias': 5,
+
+    # Faixa de instâncias no modo de autoescala
+    'autoescala_min': 1,
+    'autoescala_max': 16,
+
+    # Limites de uso da máquina - acima deles uma instância é aposentada
+    'limite_cpu_percent': 85,
+    'limite_ram_percent': 85,
+    'limite_rss_chrome_mb': 24000,     # Soma da memória dos Chrome/ChromeDriver abertos pelo processo
+
+    # Frequência de reavaliação (em segundos)
+    'intervalo_avaliacao': 10,
+
+    # Recuo quando o site alvo começa a falhar (timeouts)
+    'janela_resultados': 10,           # Últimos N resultados considerados
+    'taxa_falha_recuo': 0.5,           # Fração de falhas que dispara o recuo
+    'pausa_apos_recuo': 60,            # Segundos sem adicionar instâncias após um recuo
+
+    # Ordem da fila: 'lpt' (mais demorados primeiro, pelo histórico) ou 'fifo' (ordem da lista)
+    'politica_escalonamento': 'lpt',
+    'peso_duracao_recente': 0.3,       # Peso da última medição na média de duração do município
+    'duracao_padrao_item': 30,         # Segundos previstos quando ainda não há histórico
+
+    # Segundos que o cancelamento aguarda os bots encerrarem sozinhos antes de forçar o fechamento
+    'tolerancia_cancelamento': 1.5,
+}
+
+# Vigia de memória do Chrome em lotes longos (VigiaMemoria) - troca o navegador entre municípios
+MEMORIA_CONFIG = {
+    'ativo': True,
+    'limite_rss_mb': 1200,             # Chrome + ChromeDriver de um bot acima disto: navegador reiniciado
+    'reciclar_apos_itens': 150,        # ...ou após N municípios no mesmo navegador (0 desliga)
+    'registrar_curva': True,           # Grava a memória após cada município em curvas_memoria/*.csv
+}
+
+# Supervisão da sessão (session_supervisor.py) - navegador morto ou travado é reaberto sem abandonar o lote
+SESSAO_CONFIG = {
+    'repeticoes_por_item': 2,          # Vezes que um item é refeito depois de o navegador cair durante ele
+    'reinicios_max': 10,               # Reaberturas do navegador por execução (ou instância) antes de desistir
+    'timeout_verificacao': 10,         # Segundos para o navegador responder a um script trivial
+    'timeout_carregamento_pagina': 90, # Navegação parada além disto vira erro em vez de prender o bot
+    'pausa_reinicio': 2,               # Segundos entre duas tentativas de reabrir o navegador
+}
+
+# Pool de navegadores compartilhado entre bots (PoolNavegadores em chrome_driver.py)
+NAVEGADORES_CONFIG = {
+    'max_ociosos': 4,                  # Navegadores prontos mantidos abertos entre empréstimos
+    'reciclar_apos_usos': 20,          # Fecha o Chrome após N empréstimos (evita acúmulo de memória)
+    'ocioso_max': 600,                 # Segundos parado no pool antes de ser fechado
+}
+
+# Bloqueio de recursos desnecessários para scraping (CDP Network.setBlockedURLs)
+BLOQUEIO_RECURSOS_CONFIG = {
+    'ativo': True,
+    # Padrões de URL por categoria ('*' é curinga; o sufixo '*' cobre query strings)
+    'categorias': {
+        'imagens': ['*.png*', '*.jpg*', '*.jpeg*', '*.gif*', '*.webp*', '*.bmp*', '*.ico*'],
+        'fontes': ['*.woff*', '*.woff2*', '*.ttf*', '*.otf*', '*.eot*'],
+        'midia': ['*.mp4*', '*.webm*', '*.mp3*', '*.ogg*', '*.avi*'],
+        'analytics': ['*google-analytics.com*', '*googletagmanager.com*', '*doubleclick.net*',
+                      '*hotjar.com*', '*clarity.ms*', '*connect.facebook.net*'],
+    },
+    # Tamanho médio estimado de cada recurso bloqueado (KB) - base da estimativa de bytes economizados
+    'tamanho_medio_kb': {'imagens': 35, 'fontes': 60, 'midia': 1500, 'analytics': 80},
+    # Perfis: categorias bloqueadas
+    'perfis': {
+        'scraping': ['imagens', 'fontes', 'midia', 'analytics'],
+        'leve': ['midia', 'analytics'],
+    },
+    # Liberações por site: categorias (ou padrões) que o site precisa mesmo no perfil de bloqueio
+    'permitir': {
+        'bbdaf': [],
+        'fnde': [],
+        'consfns': [],
+        'mds': [],
+        'pagamentos_res': [],
+        'portal_saude': [],
+        'betha': ['fontes'],  # Janela visível: botões da interface usam fonte de ícones
+    },
+}
+
+# Esperas por condição (waits.py) - substituem as pausas fixas de cada etapa dos bots
+ESPERAS_CONFIG = {
+    'ativo': True,                     # False: volta às pausas fixas antigas
+    'intervalo': 0.05,                 # Intervalo entre verificações da condição (segundos)
+    'timeout_padrao': 3,               # Tempo máximo de espera quando a etapa não tem limite próprio
+    'multiplo_pausa': 4,               # Espera no lugar de uma pausa fixa: no máximo 4x a pausa antiga
+    'dom_quieto_ms': 150,              # DOM sem mudanças por este tempo = estável
+    'rede_quieta_ms': 300,             # Sem requisições por este tempo = rede ociosa
+    # Tempo máximo por etapa (segundos) - esgotado, o bot segue adiante como antes
+    # Nas etapas que substituem uma pausa fixa vale o menor entre este valor e multiplo_pausa x pausa antiga
+    # (condição que nunca fica verdadeira custa no pior caso 4x a pausa, não o limite inteiro)
+    'timeouts': {
+        'bbdaf_apos_clique': 8,
+        'bbdaf_datas': 8,
+        'bbdaf_entre_cidades': 5,
+        'consfns_abrir_pagina': 8,
+        'consfns_apos_esfera': 5,
+        'consfns_lista_municipios': 5,
+        'consfns_resultado_esfera': 30,
+        'betha_login': 8,
+        'fnde_apos_selecao': 5,
+        'mds_formulario': 15,
+        'pagamentos_res_apos_consulta': 8,
+        'pagamentos_res_formulario': 10,
+        'portal_saude_conteudo': 6,
+        'portal_saude_scroll': 4,
+    },
+}
+
+# Governador de acesso aos sites (GovernadorSites) - vale para todos os bots e instâncias do processo
+GOVERNADOR_CONFIG = {
+    # Limite usado para hosts sem configuração própria
+    'padrao': {
+        'taxa_por_segundo': 2.0,       # Fichas repostas por segundo (ritmo sustentado de acessos)
+        'rajada': 4,                   # Acessos seguidos permitidos antes de aplicar o ritmo
+        'max_simultaneas': 6,          # Acessos em andamento ao mesmo tempo
+    },
+    # max_simultaneas vale por acesso (navegação, formulário, download), não por sessão: um navegador
+    # aberto e parado entre dois acessos não ocupa vaga. Quantas sessões abrir é decidido pelo número
+    # de instâncias (PARALELO_CONFIG) - o governador só impede que todas acessem o site no mesmo instante
+
+    # Limites por host (sobrescrevem o padrão)
+    'hosts': {
+        'demonstrativos.apps.bb.com.br': {'taxa_por_segundo': 1.0, 'rajada': 3, 'max_simultaneas': 4},
+        'www.fnde.gov.br': {'taxa_por_segundo': 1.0, 'rajada': 3, 'max_simultaneas': 4},
+        'aplicacoes.mds.gov.br': {'taxa_por_segundo': 1.0, 'rajada': 2, 'max_simultaneas': 4},
+        'consultafns.saude.gov.br': {'taxa_por_segundo': 1.0, 'rajada': 2, 'max_simultaneas': 3},
+        'portal-antigo.saude.mg.gov.br': {'taxa_por_segundo': 4.0, 'rajada': 8, 'max_simultaneas': 4},
+    },
+
+    # Espera na fila (segundos) a partir da qual o governador avisa no console
+    'aviso_espera': 5,
+}
+
+# Sessões HTTP dos motores que consultam os sites sem navegador (requests)
+HTTP_CONFIG = {
+    'timeout': 30,                     # Tempo máximo de cada requisição (segundos)
+    'tentativas': 3,                   # Novas tentativas em erro de conexão ou status abaixo
+    'fator_espera': 0.5,               # Espera entre tentativas: fator * 2^(tentativa - 1) segundos
+    'status_repetir': [429, 500, 502, 503, 504],
+    'pool_hosts': 4,                   # Hosts com conexões guardadas por sessão
+    'pool_conexoes': 8,                # Conexões keep-alive guardadas por host
+    'cabecalhos': {
+        'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+                      '(KHTML, like Gecko) Chrome/124.0 Safari/537.36',
+        'Accept-Language': 'pt-BR,pt;q=0.9',
+    },
+}
+
+# Downloads de PDF em paralelo por sessão HTTP compartilhada (BaixadorPDF)
+DOWNLOAD_PDF_CONFIG = {
+    'simultaneos': 4,                  # Downloads em andamento por bot (o governador ainda limita por host)
+    'tentativas': 3,                   # Tentativas por arquivo (erro de rede ou corpo interrompido)
+    'espera_base': 1.0,                # Espera antes da 2ª tentativa; dobra a cada nova tentativa (com jitter)
+    'espera_maxima': 20.0,             # Teto da espera entre tentativas (segundos)
+    'tamanho_bloco': 65536,            # Bytes lidos por vez do corpo da resposta
+    'tamanho_minimo': 1024,            # Arquivos menores são descartados
+}
+
+# Acompanhamento dos downloads do Chrome (RastreadorDownloads em chrome_driver.py)
+RASTREIO_DOWNLOADS_CONFIG = {
+    'ativo': True,                     # False: sempre procura o arquivo novo no diretório (modo antigo)
+    'timeout_conexao': 5,              # Segundos para conectar ao DevTools e para cada comando CDP
+    'intervalo_verificacao': 0.5,      # Intervalo entre olhadas no diretório (modo sem eventos)
+}
+
 # Configurações de datas
 DATAS_CONFIG = {
     # Formato de data usado no sistema
@@ -60,6 +247,13 @@ FNDE_CONFIG = {
     # URL base do sistema FNDE
     'url_base': 'https://www.fnde.gov.br/pls/simad/internet_fnde.LIBERACOES_01_PC',
 
+    # Motor de consulta: 'http' (requisições diretas, sem navegador) ou 'selenium'
+    # No motor http, o município que falhar é refeito pelo Selenium
+    'motor': 'http',
+    # Textos que o cabeçalho da tabela de liberações precisa ter para a resposta HTTP valer como resultado
+    # (página do formulário ou de sessão expirada devolvida no lugar é refeita pelo Selenium)
+    'cabecalhos_resultado': ['VALOR'],
+
     # Parâmetros padrão
     'uf_padrao': 'MG',
     'entidade_padrao': '02',  # PREFEITURA
@@ -118,15 +312,17 @@ MDS_CONFIG = {
     'uf_padrao': 'MG',
     'esfera_padrao': 'M',  # MUNICIPAL (usado no Saldo por Conta)
 
+    # Saldo por Conta: segundos de espera após Pesquisar. Esgotado o prazo, o município conta como
+    # processado sem arquivo (timeout_60s) e o bot passa para a próxima cidade
+    'espera_saldo': 60,
+
     # Timeout para elementos MDS (em segundos)
     'timeout_selenium': 8,
     'max_tentativas_espera': 30,  # 30 tentativas de 1 segundo = 30 segundos total
     'max_retries': 3,  # Tentativas por município em caso de falha
-    'timeout_aguarda_download': 3,  # Segundos após clicar gerar CSV
-    'timeout_renomear_arquivo': 10,  # Segundos aguardando arquivo aparecer
+    'timeout_aguarda_download': 30,  # Segundos aguardando o CSV terminar de baixar após clicar gerar CSV
 
     # Pausas específicas para MDS (em segundos)
-    'pausa_aguarda_download': 3.0,
     'pausa_tentativa_espera': 1.0,
 
     # Diretórios específicos
@@ -210,7 +406,6 @@ PORTAL_SAUDE_CONFIG = {
     # Pausas (em segundos)
     'pausa_entre_scrolls': 0.8,
     'pausa_antes_download': 0.5,
-    'pausa_entre_downloads': 0.5,
 
     # Limites de scroll
     'max_scrolls': 50,
@@ -219,9 +414,12 @@ PORTAL_SAUDE_CONFIG = {
     # Diretorios
     'diretorio_saida': 'arquivos_baixados/portal_saude_mg',
 
-    # Download
+    # Download (BaixadorPDF: simultaneos e espera entre tentativas em DOWNLOAD_PDF_CONFIG)
     'max_tentativas_download': 3,
     'tamanho_minimo_pdf': 1024,  # 1KB minimo para PDF valido
+    'usar_indice_downloads': True,  # Indice SQLite entre execucoes: PDFs inalterados nao sao baixados de novo
+    'parar_em_conhecidos': True,  # Scroll para no primeiro lote so de documentos ja baixados (exige o indice)
+                                  # Periodo com download que falhou antes: a listagem e carregada ate o fim
 }
 
 # Seletores para Portal Saude MG
@@ -288,15 +486,22 @@ PAGAMENTOS_RES_CONFIG = {
     # Parâmetros padrão
     'uf_padrao': 'MG',
 
+    # Motor de consulta: 'http' (envia o formulário e monta o CSV da tabela, sem navegador) ou 'selenium'
+    # No motor http, o município que falhar é refeito pelo Selenium
+    'motor': 'http',
+    'timeout_http_consulta': 60,  # Segundos para a consulta no motor http
+    # Colunas da tabela como o botão CSV do DataTables exporta: a resposta HTTP só vale com este cabeçalho
+    # None: usa o cabeçalho do primeiro CSV baixado pelo navegador na execução (até lá, o navegador consulta)
+    'colunas_orcamentarios': None,
+    'colunas_restos': None,
+
     # Timeout para elementos (em segundos)
     'timeout_selenium': 2,
     'max_tentativas_espera': 5,
     'max_retries': 3,
     'timeout_aguarda_download': 30,  # Timeout para aguardar CSV baixar
-    'timeout_renomear_arquivo': 10,  # Aumentado para Windows executables
 
     # Pausas específicas (em segundos)
-    'pausa_aguarda_download': 3.0,  # Aumentado para Windows executables
     'pausa_tentativa_espera': 0.5,
     'pausa_apos_consulta': 0.5,
 
@@ -316,6 +521,7 @@ SELETORES_PAGAMENTOS_RES_ORCAMENTARIOS = {
     'select_ano': 'ano_pagamento',  # ID do select
     'select_municipio': 'dsc_municipio',  # ID do select
     'botao_consultar': 'input.btn.btn-success[type="submit"][value="Consultar"]',  # CSS Selector
+    'texto_botao_consultar': 'Consultar',  # Texto do botão (motor http)
     'botao_gerar_csv': 'button.dt-button.buttons-csv.buttons-html5',  # CSS Selector
     'mensagem_sem_registros': '//td[@class="dataTables_empty"]',  # XPATH - mensagem de tabela vazia
 }
@@ -326,6 +532,7 @@ SELETORES_PAGAMENTOS_RES_RESTOS = {
     'select_ano': 'ano_pagamento',  # ID do select
     'select_municipio': 'dsc_municipio',  # ID do select
     'botao_consultar': 'input.btn.btn-success[type="submit"][value="Consultar"]',  # CSS Selector
+    'texto_botao_consultar': 'Consultar',  # Texto do botão (motor http)
     'botao_gerar_csv': 'button.dt-button.buttons-csv.buttons-html5',  # CSS Selector
     'mensagem_sem_registros': '//td[@class="dataTables_empty"]',  # XPATH - mensagem de tabela vazia
 }
\ No newline at end of file
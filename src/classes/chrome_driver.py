@@ -3,10 +3,30 @@
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.common.exceptions import WebDriverException
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+from fnmatch import fnmatchcase
+from collections import deque
 import subprocess
+import threading
+import weakref
+import atexit
+import json
 import time
+import base64
+import uuid
 import os
 
+import requests
+
+try:
+    import websocket  # websocket-client: eventos de download do DevTools (sem ele, modo de verificação do diretório)
+except ImportError:
+    websocket = None
+
+from src.classes.central import (NAVEGADORES_CONFIG, BLOQUEIO_RECURSOS_CONFIG, RASTREIO_DOWNLOADS_CONFIG,
+                                 SESSAO_CONFIG)
+
 
 class ChromeDriverSimples:
     # Conecta direto ao ChromeDriver sem webdriver-manager
@@ -15,8 +35,12 @@ class ChromeDriverSimples:
         self.navegador = None
         self.download_dir = download_dir
 
-    def conectar(self, chrome_options=None):
+    def conectar(self, chrome_options=None, perfil_bloqueio=None, site=None, log_rede=False,
+                 acompanhar_downloads=False):
         # Conecta direto ao Chrome sem webdriver-manager
+        # perfil_bloqueio: perfil de BLOQUEIO_RECURSOS_CONFIG (ex: 'scraping'); site: chave das liberações do site
+        # log_rede: registra os eventos de rede (esperas por rede ociosa, captura de respostas XHR)
+        # acompanhar_downloads: liga o RastreadorDownloads no diretório de download (caminho exato de cada arquivo)
         try:
             # Usa opções personalizadas se fornecidas, senão cria padrão
             if chrome_options:
@@ -31,6 +55,12 @@ class ChromeDriverSimples:
             opcoes.add_experimental_option("excludeSwitches", ["enable-automation"])
             opcoes.add_experimental_option('useAutomationExtension', False)
 
+            # Log de rede (performance): requisições bloqueadas, rede ociosa e respostas XHR
+            log_rede = log_rede or bool(perfil_bloqueio and BLOQUEIO_RECURSOS_CONFIG['ativo'])
+            if log_rede:
+                opcoes.set_capability('goog:loggingPrefs', {'performance': 'ALL'})
+                opcoes.add_experimental_option('perfLoggingPrefs', {'enableNetwork': True, 'enablePage': False})
+
             # Configurar diretório de download se especificado
             if self.download_dir:
                 # Garantir que o caminho seja absoluto - Chrome requer isso
@@ -62,6 +92,8 @@ class ChromeDriverSimples:
 
             # Tenta conectar direto ao Chrome (usa ChromeDriver do sistema)
             self.navegador = webdriver.Chrome(options=opcoes)
+            # Navegação parada (renderizador travado) vira TimeoutException em vez de prender o bot
+            self.navegador.set_page_load_timeout(SESSAO_CONFIG['timeout_carregamento_pagina'])
 
             # Habilitar downloads via CDP - necessário para Chrome 87+
             # Chrome moderno requer permissão explícita via DevTools Protocol
@@ -74,6 +106,19 @@ class ChromeDriverSimples:
                     print("  ✓ Downloads habilitados via CDP (Browser.setDownloadBehavior)")
                 except Exception as e:
                     print(f"  ⚠ Aviso: Não foi possível configurar CDP download behavior: {e}")
+                if acompanhar_downloads:
+                    rastrear_downloads(self.navegador, abs_download_dir)
+
+            # Bloqueia imagens, fontes, mídia e analytics que não são necessários para extrair os dados
+            if perfil_bloqueio:
+                aplicar_bloqueio(self.navegador, perfil_bloqueio, site)
+            if log_rede:
+                _com_log_rede.add(self.navegador)
+                try:
+                    # Mantém os corpos das respostas disponíveis para Network.getResponseBody
+                    self.navegador.execute_cdp_cmd("Network.enable", {})
+                except Exception:
+                    pass
 
             # Remove indicadores de automação
             self.navegador.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
@@ -92,6 +137,8 @@ class ChromeDriverSimples:
         # Fecha o navegador
         try:
             if self.navegador:
+                relatorio_bloqueio(self.navegador)
+                parar_rastreio_downloads(self.navegador)
                 self.navegador.quit()
                 self.navegador = None
                 print("✓ Navegador fechado")
@@ -99,6 +146,589 @@ class ChromeDriverSimples:
             print(f"Aviso: Erro ao fechar navegador - {e}")
 
 
+class BloqueioRecursos:
+    # Padrões bloqueados em um navegador e contagem das requisições que deixaram de ser baixadas
+
+    def __init__(self, perfil, site=None):
+        config = BLOQUEIO_RECURSOS_CONFIG
+        permitidos = config['permitir'].get(site, [])
+        self.perfil = perfil
+        self.site = site
+        self.padroes = {}  # categoria -> padrões bloqueados
+        for categoria in config['perfis'][perfil]:
+            if categoria in permitidos:
+                continue
+            padroes = [p for p in config['categorias'][categoria] if p not in permitidos]
+            if padroes:
+                self.padroes[categoria] = padroes
+        self.bloqueadas = {categoria: 0 for categoria in self.padroes}
+        self._candidatas = {}  # requestId -> categoria (URLs que casam com algum padrão)
+
+    def lista_urls(self) -> List[str]:
+        # Todos os padrões no formato de Network.setBlockedURLs
+        return [p for padroes in self.padroes.values() for p in padroes]
+
+    def categoria(self, url: str):
+        # Categoria bloqueada a que a URL pertence (None se não for bloqueada)
+        url = url.lower()
+        for categoria, padroes in self.padroes.items():
+            if any(fnmatchcase(url, p) for p in padroes):
+                return categoria
+        return None
+
+    def contabilizar(self, eventos: List[Dict]):
+        # Conta as requisições que o Chrome bloqueou (loadingFailed com blockedReason)
+        for evento in eventos:
+            metodo = evento.get('method')
+            params = evento.get('params', {})
+            if metodo == 'Network.requestWillBeSent':
+                categoria = self.categoria(params.get('request', {}).get('url', ''))
+                if categoria:
+                    self._candidatas[params.get('requestId')] = categoria
+            elif metodo == 'Network.loadingFailed':
+                categoria = self._candidatas.pop(params.get('requestId'), None)
+                if categoria and params.get('blockedReason'):
+                    self.bloqueadas[categoria] += 1
+            elif metodo == 'Network.loadingFinished':
+                self._candidatas.pop(params.get('requestId'), None)
+
+    def bytes_economizados(self) -> int:
+        # Estimativa de bytes não baixados (requisições bloqueadas x tamanho médio da categoria)
+        tamanhos = BLOQUEIO_RECURSOS_CONFIG['tamanho_medio_kb']
+        return sum(n * tamanhos.get(categoria, 0) * 1024 for categoria, n in self.bloqueadas.items())
+
+
+# Bloqueio ativo, navegadores com log de rede e respostas recebidas (somem junto com o navegador)
+_bloqueios = weakref.WeakKeyDictionary()
+_com_log_rede = weakref.WeakSet()
+_respostas = weakref.WeakKeyDictionary()
+
+
+def aplicar_bloqueio(navegador, perfil='scraping', site=None) -> bool:
+    # Ativa o perfil de bloqueio no navegador via CDP (substitui o bloqueio anterior, se houver)
+    if not BLOQUEIO_RECURSOS_CONFIG['ativo']:
+        return False
+    try:
+        bloqueio = BloqueioRecursos(perfil, site)
+        navegador.execute_cdp_cmd("Network.enable", {})
+        navegador.execute_cdp_cmd("Network.setBlockedURLs", {"urls": bloqueio.lista_urls()})
+        _bloqueios[navegador] = bloqueio
+        print(f"  ✓ Bloqueio de recursos ativo (perfil '{perfil}': {', '.join(bloqueio.padroes) or 'nada'})")
+        return True
+    except Exception as e:
+        print(f"  ⚠ Aviso: Não foi possível ativar o bloqueio de recursos: {e}")
+        return False
+
+
+def eventos_rede(navegador) -> List[Dict]:
+    # Lê (e esvazia) o log de performance do navegador, contabilizando bloqueios e guardando as respostas
+    if navegador is None or navegador not in _com_log_rede:
+        return []
+    try:
+        eventos = [json.loads(entrada['message'])['message'] for entrada in navegador.get_log('performance')]
+    except Exception:
+        return []
+    bloqueio = _bloqueios.get(navegador)
+    if bloqueio:
+        bloqueio.contabilizar(eventos)
+    respostas = _respostas.setdefault(navegador, deque(maxlen=200))
+    respostas.extend(e['params'] for e in eventos if e.get('method') == 'Network.responseReceived')
+    return eventos
+
+
+def esvaziar_log_rede(navegador):
+    # Esvazia o log de rede (evita acumular eventos em sessões longas)
+    eventos_rede(navegador)
+
+
+def limpar_respostas(navegador):
+    # Descarta as respostas registradas até agora (chamar antes da ação cujas respostas serão capturadas)
+    eventos_rede(navegador)
+    _respostas.pop(navegador, None)
+
+
+def respostas_json(navegador, padroes_url: List[str] = None) -> List[Dict]:
+    # Corpos JSON das respostas recebidas desde limpar_respostas (mais recentes primeiro) via Network.getResponseBody
+    eventos_rede(navegador)
+    capturadas = []
+    for params in reversed(_respostas.get(navegador, [])):
+        resposta = params.get('response', {})
+        url = resposta.get('url', '')
+        if 'json' not in resposta.get('mimeType', ''):
+            continue
+        if padroes_url and not any(fnmatchcase(url, padrao) for padrao in padroes_url):
+            continue
+        try:
+            corpo = navegador.execute_cdp_cmd("Network.getResponseBody", {"requestId": params['requestId']})
+            texto = base64.b64decode(corpo['body']).decode('utf-8') if corpo.get('base64Encoded') else corpo['body']
+            capturadas.append({'url': url, 'conteudo': json.loads(texto)})
+        except Exception:
+            # Corpo já descartado pelo Chrome ou resposta que não é JSON válido
+            continue
+    return capturadas
+
+
+def relatorio_bloqueio(navegador) -> Dict:
+    # Exibe e retorna a economia do bloqueio na sessão do navegador (vazio se não houver bloqueio)
+    if navegador is None or navegador not in _bloqueios:
+        return {}
+    eventos_rede(navegador)
+    bloqueio = _bloqueios.pop(navegador)
+    relatorio = {
+        'perfil': bloqueio.perfil,
+        'site': bloqueio.site,
+        'requisicoes_bloqueadas': sum(bloqueio.bloqueadas.values()),
+        'por_categoria': dict(bloqueio.bloqueadas),
+        'bytes_economizados': bloqueio.bytes_economizados()
+    }
+    if relatorio['requisicoes_bloqueadas']:
+        print(f"  Bloqueio de recursos: {relatorio['requisicoes_bloqueadas']} requisições bloqueadas, "
+              f"~{relatorio['bytes_economizados'] / (1024 * 1024):.1f} MB economizados (estimativa)")
+    return relatorio
+
+
+class RastreadorDownloads:
+    # Acompanha os downloads do navegador pelos eventos Browser.downloadWillBegin / downloadProgress do DevTools
+    # Conexão própria com o alvo do navegador (os eventos do domínio Browser não passam pelo ChromeDriver)
+    # Cada download é gravado com o GUID como nome (allowAndName): o caminho é exato, sem corrida entre downloads
+    # Sem websocket-client ou sem conexão: procura o arquivo novo no diretório, como antes
+    # (se a conexão cai depois do allowAndName, volta ao 'allow' para os próximos arquivos terem nome e extensão)
+
+    def __init__(self, navegador, download_dir: str):
+        self.navegador = navegador
+        self.download_dir = os.path.abspath(download_dir)
+        self._conexao = None
+        self._proximo_id = 0
+        self._respostas = {}
+        self._downloads = {}           # guid -> {'sequencia', 'url', 'nome', 'caminho', 'estado', 'bytes'}
+        self._sequencia = 0
+        self._nomeando_por_guid = False  # allowAndName ligado: o Chrome grava com o GUID, sem extensão
+        self._condicao = threading.Condition()
+
+    @property
+    def ativo(self) -> bool:
+        # True enquanto os eventos de download estão chegando pela conexão com o DevTools
+        return self._conexao is not None
+
+    def conectar(self) -> bool:
+        # Abre a conexão com o DevTools do navegador e liga os eventos de download; False = modo diretório
+        if websocket is None or not RASTREIO_DOWNLOADS_CONFIG['ativo']:
+            return False
+        timeout = RASTREIO_DOWNLOADS_CONFIG['timeout_conexao']
+        try:
+            endereco = self.navegador.capabilities['goog:chromeOptions']['debuggerAddress']
+            url_ws = requests.get(f"http://{endereco}/json/version", timeout=timeout).json()['webSocketDebuggerUrl']
+            self._conexao = websocket.create_connection(url_ws, timeout=timeout, suppress_origin=True)
+            self._conexao.settimeout(None)
+            threading.Thread(target=self._ler_eventos, name='RastreadorDownloads', daemon=True).start()
+            if self.definir_diretorio(self.download_dir):
+                return True
+        except Exception as e:
+            print(f"  ⚠ Eventos de download indisponíveis ({e}) - verificando o diretório")
+        self.fechar()
+        return False
+
+    def _comando(self, metodo: str, parametros: Dict) -> Dict:
+        # Envia um comando CDP pela conexão própria e aguarda a resposta
+        with self._condicao:
+            self._proximo_id += 1
+            id_comando = self._proximo_id
+        self._conexao.send(json.dumps({'id': id_comando, 'method': metodo, 'params': parametros}))
+        with self._condicao:
+            if not self._condicao.wait_for(lambda: id_comando in self._respostas or not self.ativo,
+                                           RASTREIO_DOWNLOADS_CONFIG['timeout_conexao']):
+                raise TimeoutError(f"Sem resposta para {metodo}")
+            resposta = self._respostas.pop(id_comando, {'error': {'message': 'conexão encerrada'}})
+        if 'error' in resposta:
+            raise RuntimeError(resposta['error'].get('message'))
+        return resposta.get('result', {})
+
+    def _ler_eventos(self):
+        # Thread: recebe respostas e eventos até a conexão fechar (navegador encerrado)
+        conexao = self._conexao
+        try:
+            while True:
+                mensagem = json.loads(conexao.recv())
+                with self._condicao:
+                    if 'id' in mensagem:
+                        self._respostas[mensagem['id']] = mensagem
+                    else:
+                        self._registrar_evento(mensagem.get('method'), mensagem.get('params', {}))
+                    self._condicao.notify_all()
+        except Exception:
+            pass
+        with self._condicao:
+            if self._conexao is conexao:
+                self._conexao = None
+            self._condicao.notify_all()
+
+    def _registrar_evento(self, metodo: str, params: Dict):
+        # Atualiza o estado do download (chamado com a condição travada)
+        if metodo == 'Browser.downloadWillBegin':
+            self._sequencia += 1
+            self._downloads[params['guid']] = {
+                'sequencia': self._sequencia,
+                'url': params.get('url'),
+                'nome': params.get('suggestedFilename'),
+                'caminho': os.path.join(self.download_dir, params['guid']),
+                'estado': 'inProgress',
+                'bytes': 0,
+            }
+        elif metodo == 'Browser.downloadProgress' and params.get('guid') in self._downloads:
+            download = self._downloads[params['guid']]
+            download['estado'] = params.get('state', download['estado'])
+            download['bytes'] = params.get('receivedBytes', download['bytes'])
+
+    def definir_diretorio(self, download_dir: str) -> bool:
+        # Aponta os downloads para o diretório (usado também ao emprestar um navegador do pool)
+        self.download_dir = os.path.abspath(download_dir)
+        os.makedirs(self.download_dir, exist_ok=True)
+        if not self.ativo:
+            return False
+        try:
+            self._comando("Browser.setDownloadBehavior", {
+                "behavior": "allowAndName",
+                "downloadPath": self.download_dir,
+                "eventsEnabled": True
+            })
+            self._nomeando_por_guid = True
+            return True
+        except Exception as e:
+            print(f"  ⚠ Aviso: Não foi possível ligar os eventos de download - {e}")
+            return False
+
+    def marcar(self) -> Dict:
+        # Chamar antes da ação que dispara o download: aguardar() só considera o que vier depois
+        with self._condicao:
+            sequencia = self._sequencia
+        try:
+            arquivos = set(os.listdir(self.download_dir))
+        except OSError:
+            arquivos = set()
+        return {'sequencia': sequencia, 'arquivos': arquivos}
+
+    def aguardar(self, marca: Dict, timeout: float, extensoes: tuple = None, cancelado=None) -> Optional[Dict]:
+        # Primeiro download iniciado depois da marca, assim que terminar: {'caminho', 'nome', 'url', 'bytes'}
+        # None se não terminou no prazo, foi cancelado (pelo site ou por cancelado()) ou não tem a extensão
+        limite = time.monotonic() + timeout
+        while time.monotonic() < limite:
+            if cancelado and cancelado():
+                return None
+            if not self.ativo:
+                self._restaurar_nomes()
+                return self._aguardar_no_diretorio(marca, limite, extensoes, cancelado)
+            with self._condicao:
+                novos = sorted((d for d in self._downloads.values() if d['sequencia'] > marca['sequencia']),
+                               key=lambda d: d['sequencia'])
+                if extensoes:
+                    novos = [d for d in novos if (d['nome'] or '').lower().endswith(extensoes)]
+                if novos and novos[0]['estado'] == 'completed':
+                    return {k: novos[0][k] for k in ('caminho', 'nome', 'url', 'bytes')}
+                if novos and novos[0]['estado'] == 'canceled':
+                    print(f"  ✗ Download cancelado pelo navegador: {novos[0]['nome']}")
+                    return None
+                # Acorda a cada evento; a volta curta mantém o cancelamento responsivo
+                self._condicao.wait(min(0.5, max(0.0, limite - time.monotonic())))
+        return None
+
+    def _restaurar_nomes(self):
+        # Conexão perdida com o allowAndName ligado: volta ao 'allow' pelo ChromeDriver (nome sugerido pelo site)
+        if not self._nomeando_por_guid:
+            return
+        self._nomeando_por_guid = False
+        try:
+            self.navegador.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": self.download_dir
+            })
+        except Exception as e:
+            print(f"  ⚠ Aviso: Não foi possível restaurar o nome dos downloads - {e}")
+
+    def _aguardar_no_diretorio(self, marca: Dict, limite: float, extensoes: tuple, cancelado) -> Optional[Dict]:
+        # Modo sem eventos: arquivo novo no diretório, sem extensão temporária e com tamanho estável
+        tamanhos = {}
+        while time.monotonic() < limite:
+            if cancelado and cancelado():
+                return None
+            try:
+                novos = sorted(set(os.listdir(self.download_dir)) - marca['arquivos'])
+            except OSError:
+                novos = []
+            for nome in novos:
+                if nome.startswith('.') or nome.endswith(('.crdownload', '.tmp', '.part')):
+                    continue
+                # Arquivo com nome de GUID: começou com o allowAndName, antes da conexão cair
+                if extensoes and not nome.lower().endswith(extensoes) and not _nome_guid(nome):
+                    continue
+                caminho = os.path.join(self.download_dir, nome)
+                try:
+                    tamanho = os.path.getsize(caminho)
+                except OSError:
+                    continue
+                if tamanho > 0 and tamanhos.get(nome) == tamanho:
+                    return {'caminho': caminho, 'nome': nome, 'url': None, 'bytes': tamanho}
+                tamanhos[nome] = tamanho
+            time.sleep(RASTREIO_DOWNLOADS_CONFIG['intervalo_verificacao'])
+        return None
+
+    def fechar(self):
+        # Encerra a conexão com o DevTools (a thread de leitura termina junto)
+        with self._condicao:
+            conexao, self._conexao = self._conexao, None
+            self._condicao.notify_all()
+        if conexao:
+            try:
+                conexao.close()
+            except Exception:
+                pass
+
+
+def _nome_guid(nome: str) -> bool:
+    # Nome dado pelo allowAndName (GUID do download, sem extensão)
+    try:
+        uuid.UUID(nome)
+    except ValueError:
+        return False
+    return len(nome) == 36
+
+
+# Rastreador de downloads de cada navegador (some junto com o navegador)
+_rastreadores = weakref.WeakKeyDictionary()
+
+
+def rastrear_downloads(navegador, download_dir: str) -> RastreadorDownloads:
+    # Liga (ou reaponta) o rastreador de downloads do navegador para o diretório
+    rastreador = _rastreadores.get(navegador)
+    if rastreador is None:
+        rastreador = RastreadorDownloads(navegador, download_dir)
+        _rastreadores[navegador] = rastreador
+        if rastreador.conectar():
+            print("  ✓ Downloads acompanhados por eventos do DevTools")
+    elif not rastreador.definir_diretorio(download_dir):
+        rastreador.fechar()
+    return rastreador
+
+
+def rastreador_downloads(navegador) -> Optional[RastreadorDownloads]:
+    # Rastreador já ligado no navegador (None se os downloads dele não são acompanhados)
+    return _rastreadores.get(navegador) if navegador is not None else None
+
+
+def parar_rastreio_downloads(navegador):
+    # Desliga o rastreador (navegador fechado ou devolvido a um pool que pode emprestá-lo a outro bot)
+    rastreador = _rastreadores.pop(navegador, None) if navegador is not None else None
+    if rastreador:
+        rastreador.fechar()
+
+
+class _NavegadorPool:
+    # Navegador mantido pelo pool e seus dados de uso
+
+    def __init__(self, navegador, headless):
+        self.navegador = navegador
+        self.headless = headless
+        self.usos = 0
+        self.ocioso_desde = time.time()
+
+
+class PoolNavegadores:
+    # Empresta navegadores já abertos aos bots e limpa o estado entre um empréstimo e outro
+
+    def __init__(self):
+        self._ociosos: List[_NavegadorPool] = []
+        self._emprestados: Dict[int, _NavegadorPool] = {}
+        self._lock = threading.Lock()
+        self.metricas = {'abertos': 0, 'reutilizados': 0, 'reciclados': 0, 'descartados': 0}
+
+    def _opcoes(self, headless):
+        # Opções do Chrome do pool (mesmas usadas pelos bots em modo headless)
+        opcoes = webdriver.ChromeOptions()
+        if headless:
+            opcoes.add_argument("--headless=new")
+            opcoes.add_argument("--disable-gpu")
+            opcoes.add_argument("--window-size=1920,1080")
+        return opcoes
+
+    def emprestar(self, download_dir=None, headless=True, site=None, perfil_bloqueio='scraping',
+                  acompanhar_downloads=False):
+        # Entrega um navegador pronto (reaproveitado ou novo) com o diretório de download deste empréstimo
+        # e o bloqueio de recursos do site (perfil_bloqueio=None libera tudo)
+        # acompanhar_downloads: liga o RastreadorDownloads (vale só para este empréstimo)
+        self._fechar_expirados()
+
+        while True:
+            with self._lock:
+                item = next((n for n in self._ociosos if n.headless == headless), None)
+                if item:
+                    self._ociosos.remove(item)
+            if item is None or self._saudavel(item.navegador):
+                break
+            print("  ⚠ Navegador do pool não responde - descartando")
+            self._fechar(item, 'descartados')
+
+        if item:
+            if download_dir and not self._definir_download(item.navegador, download_dir):
+                self._fechar(item, 'descartados')
+                return self.emprestar(download_dir, headless, site, perfil_bloqueio, acompanhar_downloads)
+            if download_dir and acompanhar_downloads:
+                rastrear_downloads(item.navegador, download_dir)
+            if perfil_bloqueio:
+                aplicar_bloqueio(item.navegador, perfil_bloqueio, site)
+            else:
+                self._liberar_bloqueio(item.navegador)
+            self.metricas['reutilizados'] += 1
+            print(f"✓ Navegador reaproveitado do pool (uso {item.usos + 1})")
+        else:
+            navegador = ChromeDriverSimples(download_dir=download_dir).conectar(
+                chrome_options=self._opcoes(headless), perfil_bloqueio=perfil_bloqueio or 'scraping', site=site,
+                log_rede=True, acompanhar_downloads=acompanhar_downloads
+            )
+            if not navegador:
+                return None
+            item = _NavegadorPool(navegador, headless)
+            self.metricas['abertos'] += 1
+            if not perfil_bloqueio:
+                self._liberar_bloqueio(navegador)
+
+        item.usos += 1
+        with self._lock:
+            self._emprestados[id(item.navegador)] = item
+        return item.navegador
+
+    def devolver(self, navegador):
+        # Recebe o navegador de volta: limpa e guarda para o próximo empréstimo, ou fecha se já deu o que tinha
+        with self._lock:
+            item = self._emprestados.pop(id(navegador), None)
+        relatorio_bloqueio(navegador)
+        parar_rastreio_downloads(navegador)
+        if item is None:
+            self._fechar(_NavegadorPool(navegador, None), 'descartados')
+            return
+
+        if item.usos >= NAVEGADORES_CONFIG['reciclar_apos_usos']:
+            print(f"  Navegador reciclado após {item.usos} usos")
+            self._fechar(item, 'reciclados')
+            return
+        if not self._limpar(navegador):
+            self._fechar(item, 'descartados')
+            return
+
+        item.ocioso_desde = time.time()
+        with self._lock:
+            if len(self._ociosos) < NAVEGADORES_CONFIG['max_ociosos']:
+                self._ociosos.append(item)
+                return
+        self._fechar(item, 'reciclados')
+
+    def descartar(self, navegador):
+        # Fecha o navegador sem devolvê-lo ao pool (cancelamento ou erro grave)
+        with self._lock:
+            item = self._emprestados.pop(id(navegador), None) or _NavegadorPool(navegador, None)
+        self._fechar(item, 'descartados')
+
+    def _liberar_bloqueio(self, navegador):
+        # Remove o bloqueio de recursos de um navegador reaproveitado
+        try:
+            navegador.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+        except Exception:
+            pass
+        _bloqueios.pop(navegador, None)
+
+    def _saudavel(self, navegador) -> bool:
+        # Verifica se o ChromeDriver e o Chrome ainda respondem
+        try:
+            return bool(navegador.window_handles) and navegador.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _definir_download(self, navegador, download_dir) -> bool:
+        # Aponta os downloads do navegador para o diretório do empréstimo (CDP)
+        try:
+            abs_download_dir = os.path.abspath(download_dir)
+            os.makedirs(abs_download_dir, exist_ok=True)
+            navegador.execute_cdp_cmd("Browser.setDownloadBehavior", {
+                "behavior": "allow",
+                "downloadPath": abs_download_dir
+            })
+            return True
+        except Exception as e:
+            print(f"  ⚠ Aviso: Não foi possível definir o diretório de download - {e}")
+            return False
+
+    def _limpar(self, navegador) -> bool:
+        # Fecha abas extras, apaga cookies e armazenamento do site e volta para uma página em branco
+        try:
+            abas = navegador.window_handles
+            for aba in abas[1:]:
+                navegador.switch_to.window(aba)
+                navegador.close()
+            navegador.switch_to.window(abas[0])
+
+            url = urlparse(navegador.current_url)
+            navegador.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            if url.scheme in ('http', 'https'):
+                navegador.execute_cdp_cmd("Storage.clearDataForOrigin", {
+                    "origin": f"{url.scheme}://{url.netloc}",
+                    "storageTypes": "all"
+                })
+            navegador.execute_cdp_cmd("Browser.setDownloadBehavior", {"behavior": "default"})
+            navegador.implicitly_wait(0)
+            limpar_respostas(navegador)
+            navegador.get("about:blank")
+            return True
+        except Exception as e:
+            print(f"  ⚠ Navegador não pôde ser limpo para reuso - {e}")
+            return False
+
+    def _fechar(self, item: _NavegadorPool, metrica: str):
+        # Fecha o Chrome de um navegador do pool
+        self.metricas[metrica] += 1
+        _bloqueios.pop(item.navegador, None)
+        parar_rastreio_downloads(item.navegador)
+        try:
+            item.navegador.quit()
+        except Exception:
+            pass
+
+    def _fechar_expirados(self):
+        # Fecha navegadores parados no pool há mais tempo que o permitido
+        limite = time.time() - NAVEGADORES_CONFIG['ocioso_max']
+        with self._lock:
+            expirados = [n for n in self._ociosos if n.ocioso_desde < limite]
+            self._ociosos = [n for n in self._ociosos if n.ocioso_desde >= limite]
+        for item in expirados:
+            self._fechar(item, 'reciclados')
+
+    def encerrar(self):
+        # Fecha todos os navegadores do pool (ociosos e emprestados)
+        with self._lock:
+            itens = self._ociosos + list(self._emprestados.values())
+            self._ociosos = []
+            self._emprestados = {}
+        for item in itens:
+            self._fechar(item, 'reciclados')
+
+    def imprimir_metricas(self):
+        # Exibe quantos Chrome foram abertos e quantos empréstimos reaproveitaram um já aberto
+        m = self.metricas
+        print(f"Pool de navegadores: {m['abertos']} abertos, {m['reutilizados']} reaproveitados, "
+              f"{m['reciclados']} reciclados, {m['descartados']} descartados")
+
+
+_pool_navegadores = None
+_pool_navegadores_lock = threading.Lock()
+
+
+def obter_pool_navegadores() -> PoolNavegadores:
+    # Obtém o pool de navegadores único do processo (fechado automaticamente ao sair)
+    global _pool_navegadores
+    with _pool_navegadores_lock:
+        if _pool_navegadores is None:
+            _pool_navegadores = PoolNavegadores()
+            atexit.register(_pool_navegadores.encerrar)
+        return _pool_navegadores
+
+
 # Função de teste
 def teste_conexao():
     # Testa a conexão com ChromeDriver
@@ -132,27 +132,29 @@ class CitySplitter:
             'distribuicao': distribuicao
         }
 
-    def dividir_cidades(self, num_instancias):
+    def dividir_cidades(self, num_instancias, politica=None, bot="BotBBDAF"):
         # Divide as cidades em lotes e cria arquivos para cada instância
+        # politica=None mantém a divisão em faixas da lista; 'lpt'/'fifo' equilibram pelo histórico de durações
         distribuicao = self.calcular_distribuicao(num_instancias)
 
         if not distribuicao['valido']:
             return distribuicao
 
+        if politica:
+            from src.classes.methods.scheduling import HistoricoDuracoes, particionar_itens
+            lotes = particionar_itens(self.lista_cidades, num_instancias, HistoricoDuracoes(bot), politica)
+        else:
+            lotes = [self.lista_cidades[lote['inicio']:lote['fim']] for lote in distribuicao['distribuicao']]
+
         try:
             # Remove arquivos anteriores se existirem
             self._limpar_arquivos_instancias()
 
             arquivos_criados = []
 
-            for lote in distribuicao['distribuicao']:
-                # Extrai cidades para esta instância
-                inicio = lote['inicio']
-                fim = lote['fim']
-                cidades_instancia = self.lista_cidades[inicio:fim]
-
+            for instancia, cidades_instancia in enumerate(lotes, 1):
                 # Cria arquivo para esta instância - usa caminho de dados
-                nome_arquivo = f"listed_cities_instancia_{lote['instancia']}.txt"
+                nome_arquivo = f"listed_cities_instancia_{instancia}.txt"
                 caminho_arquivo = obter_caminho_dados(nome_arquivo)
 
                 with open(caminho_arquivo, "w", encoding="utf-8") as arquivo:
@@ -161,7 +163,7 @@ class CitySplitter:
 
                 arquivos_criados.append({
                     'arquivo': caminho_arquivo,
-                    'instancia': lote['instancia'],
+                    'instancia': instancia,
                     'cidades': cidades_instancia,
                     'quantidade': len(cidades_instancia)
                 })
@@ -79,7 +79,8 @@ class ConfigManager:
                 },
                 "time": "08:00",
                 "execution_mode": "Individual",
-                "parallel_instances": 2
+                "parallel_instances": 2,
+                "resume": False
             }
         }
 
@@ -7,6 +7,7 @@ import sys
 import platform
 from datetime import datetime
 from src.classes.file.path_manager import obter_caminho_dados
+from src.classes.central import BBDAF_XHR_CONFIG
 
 
 class DataExtractor:
@@ -245,6 +246,78 @@ class DataExtractor:
         except Exception:
             return None
     
+    def extrair_dados_json(self, respostas):
+        # Extrai os registros (data, parcela, valor) das respostas JSON capturadas da aplicação
+        # Usa a resposta com mais registros reconhecidos (as demais são configurações, menus etc.)
+        melhores = []
+        for resposta in respostas:
+            candidatas = []
+            self._listas_de_registros(resposta.get('conteudo'), candidatas)
+            for registros in candidatas:
+                if len(registros) > len(melhores):
+                    melhores = registros
+        return melhores
+
+    def _listas_de_registros(self, no, candidatas):
+        # Percorre o JSON guardando cada lista de objetos em que todos viram registros completos
+        # (uma lista com qualquer objeto sem data, parcela ou valor não é a tabela de lançamentos)
+        if isinstance(no, list):
+            registros = [self._registro_json(item) for item in no if isinstance(item, dict)]
+            if registros and all(registros):
+                candidatas.append(registros)
+            for item in no:
+                self._listas_de_registros(item, candidatas)
+        elif isinstance(no, dict):
+            for valor in no.values():
+                self._listas_de_registros(valor, candidatas)
+
+    def _registro_json(self, item):
+        # Converte um objeto do JSON em registro (None se faltar data, parcela ou valor)
+        campos = {chave.lower(): valor for chave, valor in item.items() if not isinstance(valor, (dict, list))}
+
+        def campo(nome):
+            for chave in BBDAF_XHR_CONFIG['campos'][nome]:
+                if campos.get(chave) not in (None, ''):
+                    return campos[chave]
+            return None
+
+        data = campo('data')
+        parcela = campo('parcela')
+        valor = campo('valor_distribuido')
+        if data is None or parcela is None or valor is None:
+            return None
+        return {
+            'data': self._formatar_data_json(data),
+            'parcela': str(parcela),
+            'valor_distribuido': self._formatar_valor_json(valor, campo('natureza'))
+        }
+
+    def _formatar_data_json(self, data):
+        # Datas ISO (2024-01-10T00:00:00) ou em milissegundos viram o formato da tabela do site
+        if data is None:
+            return ''
+        try:
+            if isinstance(data, (int, float)):
+                convertida = datetime.fromtimestamp(data / 1000)
+            else:
+                convertida = datetime.fromisoformat(str(data)[:10])
+            return convertida.strftime(BBDAF_XHR_CONFIG['formato_data'])
+        except ValueError:
+            return str(data)
+
+    def _formatar_valor_json(self, valor, natureza=None):
+        # Números viram 1.234,56 com o sufixo C (crédito) ou D (débito), como na tabela do site
+        if valor is None:
+            return ''
+        if not isinstance(valor, (int, float)):
+            return str(valor)
+        if natureza:
+            sufixo = 'D' if str(natureza).strip().upper().startswith('D') else 'C'
+        else:
+            sufixo = 'D' if valor < 0 else 'C'
+        texto = f"{abs(valor):,.2f}".replace(',', 'X').replace('.', ',').replace('X', '.')
+        return f"{texto}{sufixo}"
+
     def salvar_dados_excel(self, dados, cidade, data_consulta=None):
         # Salva os dados extraídos em um arquivo Excel organizado
         try:
@@ -380,6 +453,28 @@ class DataExtractor:
             # Fallback: salva sem formatação se houver erro
             df.to_excel(caminho_arquivo, index=False, engine='openpyxl')
     
+    def processar_respostas_xhr(self, respostas, cidade):
+        # Processo direto: respostas JSON capturadas → registros → salva Excel (sem HTML)
+        try:
+            dados = self.extrair_dados_json(respostas)
+            if not dados:
+                return {'sucesso': False, 'erro': 'Nenhum registro nas respostas capturadas'}
+
+            arquivo_salvo = self.salvar_dados_excel(dados, cidade)
+            if not arquivo_salvo:
+                return {'sucesso': False, 'erro': 'Falha ao salvar Excel'}
+
+            return {
+                'sucesso': True,
+                'registros_encontrados': len(dados),
+                'arquivo_salvo': arquivo_salvo,
+                'cidade': cidade,
+                'origem': 'xhr'
+            }
+
+        except Exception as e:
+            return {'sucesso': False, 'erro': f'Erro inesperado: {e}'}
+
     def processar_pagina_resultados(self, navegador, cidade):
         # Processo completo: extrai HTML → analisa → extrai dados → salva Excel
         try:
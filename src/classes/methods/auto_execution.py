@@ -30,6 +30,7 @@ from src.bots.bot_cons_fns import BotConsFNS
 # Importa utilitários
 from src.classes.data_extractor import DataExtractor
 from src.classes.methods.parallel_processor import ProcessadorParalelo
+from src.classes.methods.journal import DiarioExecucao
 
 
 class AutomaticExecutor(BotBase):
@@ -47,6 +48,7 @@ class AutomaticExecutor(BotBase):
         # Thread de monitoramento
         self.monitoring_thread = None
         self.monitoring_active = False
+        self._parar_monitoramento = threading.Event()  # Acorda o laço de monitoramento ao parar
 
         # Controle de estado para evitar loops
         self._config_loading = False
@@ -66,6 +68,7 @@ class AutomaticExecutor(BotBase):
 
         # Bots em execução
         self.current_bots = []
+        self.processador_paralelo = None  # Processador do BB DAF paralelo em andamento
 
     def _load_execution_config(self) -> Dict:
         # Carrega as configurações de execução automática do user_config.json
@@ -85,7 +88,8 @@ class AutomaticExecutor(BotBase):
                 'weekdays': {},
                 'time': '08:00',
                 'execution_mode': 'Individual',
-                'parallel_instances': 2
+                'parallel_instances': 2,
+                'resume': False
             }
 
         self._config_loading = False
@@ -154,6 +158,7 @@ class AutomaticExecutor(BotBase):
             return True
 
         self.monitoring_active = True
+        self._parar_monitoramento.clear()
 
         # Detecta se está rodando como executável PyInstaller
         is_executable = hasattr(sys, '_MEIPASS')
@@ -178,6 +183,7 @@ class AutomaticExecutor(BotBase):
             return
 
         self.monitoring_active = False
+        self._parar_monitoramento.set()
 
         if self.monitoring_thread:
             self.monitoring_thread.join(timeout=5)
@@ -204,12 +210,12 @@ class AutomaticExecutor(BotBase):
                 if self._should_execute_now():
                     self._execute_scheduled_scripts()
 
-                # Aguarda 30 segundos antes de verificar novamente
-                time.sleep(30)
+                # Aguarda 30 segundos antes de verificar novamente (sai na hora ao parar)
+                self._parar_monitoramento.wait(30)
 
             except Exception as e:
                 print(f"✗ Erro no monitoramento: {e}")
-                time.sleep(60)  # Aguarda mais tempo em caso de erro
+                self._parar_monitoramento.wait(60)  # Aguarda mais tempo em caso de erro
 
     def _should_execute_now(self) -> bool:
         # Verifica se é hora de executar os scripts
@@ -336,6 +342,7 @@ class AutomaticExecutor(BotBase):
 
     def _execute_scheduled_scripts(self):
         # Executa os scripts agendados
+        self.resetar_cancelamento()  # Um cancelamento anterior não bloqueia a próxima execução
         self.is_executing = True
         current_time = datetime.now()
         self.last_execution_date = current_time
@@ -406,12 +413,19 @@ class AutomaticExecutor(BotBase):
             if mode == 'Paralela':
                 # Execução paralela
                 num_instancias = self.exec_config.get('parallel_instances', 2)
-                processador = ProcessadorParalelo()
-                resultado = processador.executar_paralelo_threads(
-                    num_instancias=num_instancias,
-                    data_inicial=data_inicial.strftime("%d/%m/%Y"),
-                    data_final=data_final.strftime("%d/%m/%Y")
-                )
+                self.processador_paralelo = ProcessadorParalelo()
+                self.processador_paralelo.diario = DiarioExecucao('BotBBDAF', {
+                    'data_inicial': data_inicial.strftime("%d/%m/%Y"),
+                    'data_final': data_final.strftime("%d/%m/%Y")
+                }, self.exec_config.get('resume', False))
+                try:
+                    resultado = self.processador_paralelo.executar_paralelo_threads(
+                        num_instancias=num_instancias,
+                        data_inicial=data_inicial.strftime("%d/%m/%Y"),
+                        data_final=data_final.strftime("%d/%m/%Y")
+                    )
+                finally:
+                    self.processador_paralelo = None
             else:
                 # Execução individual
                 bot = BotBBDAF()
@@ -421,7 +435,8 @@ class AutomaticExecutor(BotBase):
                 resultado = bot.executar_completo(
                     cidades=cidades,
                     data_inicial=data_inicial.strftime("%d/%m/%Y"),
-                    data_final=data_final.strftime("%d/%m/%Y")
+                    data_final=data_final.strftime("%d/%m/%Y"),
+                    retomar=self.exec_config.get('resume', False)
                 )
 
                 bot.fechar_navegador()
@@ -461,7 +476,7 @@ class AutomaticExecutor(BotBase):
                 bot = BotFNDE()
                 self.current_bots.append(bot)
 
-                resultado = bot.executar_paralelo(str(ano), num_instancias)
+                resultado = bot.executar_paralelo(str(ano), num_instancias, retomar=self.exec_config.get('resume', False))
 
                 self.current_bots.remove(bot)
 
@@ -480,32 +495,10 @@ class AutomaticExecutor(BotBase):
                     self.current_bots.remove(bot)
                     return
 
-                # Processa cada município
-                sucessos = 0
-                falhas = 0
-
-                for municipio in municipios:
-                    if self.esta_cancelado():
-                        print("  ⚠ Execução cancelada pelo usuário")
-                        break
-
-                    try:
-                        resultado = bot.processar_municipio(
-                            ano=str(ano),
-                            municipio=municipio.upper()
-                        )
-
-                        if resultado['sucesso']:
-                            sucessos += 1
-                        else:
-                            falhas += 1
-                            print(f"  ✗ Falha em {municipio}: {resultado.get('mensagem', 'Erro desconhecido')}")
-
-                    except Exception as e:
-                        falhas += 1
-                        print(f"  ✗ Erro ao processar {municipio}: {e}")
+                # Processa todos os municípios (retomar: pula os concluídos numa execução interrompida do mesmo ano)
+                estatisticas = bot.processar_todos_municipios(str(ano), retomar=self.exec_config.get('resume', False))
 
-                print(f"  ✓ FNDE executado: {sucessos} sucessos, {falhas} falhas")
+                print(f"  ✓ FNDE executado: {estatisticas['sucessos']} sucessos, {estatisticas['erros']} falhas")
 
                 bot.fechar_navegador()
                 self.current_bots.remove(bot)
@@ -567,8 +560,9 @@ class AutomaticExecutor(BotBase):
                     bot.fechar_navegador()
                     self.current_bots.remove(bot)
 
-                    # Pausa entre cidades
-                    time.sleep(2)
+                    # Pausa entre cidades (interrompida pelo cancelamento)
+                    if not self._aguardar(2):
+                        break
 
                 except Exception as e:
                     print(f"  ✗ Erro ao processar {cidade_nome}: {e}")
@@ -599,7 +593,7 @@ class AutomaticExecutor(BotBase):
                 bot = BotConsFNS()
                 self.current_bots.append(bot)
 
-                resultado = bot.executar_paralelo(num_instancias)
+                resultado = bot.executar_paralelo(num_instancias, retomar=self.exec_config.get('resume', False))
 
                 self.current_bots.remove(bot)
 
@@ -615,29 +609,10 @@ class AutomaticExecutor(BotBase):
 
                 # Nota: Não configura navegador aqui - cada município abre/fecha seu próprio Chrome
 
-                # Processa cada município
-                sucessos = 0
-                falhas = 0
-
-                for municipio in municipios:
-                    if self.esta_cancelado():
-                        print("  ⚠ Execução cancelada pelo usuário")
-                        break
-
-                    try:
-                        resultado = bot.processar_municipio(municipio)
+                # Processa todos os municípios (retomar: pula os concluídos numa execução interrompida do mesmo dia)
+                estatisticas = bot.processar_todos_municipios(retomar=self.exec_config.get('resume', False))
 
-                        if resultado['sucesso']:
-                            sucessos += 1
-                        else:
-                            falhas += 1
-                            print(f"  ✗ Falha em {municipio}: {resultado.get('erro', 'Erro desconhecido')}")
-
-                    except Exception as e:
-                        falhas += 1
-                        print(f"  ✗ Erro ao processar {municipio}: {e}")
-
-                print(f"  ✓ Consulta FNS executado: {sucessos} sucessos, {falhas} falhas")
+                print(f"  ✓ Consulta FNS executado: {estatisticas['sucessos']} sucessos, {estatisticas['erros']} falhas")
 
                 bot.fechar_navegador()
                 self.current_bots.remove(bot)
@@ -663,6 +638,11 @@ class AutomaticExecutor(BotBase):
                 pass
 
         self.current_bots.clear()
+
+        # Processador paralelo: acorda as esperas de todas as instâncias
+        if self.processador_paralelo:
+            self.processador_paralelo.cancelar()
+
         self.is_executing = False
 
         print("✓ Execução automática cancelada")
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+# AutoEscalador - Decide quantas instâncias paralelas manter conforme os recursos da máquina
+
+import os
+import sys
+import time
+from collections import deque
+from typing import Dict
+
+import psutil
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import PARALELO_CONFIG
+
+
+class AutoEscalador:
+    # Observa CPU, RAM, memória dos Chrome e falhas recentes para adicionar ou aposentar instâncias
+
+    def __init__(self, minimo: int = None, maximo: int = None):
+        # Inicializa com a faixa de instâncias (padrão: central.py)
+        self.minimo = max(1, minimo or PARALELO_CONFIG['autoescala_min'])
+        self.maximo = max(self.minimo, maximo or PARALELO_CONFIG['autoescala_max'])
+        self.intervalo = PARALELO_CONFIG['intervalo_avaliacao']
+        self._resultados_recentes = deque(maxlen=PARALELO_CONFIG['janela_resultados'])
+        self._recuo_ate = 0.0
+
+        # Primeira leitura de CPU sempre retorna 0 - inicializa o contador
+        psutil.cpu_percent(interval=None)
+
+    def registrar_resultado(self, resultado: Dict):
+        # Registra se o item terminou com sucesso (usado para detectar o site alvo falhando)
+        self._resultados_recentes.append(bool(resultado.get('sucesso')))
+
+    def medir_recursos(self) -> Dict:
+        # Mede uso de CPU, RAM e a memória (RSS) dos processos filhos (ChromeDriver/Chrome)
+        rss_filhos = 0
+        try:
+            for filho in psutil.Process().children(recursive=True):
+                try:
+                    rss_filhos += filho.memory_info().rss
+                except (psutil.NoSuchProcess, psutil.AccessDenied):
+                    continue
+        except psutil.Error:
+            pass
+
+        return {
+            'cpu': psutil.cpu_percent(interval=None),
+            'ram': psutil.virtual_memory().percent,
+            'rss_chrome_mb': rss_filhos / (1024 * 1024)
+        }
+
+    def _taxa_falhas(self) -> float:
+        # Fração de falhas entre os últimos resultados (0 enquanto a janela não encher)
+        if len(self._resultados_recentes) < self._resultados_recentes.maxlen:
+            return 0.0
+        return self._resultados_recentes.count(False) / len(self._resultados_recentes)
+
+    def decidir(self, ativas: int, pendentes: int) -> int:
+        # Retorna +1 (adicionar), -1 (aposentar) ou 0 (manter) instâncias
+        if pendentes == 0:
+            return 0
+        if ativas < self.minimo:
+            return 1
+
+        recursos = self.medir_recursos()
+        agora = time.time()
+
+        # Site alvo falhando: recua uma instância e segura o crescimento por um tempo
+        if self._taxa_falhas() >= PARALELO_CONFIG['taxa_falha_recuo']:
+            self._resultados_recentes.clear()
+            self._recuo_ate = agora + PARALELO_CONFIG['pausa_apos_recuo']
+            if ativas > self.minimo:
+                print(f"Autoescala: muitas falhas recentes, recuando para {ativas - 1} instâncias")
+                return -1
+            return 0
+
+        # Máquina no limite: aposenta uma instância
+        if (recursos['cpu'] > PARALELO_CONFIG['limite_cpu_percent'] or
+                recursos['ram'] > PARALELO_CONFIG['limite_ram_percent'] or
+                recursos['rss_chrome_mb'] > PARALELO_CONFIG['limite_rss_chrome_mb']):
+            if ativas > self.minimo:
+                print(f"Autoescala: recursos no limite (CPU {recursos['cpu']:.0f}%, "
+                      f"RAM {recursos['ram']:.0f}%, Chrome {recursos['rss_chrome_mb']:.0f} MB) "
+                      f"- reduzindo para {ativas - 1}")
+                return -1
+            return 0
+
+        # Folga de recursos e itens sobrando: adiciona uma instância
+        if (agora >= self._recuo_ate and ativas < self.maximo and pendentes > ativas and
+                recursos['cpu'] < PARALELO_CONFIG['limite_cpu_percent'] * 0.75 and
+                recursos['ram'] < PARALELO_CONFIG['limite_ram_percent'] * 0.9):
+            print(f"Autoescala: folga de recursos (CPU {recursos['cpu']:.0f}%, "
+                  f"RAM {recursos['ram']:.0f}%) - aumentando para {ativas + 1}")
+            return 1
+
+        return 0
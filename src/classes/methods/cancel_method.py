@@ -1,7 +1,80 @@
 #!/usr/bin/env python3
 # Base class for all bot implementations
 
+import os
+import time
+import threading
 from abc import ABC
+from typing import Callable, Dict, List, Optional
+
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
+
+from src.classes.report_generator import ReportGenerator
+from src.classes.chrome_driver import (obter_pool_navegadores, esvaziar_log_rede, relatorio_bloqueio,
+                                      rastreador_downloads, parar_rastreio_downloads)
+from src.classes.methods.journal import DiarioExecucao
+from src.classes.methods.governor import obter_governador
+from src.classes.methods.waits import Condicao, Alguma, RedeOciosa, tempo_limite, obter_medidor_esperas
+from src.classes.methods.form_fill import (montar_campos, aplicar_campos, descrever_pendencia, dividir_em_grupos,
+                                           SelectRecarregado)
+from src.classes.methods.memory_watchdog import VigiaMemoria
+from src.classes.methods.session_supervisor import falha_de_navegador, navegador_respondendo, encerrar_processos
+from src.classes.central import ESPERAS_CONFIG, MEMORIA_CONFIG, SESSAO_CONFIG
+
+
+# Erro registrado quando o bot não consegue voltar ao estado inicial entre dois itens
+ERRO_PREPARAR_PROXIMO = "Falha ao preparar navegador para o próximo item"
+ERRO_SESSAO_PERDIDA = "Navegador não reabriu - item não processado"
+
+
+class ExecucaoCancelada(Exception):
+    # Levantada dentro de uma espera quando a execução é cancelada
+    pass
+
+
+class TokenCancelamento:
+    # Sinal de cancelamento compartilhado (threading.Event): acorda na hora qualquer espera ou pausa
+
+    def __init__(self):
+        self._evento = threading.Event()
+
+    def cancelar(self):
+        # Sinaliza o cancelamento para todos que compartilham o token
+        self._evento.set()
+
+    def resetar(self):
+        # Limpa o sinal para uma nova execução
+        self._evento.clear()
+
+    def cancelado(self) -> bool:
+        # Indica se o cancelamento foi sinalizado
+        return self._evento.is_set()
+
+    def aguardar(self, segundos: float) -> bool:
+        # Pausa por até N segundos; retorna True se foi interrompida por cancelamento
+        return self._evento.wait(segundos)
+
+
+class EsperaCancelavel(WebDriverWait):
+    # WebDriverWait que verifica o token a cada tentativa e sai com ExecucaoCancelada
+
+    def __init__(self, driver, timeout: float, token: TokenCancelamento, **kwargs):
+        super().__init__(driver, timeout, **kwargs)
+        self.token = token
+
+    def _verificar(self, metodo):
+        def metodo_cancelavel(driver):
+            if self.token.cancelado():
+                raise ExecucaoCancelada("Cancelado pelo usuário")
+            return metodo(driver)
+        return metodo_cancelavel
+
+    def until(self, method, message: str = ""):
+        return super().until(self._verificar(method), message)
+
+    def until_not(self, method, message: str = ""):
+        return super().until_not(self._verificar(method), message)
 
 
 class BotBase(ABC):
@@ -11,7 +84,95 @@ class BotBase(ABC):
         # Inicializa atributos comuns
         self.navegador = None
         self.wait = None
-        self._cancelado = False
+        self.token = TokenCancelamento()  # Substituído pelo token do ProcessadorParalelo em execução paralela
+        self.id_instancia = None  # Definido pelo ProcessadorParalelo em execução paralela
+        self.diario = None        # DiarioExecucao da execução atual (progresso durável)
+        self._navegador_emprestado = False  # Navegador veio do PoolNavegadores (devolver em vez de fechar)
+        self.vigia_memoria = None  # VigiaMemoria criada no primeiro item processado
+        self._reinicios_sessao = 0  # Reaberturas do navegador após queda/travamento na execução atual
+
+    @property
+    def _cancelado(self) -> bool:
+        # Estado de cancelamento (lido do token compartilhado)
+        return self.token.cancelado()
+
+    @_cancelado.setter
+    def _cancelado(self, valor: bool):
+        if valor:
+            self.token.cancelar()
+        else:
+            self.token.resetar()
+
+    def _aguardar(self, segundos: float) -> bool:
+        # Pausa interrompível: retorna False se a execução foi cancelada durante a espera
+        return not self.token.aguardar(segundos)
+
+    def _espera(self, navegador, timeout: float) -> EsperaCancelavel:
+        # WebDriverWait que sai em menos de um segundo quando a execução é cancelada
+        return EsperaCancelavel(navegador, timeout, self.token)
+
+    def _aguardar_pronto(self, etapa: str, condicao: Condicao, pausa_antiga: float, navegador=None) -> bool:
+        # Espera a condição de prontidão da etapa no lugar da pausa fixa; retorna False se cancelado
+        # Condição que não pode ser avaliada na página volta para a pausa antiga
+        navegador = navegador or self.navegador
+        if not ESPERAS_CONFIG['ativo'] or navegador is None:
+            return self._aguardar(pausa_antiga)
+
+        inicio = time.monotonic()
+        resolvida = True
+        try:
+            condicao.iniciar(navegador)
+            EsperaCancelavel(navegador, tempo_limite(etapa, pausa_antiga), self.token,
+                             poll_frequency=ESPERAS_CONFIG['intervalo']).until(condicao)
+        except ExecucaoCancelada:
+            return False
+        except TimeoutException:
+            resolvida = False
+        except WebDriverException:
+            resolvida = False
+            if not self._aguardar(pausa_antiga):
+                return False
+        obter_medidor_esperas().registrar(etapa, pausa_antiga, time.monotonic() - inicio, resolvida)
+        return True
+
+    def _preencher_formulario(self, campos: List, dependentes: Dict[str, str] = None, etapa: str = 'preencher_formulario',
+                              pausa_antiga: float = 1, navegador=None) -> Dict:
+        # Preenche o formulário em poucos execute_script: campos = [(seletor, valor)] (ver form_fill.py)
+        # dependentes: {seletor: seletor do select que ele recarrega} - só espera a recarga se o valor mudou
+        # Retorna {'sucesso', 'campos': [{'seletor', 'alterado', 'valor', 'texto'}], 'erro'}
+        navegador = navegador or self.navegador
+        resultado = {'sucesso': False, 'campos': [], 'erro': None}
+        montados = montar_campos(campos)
+
+        for grupo, dependente in dividir_em_grupos(montados, dependentes):
+            # Campos ainda ausentes, desabilitados ou sem a opção (select dependente carregando): tenta de novo
+            pendencia = {}
+
+            def aplicar(driver):
+                aplicado = aplicar_campos(driver, grupo, dependente)
+                pendencia.update(aplicado)
+                return aplicado if aplicado.get('pronto') else False
+
+            try:
+                aplicado = EsperaCancelavel(navegador, tempo_limite(etapa), self.token,
+                                            poll_frequency=ESPERAS_CONFIG['intervalo']).until(aplicar)
+            except ExecucaoCancelada:
+                resultado['erro'] = 'Cancelado'
+                return resultado
+            except TimeoutException:
+                resultado['erro'] = descrever_pendencia(pendencia, grupo) if pendencia else 'Formulário não carregou'
+                return resultado
+            resultado['campos'].extend(aplicado['campos'])
+
+            # Recarga das opções ou, se o campo não recarregou o dependente, rede ociosa depois da alteração
+            if dependente and aplicado['campos'][-1]['alterado']:
+                condicao = Alguma(SelectRecarregado(dependente), RedeOciosa())
+                if not self._aguardar_pronto(etapa, condicao, pausa_antiga, navegador):
+                    resultado['erro'] = 'Cancelado'
+                    return resultado
+
+        resultado['sucesso'] = True
+        return resultado
 
     def cancelar(self, forcado=False):
         # Cancela a execução e fecha o navegador
@@ -31,6 +192,10 @@ class BotBase(ABC):
         # Cancelamento forçado - fecha todas as abas e força quit
         print(f"Cancelamento forçado {self.__class__.__name__}: fechando todas as abas...")
 
+        if self._liberar_navegador(descartar=True):
+            print("Navegador do pool descartado")
+            return
+
         if self.navegador:
             try:
                 # Tenta fechar todas as janelas abertas
@@ -54,10 +219,35 @@ class BotBase(ABC):
             self.wait = None
             print("Todas as abas do Chrome foram fechadas")
 
+    def _emprestar_navegador(self, download_dir=None, headless=True, site=None, acompanhar_downloads=False) -> bool:
+        # Pega um navegador pronto do pool compartilhado em vez de abrir um Chrome novo
+        self.navegador = obter_pool_navegadores().emprestar(download_dir, headless, site,
+                                                            acompanhar_downloads=acompanhar_downloads)
+        self._navegador_emprestado = self.navegador is not None
+        return self._navegador_emprestado
+
+    def _liberar_navegador(self, descartar: bool = False) -> bool:
+        # Devolve o navegador emprestado ao pool (ou descarta); False se o navegador não veio do pool
+        if not (self.navegador and self._navegador_emprestado):
+            return False
+        pool = obter_pool_navegadores()
+        if descartar:
+            pool.descartar(self.navegador)
+        else:
+            pool.devolver(self.navegador)
+        self.navegador = None
+        self.wait = None
+        self._navegador_emprestado = False
+        return True
+
     def fechar_navegador(self):
-        # Fecha o navegador se estiver aberto
+        # Fecha o navegador se estiver aberto (emprestado do pool: devolve, ou descarta se cancelado)
         try:
-            if self.navegador:
+            if self._liberar_navegador(descartar=self._cancelado):
+                print("✓ Navegador liberado para o pool")
+            elif self.navegador:
+                relatorio_bloqueio(self.navegador)
+                parar_rastreio_downloads(self.navegador)
                 self.navegador.quit()
                 self.navegador = None
                 self.wait = None
@@ -65,10 +255,201 @@ class BotBase(ABC):
         except Exception as e:
             print(f"Aviso: Erro ao fechar navegador - {e}")
 
+    def _navegar(self, url: str, navegador=None):
+        # Abre a URL passando pelo governador do site (ritmo e acessos simultâneos por host)
+        navegador = navegador or self.navegador
+        esvaziar_log_rede(navegador)
+        with obter_governador().requisicao(url):
+            navegador.get(url)
+
+    def _acesso_site(self, url: str):
+        # Vaga do governador para ações que geram carga no site além da navegação (ex: enviar consulta)
+        return obter_governador().requisicao(url)
+
     def esta_cancelado(self):
         # Verifica se a execução foi cancelada
         return self._cancelado
 
     def resetar_cancelamento(self):
         # Reseta o flag de cancelamento
-        self._cancelado = False
\ No newline at end of file
+        self._cancelado = False
+
+    # Diário de execução (retomada de execuções longas)
+
+    def configurar_diario(self, parametros: Dict, retomar: bool = False) -> DiarioExecucao:
+        # Abre o diário deste bot para os parâmetros da execução
+        self.diario = DiarioExecucao(self.__class__.__name__, parametros, retomar, self.descrever_item)
+        return self.diario
+
+    def _itens_pendentes(self, itens: List) -> List:
+        # Na retomada, remove os itens já concluídos com sucesso
+        if self.diario and self.diario.retomar:
+            return self.diario.filtrar_pendentes(itens)
+        return itens
+
+    def _registrar_diario(self, resultado: Dict):
+        # Registra o resultado de um item no diário (se houver)
+        if self.diario:
+            self.diario.registrar(DiarioExecucao.chave_resultado(resultado), resultado)
+
+    # Ciclo de vida usado pelo motor paralelo genérico (ProcessadorParalelo.executar_paralelo_generico)
+
+    def iniciar_sessao(self) -> bool:
+        # Prepara o bot para consumir itens da fila (padrão: abre o navegador)
+        return self.configurar_navegador()
+
+    def processar_item(self, item: Dict) -> Dict:
+        # Processa um item de trabalho (padrão: processar_municipio com os campos do item)
+        return self.processar_municipio(**item)
+
+    def preparar_proximo_item(self) -> bool:
+        # Restaura o estado inicial entre dois itens (padrão: nada a fazer)
+        return True
+
+    def encerrar_sessao(self):
+        # Libera os recursos da sessão ao final da fila
+        self.fechar_navegador()
+
+    def descrever_item(self, item: Dict) -> str:
+        # Nome legível do item para logs e relatórios
+        return item.get('municipio') or " ".join(str(valor) for valor in item.values())
+
+    def processar_fila(self, obter_proximo_item, callback_resultado=None) -> Dict:
+        # Processa itens retirados sob demanda de uma fila compartilhada até ela acabar
+        estatisticas = ReportGenerator.criar_estatisticas(0)
+        primeiro = True
+        reciclar = None
+        self._reinicios_sessao = 0
+
+        item = obter_proximo_item()
+        while item is not None and not self._cancelado:
+            estatisticas['total'] += 1
+            descricao = self.descrever_item(item)
+            falha_sessao = False
+
+            # Volta ao estado inicial antes de cada item (exceto no primeiro); navegador pesado ou caído é trocado
+            if not primeiro and not self._restaurar_estado_inicial(reciclar):
+                resultado = {'sucesso': False, 'erro': ERRO_PREPARAR_PROXIMO}
+                falha_sessao = True
+            else:
+                print(f"{estatisticas['total']}: {descricao}")
+                inicio = time.time()
+                resultado = self._processar_supervisionado(lambda: self.processar_item(item), descricao)
+                resultado.setdefault('duracao', time.time() - inicio)
+            primeiro = False
+
+            resultado.setdefault('municipio', descricao)
+            resultado.setdefault('erro', None)
+            resultado['item'] = descricao  # Chave do item no diário de execução
+            ReportGenerator.atualizar_estatisticas(estatisticas, resultado)
+            self._registrar_diario(resultado)
+            if callback_resultado:
+                callback_resultado(resultado)
+            reciclar = self._vigiar_memoria(descricao)
+
+            # Navegador não reabre nem dentro do limite de reinícios - deixa os demais itens para as outras instâncias
+            if falha_sessao:
+                print("Erro crítico: Impossível continuar nesta instância")
+                break
+
+            item = obter_proximo_item()
+
+        ReportGenerator.calcular_taxa_sucesso(estatisticas)
+        ReportGenerator.imprimir_estatisticas(estatisticas, "INSTÂNCIA CONCLUÍDA")
+        obter_medidor_esperas().imprimir_resumo()
+        self._imprimir_resumo_memoria()
+        return {'sucesso': True, 'estatisticas': estatisticas}
+
+    # Vigia de memória do navegador (lotes longos)
+
+    def _vigiar_memoria(self, item: str = '') -> Optional[str]:
+        # Mede o navegador depois de um item; retorna o motivo para trocá-lo antes do próximo ou None
+        if not MEMORIA_CONFIG['ativo'] or self.navegador is None:
+            return None
+        if self.vigia_memoria is None:
+            self.vigia_memoria = VigiaMemoria(self.__class__.__name__, self.id_instancia)
+        return self.vigia_memoria.amostrar(self.navegador, item)
+
+    def _reiniciar_sessao(self, motivo: str) -> bool:
+        # Troca o navegador entre dois itens (fecha, abre outro já na página inicial) sem interromper o lote
+        print(f"  ♻ Reiniciando navegador ({motivo})")
+        if self._navegador_emprestado:
+            self._liberar_navegador(descartar=True)  # Não devolve ao pool um Chrome que cresceu demais
+        self.encerrar_sessao()
+        sucesso = not self._cancelado and self.iniciar_sessao()
+        if self.vigia_memoria:
+            self.vigia_memoria.registrar_reinicio(motivo, sucesso)
+        return sucesso
+
+    # Supervisão da sessão (navegador morto ou travado no meio do lote)
+
+    def _relancar_sessao(self, motivo: str) -> bool:
+        # Reabre o navegador caído ou travado dentro do limite de reinícios da execução
+        while not self._cancelado and self._reinicios_sessao < SESSAO_CONFIG['reinicios_max']:
+            self._reinicios_sessao += 1
+            print(f"  ⚠ Navegador {motivo} - reabrindo "
+                  f"({self._reinicios_sessao}/{SESSAO_CONFIG['reinicios_max']})")
+            if self.navegador is not None:
+                encerrar_processos(self.navegador)  # Travado, o Chrome não atende ao quit
+            if self._reiniciar_sessao(f"navegador {motivo}"):
+                return True
+            if not self._aguardar(SESSAO_CONFIG['pausa_reinicio']):
+                break
+        print("  ✗ Limite de reinícios do navegador atingido")
+        return False
+
+    def _restaurar_estado_inicial(self, reciclar: str = None) -> bool:
+        # Deixa o bot pronto para o próximo item: troca o navegador pesado ou volta à página inicial;
+        # se o navegador caiu ou travou, reabre a sessão em vez de abandonar o restante do lote
+        if reciclar:
+            return self._reiniciar_sessao(reciclar) or self._relancar_sessao("não reabriu")
+        try:
+            if self.preparar_proximo_item():
+                return True
+            motivo = "sem resposta"
+        except Exception as e:
+            motivo = f"com erro ({e.__class__.__name__})"
+        if self.navegador is not None and navegador_respondendo(self.navegador):
+            motivo = "não voltou à página inicial"
+        return self._relancar_sessao(motivo)
+
+    def _processar_supervisionado(self, processar: Callable[[], Dict], descricao: str = '') -> Dict:
+        # Executa um item; se o navegador caiu ou travou durante ele, reabre a sessão e repete o item
+        repeticoes = 0
+        while True:
+            try:
+                resultado = processar()
+                caiu = (not resultado.get('sucesso') and self.navegador is not None
+                        and not self._cancelado and not navegador_respondendo(self.navegador))
+            except Exception as e:
+                resultado = {'sucesso': False, 'erro': f"Erro inesperado: {str(e)}"}
+                caiu = falha_de_navegador(e) or (self.navegador is not None
+                                                 and not navegador_respondendo(self.navegador))
+            if not caiu or self._cancelado or repeticoes >= SESSAO_CONFIG['repeticoes_por_item']:
+                return resultado
+            repeticoes += 1
+            if not self._relancar_sessao("caiu ou travou"):
+                return resultado
+            print(f"  ↻ Repetindo {descricao} ({repeticoes}/{SESSAO_CONFIG['repeticoes_por_item']})")
+
+    def _imprimir_resumo_memoria(self):
+        # Pico de memória e reinícios da execução (se a vigia chegou a medir algo)
+        if self.vigia_memoria:
+            print(self.vigia_memoria.resumo())
+
+    def _marcar_download(self, navegador=None) -> Dict:
+        # Chamar antes do clique que baixa o arquivo (navegador aberto com acompanhar_downloads=True)
+        rastreador = rastreador_downloads(navegador or self.navegador)
+        return {**rastreador.marcar(), 'rastreador': rastreador}
+
+    def _aguardar_download(self, marca: Dict, timeout: float, extensoes: tuple = None) -> Optional[Dict]:
+        # Download disparado depois da marca, assim que terminar: {'caminho', 'nome', 'url', 'bytes'} ou None
+        return marca['rastreador'].aguardar(marca, timeout, extensoes, cancelado=self.token.cancelado)
+
+    def _diretorio_download(self, diretorio_final: str) -> str:
+        # Em execução paralela cada instância baixa numa subpasta própria para não trocar arquivos
+        if not self.id_instancia:
+            return diretorio_final
+        diretorio = os.path.join(diretorio_final, f".instancia_{self.id_instancia}")
+        os.makedirs(diretorio, exist_ok=True)
+        return diretorio
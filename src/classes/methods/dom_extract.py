@@ -0,0 +1,41 @@
+#!/usr/bin/env python3
+# Extração em lote do DOM - um único execute_script devolve os atributos de todos os elementos de um seletor
+
+from typing import Dict, List
+
+# Texto como o Selenium compara (normalize-space): espaços em sequência viram um e as pontas são removidas
+# Atributo: propriedade do elemento (href absoluto, value atual) ou, se não houver, o atributo HTML
+_JS_EXTRAIR = """
+var seletor = arguments[0], nomes = arguments[1], incluirElemento = arguments[2], raiz = arguments[3] || document;
+var resultado = [];
+raiz.querySelectorAll(seletor).forEach(function (elemento, indice) {
+    var item = {indice: indice};
+    nomes.forEach(function (nome) {
+        if (nome === 'texto') {
+            item.texto = (elemento.textContent || '').replace(/\\s+/g, ' ').trim();
+            return;
+        }
+        var valor = elemento[nome];
+        if (valor === undefined || valor === null || typeof valor === 'object' || typeof valor === 'function') {
+            valor = elemento.getAttribute(nome);
+        }
+        item[nome] = valor;
+    });
+    if (incluirElemento) { item.elemento = elemento; }
+    resultado.push(item);
+});
+return resultado;
+"""
+
+
+def extrair_elementos(navegador, seletor: str, atributos: List[str], incluir_elemento: bool = False,
+                      raiz=None) -> List[Dict]:
+    # Lista de {'indice', <atributo>: valor, ...} na ordem do documento ('texto' = texto normalizado)
+    # incluir_elemento: acrescenta 'elemento' (WebElement) para clicar no item escolhido sem nova busca
+    # raiz: WebElement onde procurar (padrão: a página inteira)
+    return navegador.execute_script(_JS_EXTRAIR, seletor, list(atributos), incluir_elemento, raiz) or []
+
+
+def textos_opcoes(navegador, seletor_select: str) -> List[str]:
+    # Textos de todas as opções de um <select> (seletor CSS do select)
+    return [opcao['texto'] for opcao in extrair_elementos(navegador, f"{seletor_select} option", ['texto'])]
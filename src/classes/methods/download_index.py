@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+# IndiceDownloads - Índice persistente (SQLite) dos documentos já baixados, para requisições condicionais entre execuções
+
+import os
+import sys
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Set
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.file.path_manager import obter_diretorio_config
+
+
+class IndiceDownloads:
+    # Uma linha por URL: validadores HTTP (ETag, Last-Modified), tamanho e SHA-256 da última versão baixada
+    # Vale mesmo depois de o PDF local ser apagado (limpeza após gerar o Excel)
+    # Downloads que falharam ficam em 'falhas' até darem certo (a próxima execução os procura de novo)
+
+    def __init__(self, caminho: str = None):
+        # caminho: arquivo SQLite (padrão: indice_downloads.sqlite3 no diretório de configuração)
+        self.caminho = caminho or os.path.join(obter_diretorio_config(), 'indice_downloads.sqlite3')
+        self._lock = threading.Lock()
+
+        # Uma conexão compartilhada pelas threads do BaixadorPDF (acesso serializado pelo lock)
+        self._conexao = sqlite3.connect(self.caminho, timeout=30, check_same_thread=False)
+        self._conexao.execute("PRAGMA journal_mode=WAL")  # Várias instâncias podem ler enquanto outra grava
+        self._conexao.execute(
+            """CREATE TABLE IF NOT EXISTS documentos (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                tamanho INTEGER,
+                sha256 TEXT,
+                caminho TEXT,
+                atualizado_em TEXT
+            )"""
+        )
+        self._conexao.execute(
+            """CREATE TABLE IF NOT EXISTS falhas (
+                url TEXT PRIMARY KEY,
+                caminho TEXT,
+                erro TEXT,
+                tentativas INTEGER,
+                atualizado_em TEXT
+            )"""
+        )
+        self._conexao.commit()
+
+    def obter(self, url: str) -> Optional[Dict]:
+        # Registro da URL ou None se ela nunca foi baixada
+        with self._lock:
+            linha = self._conexao.execute(
+                "SELECT etag, last_modified, tamanho, sha256, caminho, atualizado_em FROM documentos WHERE url = ?",
+                (url,)
+            ).fetchone()
+        if linha is None:
+            return None
+        return dict(zip(('etag', 'last_modified', 'tamanho', 'sha256', 'caminho', 'atualizado_em'), linha))
+
+    def conhecidas(self, urls: Iterable[str]) -> Set[str]:
+        # Quais destas URLs já estão no índice
+        urls = list(urls)
+        encontradas = set()
+        with self._lock:
+            for inicio in range(0, len(urls), 500):  # Limite de parâmetros por consulta do SQLite
+                parte = urls[inicio:inicio + 500]
+                encontradas.update(linha[0] for linha in self._conexao.execute(
+                    f"SELECT url FROM documentos WHERE url IN ({','.join('?' * len(parte))})", parte
+                ))
+        return encontradas
+
+    def registrar(self, url: str, etag: str = None, last_modified: str = None, tamanho: int = None,
+                  sha256: str = None, caminho: str = None):
+        # Grava (ou substitui) o registro da URL
+        with self._lock:
+            self._conexao.execute(
+                "INSERT OR REPLACE INTO documentos (url, etag, last_modified, tamanho, sha256, caminho, atualizado_em) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, tamanho, sha256, caminho, datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conexao.execute("DELETE FROM falhas WHERE url = ?", (url,))
+            self._conexao.commit()
+
+    def registrar_falha(self, url: str, caminho: str, erro: str = None):
+        # Marca a URL como pendente (download falhou); sai da lista quando registrar() for chamado para ela
+        with self._lock:
+            self._conexao.execute(
+                "INSERT INTO falhas (url, caminho, erro, tentativas, atualizado_em) VALUES (?, ?, ?, 1, ?) "
+                "ON CONFLICT(url) DO UPDATE SET caminho = excluded.caminho, erro = excluded.erro, "
+                "tentativas = tentativas + 1, atualizado_em = excluded.atualizado_em",
+                (url, caminho, erro, datetime.now().isoformat(timespec='seconds'))
+            )
+            self._conexao.commit()
+
+    def falhas_pendentes(self, diretorio: str) -> Set[str]:
+        # URLs que falharam e ainda não foram baixadas, com destino dentro do diretório
+        prefixo = os.path.join(os.path.abspath(diretorio), '')
+        with self._lock:
+            linhas = self._conexao.execute("SELECT url, caminho FROM falhas").fetchall()
+        return {url for url, caminho in linhas if caminho and os.path.abspath(caminho).startswith(prefixo)}
+
+    def fechar(self):
+        # Fecha a conexão com o banco
+        with self._lock:
+            self._conexao.close()
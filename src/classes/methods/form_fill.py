@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# Preenchimento declarativo de formulários - campo -> valor aplicado num único execute_script, com os eventos
+# que Angular, AngularJS e JSF escutam (input, change, blur)
+
+import os
+import sys
+from typing import Dict, List, Optional, Tuple, Union
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.methods.waits import Condicao
+
+
+# Confere todos os campos antes de alterar qualquer um (ausente, desabilitado ou sem a opção: nada é alterado)
+# Campos com o valor já correto não disparam eventos (nem recarregam selects dependentes)
+_JS_PREENCHER = """
+var campos = arguments[0], dependente = arguments[1];
+function normalizar(texto) { return (texto || '').replace(/\\s+/g, ' ').trim().toUpperCase(); }
+function localizar(campo) { return document.querySelectorAll(campo.seletor)[campo.indice] || null; }
+function indiceOpcao(select, campo) {
+    var opcoes = select.options, i;
+    if (campo.valor !== null) {
+        for (i = 0; i < opcoes.length; i++) { if (opcoes[i].value === campo.valor) { return i; } }
+        return -1;
+    }
+    var alvo = normalizar(campo.texto);
+    for (i = 0; i < opcoes.length; i++) { if (normalizar(opcoes[i].text) === alvo) { return i; } }
+    if (campo.parcial) {
+        for (i = 0; i < opcoes.length; i++) { if (normalizar(opcoes[i].text).indexOf(alvo) >= 0) { return i; } }
+    }
+    return -1;
+}
+
+var alvos = [];
+for (var n = 0; n < campos.length; n++) {
+    var elemento = localizar(campos[n]);
+    if (!elemento) { return {pronto: false, seletor: campos[n].seletor, motivo: 'ausente'}; }
+    if (elemento.disabled) { return {pronto: false, seletor: campos[n].seletor, motivo: 'desabilitado'}; }
+    var indice = -1;
+    if (elemento.tagName === 'SELECT') {
+        indice = indiceOpcao(elemento, campos[n]);
+        if (indice < 0) { return {pronto: false, seletor: campos[n].seletor, motivo: 'opcao'}; }
+    }
+    alvos.push({campo: campos[n], elemento: elemento, indice: indice});
+}
+
+// Marca o select dependente: a recarga é detectada quando as opções deixam de ser estas
+if (dependente) {
+    var select = document.querySelector(dependente);
+    if (select) { select.__marcaPreenchimento = {primeira: select.options[0] || null, total: select.options.length}; }
+}
+
+var resultado = [];
+alvos.forEach(function (alvo) {
+    var elemento = alvo.elemento, alterado;
+    if (elemento.tagName === 'SELECT') {
+        alterado = elemento.selectedIndex !== alvo.indice;
+        elemento.selectedIndex = alvo.indice;
+    } else {
+        alterado = elemento.value !== alvo.campo.valor;
+        if (alterado) {
+            // Setter nativo: os rastreadores de valor dos frameworks percebem a alteração
+            var prototipo = elemento.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+            Object.getOwnPropertyDescriptor(prototipo, 'value').set.call(elemento, alvo.campo.valor);
+        }
+    }
+    if (alterado) {
+        elemento.dispatchEvent(new Event('input', {bubbles: true}));
+        elemento.dispatchEvent(new Event('change', {bubbles: true}));
+        elemento.dispatchEvent(new Event('blur'));
+        elemento.dispatchEvent(new Event('focusout', {bubbles: true}));
+    }
+    resultado.push({
+        seletor: alvo.campo.seletor,
+        alterado: alterado,
+        valor: elemento.value,
+        texto: elemento.tagName === 'SELECT' ? (elemento.options[alvo.indice].text || '').trim() : null
+    });
+});
+return {pronto: true, campos: resultado};
+"""
+
+_JS_SELECT_RECARREGADO = """
+var select = document.querySelector(arguments[0]);
+if (!select || select.disabled || document.readyState === 'loading') { return false; }
+var marca = select.__marcaPreenchimento;
+if (!marca) { return select.options.length > 0; }
+return select.options.length !== marca.total || (select.options[0] || null) !== marca.primeira;
+"""
+
+# Campo: seletor CSS ou (seletor CSS, posição entre os elementos do seletor)
+# Valor: texto (value do input/option) ou {'texto': texto visível, 'parcial': True para aceitar "contém"}
+Campo = Union[str, Tuple[str, int]]
+Valor = Union[str, int, Dict]
+
+
+def por_id(id_elemento: str) -> str:
+    # Seletor CSS de um id com caracteres especiais (ids JSF como "form:ano")
+    return f'[id="{id_elemento}"]'
+
+
+def montar_campos(campos: List[Tuple[Campo, Valor]]) -> List[Dict]:
+    # Converte [(campo, valor)] no formato lido pelo script
+    montados = []
+    for campo, valor in campos:
+        seletor, indice = campo if isinstance(campo, tuple) else (campo, 0)
+        item = {'seletor': seletor, 'indice': indice, 'valor': None, 'texto': None, 'parcial': False}
+        if isinstance(valor, dict):
+            item['texto'] = valor['texto']
+            item['parcial'] = bool(valor.get('parcial'))
+        else:
+            item['valor'] = str(valor)
+        montados.append(item)
+    return montados
+
+
+def aplicar_campos(navegador, campos: List[Dict], dependente: str = None) -> Dict:
+    # Um execute_script: {'pronto': False, 'seletor', 'motivo'} ou {'pronto': True, 'campos': [...]}
+    return navegador.execute_script(_JS_PREENCHER, campos, dependente)
+
+
+def descrever_pendencia(pendencia: Dict, campos: List[Dict]) -> str:
+    # Mensagem de erro para um campo que não ficou pronto a tempo
+    motivo = pendencia.get('motivo')
+    if motivo == 'opcao':
+        campo = next((c for c in campos if c['seletor'] == pendencia['seletor']), {})
+        return f"Opção '{campo.get('valor') or campo.get('texto')}' não encontrada em {pendencia['seletor']}"
+    return f"Campo {pendencia['seletor']} {motivo}"
+
+
+class SelectRecarregado(Condicao):
+    # Select dependente trocou de opções depois do preenchimento (marcado pelo script de preenchimento)
+
+    descricao = 'select recarregado'
+
+    def __init__(self, seletor: str):
+        self.seletor = seletor
+
+    def __call__(self, navegador):
+        return navegador.execute_script(_JS_SELECT_RECARREGADO, self.seletor)
+
+
+def dividir_em_grupos(campos: List[Dict], dependentes: Optional[Dict[str, str]]) -> List[Tuple[List[Dict], str]]:
+    # Grupos aplicados de uma vez: cada grupo termina no campo que recarrega um select dependente
+    grupos = []
+    atual = []
+    for campo in campos:
+        atual.append(campo)
+        dependente = (dependentes or {}).get(campo['seletor'])
+        if dependente:
+            grupos.append((atual, dependente))
+            atual = []
+    if atual:
+        grupos.append((atual, None))
+    return grupos
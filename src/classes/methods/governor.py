@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# GovernadorSites - Limita, por site, o ritmo e a quantidade de acessos simultâneos de todos os bots
+
+import os
+import sys
+import time
+import threading
+from contextlib import contextmanager
+from urllib.parse import urlparse
+from typing import Dict
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import GOVERNADOR_CONFIG
+
+
+class _LimiteHost:
+    # Balde de fichas (ritmo) + semáforo (acessos simultâneos) de um host
+
+    def __init__(self, taxa_por_segundo: float, rajada: int, max_simultaneas: int):
+        self.taxa = taxa_por_segundo
+        self.rajada = rajada
+        self.fichas = float(rajada)
+        self.ultima_reposicao = time.monotonic()
+        self.lock = threading.Lock()
+        self.semaforo = threading.BoundedSemaphore(max_simultaneas)
+
+        # Métricas
+        self.requisicoes = 0
+        self.em_uso = 0
+        self.espera_total = 0.0
+        self.espera_max = 0.0
+
+    def consumir_ficha(self):
+        # Aguarda até haver uma ficha disponível no balde
+        while True:
+            with self.lock:
+                agora = time.monotonic()
+                self.fichas = min(self.rajada, self.fichas + (agora - self.ultima_reposicao) * self.taxa)
+                self.ultima_reposicao = agora
+                if self.fichas >= 1:
+                    self.fichas -= 1
+                    return
+                espera = (1 - self.fichas) / self.taxa
+            time.sleep(espera)
+
+
+class GovernadorSites:
+    # Governador único do processo: todos os bots e instâncias passam por ele antes de acessar um site
+
+    def __init__(self):
+        self._hosts: Dict[str, _LimiteHost] = {}
+        self._lock = threading.Lock()
+
+    def _limite(self, host: str) -> _LimiteHost:
+        # Cria o limite do host na primeira vez (configuração específica ou padrão de central.py)
+        with self._lock:
+            if host not in self._hosts:
+                config = {**GOVERNADOR_CONFIG['padrao'], **GOVERNADOR_CONFIG['hosts'].get(host, {})}
+                self._hosts[host] = _LimiteHost(
+                    config['taxa_por_segundo'], config['rajada'], config['max_simultaneas']
+                )
+            return self._hosts[host]
+
+    @contextmanager
+    def requisicao(self, url: str):
+        # Segura uma vaga do host só durante este acesso (navegação, envio de formulário, download);
+        # a vaga volta ao fim do bloco, então não limita quantas sessões ficam abertas no host
+        host = urlparse(url).hostname or url
+        limite = self._limite(host)
+
+        inicio = time.monotonic()
+        limite.semaforo.acquire()
+        try:
+            limite.consumir_ficha()
+            espera = time.monotonic() - inicio
+            with limite.lock:
+                limite.requisicoes += 1
+                limite.em_uso += 1
+                limite.espera_total += espera
+                limite.espera_max = max(limite.espera_max, espera)
+            if espera >= GOVERNADOR_CONFIG['aviso_espera']:
+                print(f"Governador: {host} aguardou {espera:.1f}s na fila")
+            yield
+        finally:
+            with limite.lock:
+                limite.em_uso = max(0, limite.em_uso - 1)
+            limite.semaforo.release()
+
+    def obter_metricas(self) -> Dict[str, Dict]:
+        # Requisições, acessos em andamento e tempo de espera na fila por host
+        metricas = {}
+        with self._lock:
+            hosts = dict(self._hosts)
+        for host, limite in hosts.items():
+            with limite.lock:
+                metricas[host] = {
+                    'requisicoes': limite.requisicoes,
+                    'em_uso': limite.em_uso,
+                    'espera_media': limite.espera_total / limite.requisicoes if limite.requisicoes else 0.0,
+                    'espera_max': limite.espera_max
+                }
+        return metricas
+
+    def imprimir_metricas(self):
+        # Exibe as métricas de espera por host
+        for host, m in self.obter_metricas().items():
+            print(f"Governador {host}: {m['requisicoes']} acessos, espera média {m['espera_media']:.2f}s "
+                  f"(máx {m['espera_max']:.1f}s)")
+
+
+_governador = None
+_governador_lock = threading.Lock()
+
+
+def obter_governador() -> GovernadorSites:
+    # Obtém o governador único do processo
+    global _governador
+    with _governador_lock:
+        if _governador is None:
+            _governador = GovernadorSites()
+        return _governador
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# FormularioHTML - Preenche e envia por HTTP um formulário HTML (campos, opções dos selects e botões), sem navegador
+
+import os
+import sys
+from typing import Dict, Optional
+from urllib.parse import urljoin
+
+import requests
+from bs4 import BeautifulSoup
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.methods.http_session import SessaoHTTP
+
+
+class ErroFormulario(Exception):
+    # Página fora do esperado (formulário ausente, opção ou botão inexistente, resposta sem o arquivo)
+    pass
+
+
+class FormularioHTML:
+    # Estado de um formulário mantido do lado do cliente, como o navegador o enviaria
+
+    def __init__(self, sessao: SessaoHTTP, url: str, id_form: str = None, campo_referencia: str = None,
+                 id_mensagens: str = None):
+        # id_form: id do <form>; campo_referencia: id de um campo dentro dele (páginas com vários forms)
+        self.sessao = sessao
+        self.url = url
+        self.id_form = id_form
+        self.campo_referencia = campo_referencia
+        self.id_mensagens = id_mensagens
+        self.acao = url
+        self.metodo = 'GET'
+        self.campos: Dict[str, str] = {}             # nome -> valor enviado
+        self.opcoes: Dict[str, Dict[str, str]] = {}  # nome do select -> texto (maiúsculas) -> valor
+        self.botoes: Dict[str, str] = {}             # texto do botão -> nome ('' se o botão não tem name)
+        self.ids: Dict[str, str] = {}                # id do elemento -> nome
+        self.mensagens = ''                          # Texto do elemento id_mensagens da última página
+
+    def abrir(self):
+        # Carrega a página inicial do formulário
+        resposta = self.sessao.get(self.url)
+        if self._localizar_form(BeautifulSoup(resposta.text, 'html.parser')) is None:
+            raise ErroFormulario(f"Formulário não encontrado em {self.url}")
+        self._ler_html(resposta.text, resposta.url)
+
+    def _localizar_form(self, soup):
+        # <form> pelo id, pelo campo de referência ou o primeiro da página
+        if self.id_form:
+            return soup.find('form', id=self.id_form)
+        if self.campo_referencia:
+            campo = soup.find(id=self.campo_referencia)
+            return campo.find_parent('form') if campo is not None else None
+        return soup.find('form')
+
+    def _nome(self, campo: str) -> str:
+        # Aceita o id (como nos seletores do Selenium) ou o name do campo
+        return self.ids.get(campo, campo)
+
+    def _ler_html(self, html: str, base: str = None):
+        # Atualiza o estado com os elementos presentes no HTML (página inteira ou fragmento)
+        soup = BeautifulSoup(html, 'html.parser')
+        form = self._localizar_form(soup)
+        raiz = form or soup
+        if form is not None:
+            if form.get('action'):
+                self.acao = urljoin(base or self.url, form['action'])
+            self.metodo = (form.get('method') or 'get').upper()
+
+        for entrada in raiz.find_all(['input', 'button']):
+            nome = entrada.get('name')
+            if entrada.get('id') and nome:
+                self.ids[entrada['id']] = nome
+            tipo = (entrada.get('type') or ('submit' if entrada.name == 'button' else 'text')).lower()
+            if tipo == 'submit':
+                texto = entrada.get('value') if entrada.name == 'input' else entrada.get_text(strip=True)
+                self.botoes[(texto or '').strip()] = nome or ''
+            elif not nome:
+                continue
+            elif tipo in ('checkbox', 'radio'):
+                if entrada.has_attr('checked'):
+                    self.campos[nome] = entrada.get('value', 'on')
+            elif tipo not in ('button', 'reset', 'image', 'file'):
+                self.campos[nome] = entrada.get('value', '')
+
+        for select in raiz.find_all('select'):
+            nome = select.get('name')
+            if not nome:
+                continue
+            if select.get('id'):
+                self.ids[select['id']] = nome
+            opcoes = select.find_all('option')
+            self.opcoes[nome] = {
+                opcao.get_text(strip=True).upper(): opcao.get('value', opcao.get_text(strip=True))
+                for opcao in opcoes
+            }
+            selecionada = select.find('option', selected=True) or (opcoes[0] if opcoes else None)
+            self.campos[nome] = selecionada.get('value', selecionada.get_text(strip=True)) if selecionada else ''
+            self._ler_select(select, nome)
+
+        if self.id_mensagens:
+            mensagens = raiz.find(id=self.id_mensagens)
+            if mensagens is not None:
+                self.mensagens = mensagens.get_text(' ', strip=True)
+            elif form is not None:
+                self.mensagens = ''
+
+    def _ler_select(self, select, nome: str):
+        # Ponto de extensão: atributos extras do select (eventos AJAX no JSF)
+        pass
+
+    def selecionar(self, campo: str, valor: str = None, texto: str = None, timeout: float = None):
+        # Escolhe uma opção do select por valor ou texto visível
+        nome = self._nome(campo)
+        if texto is not None:
+            valor = self.opcoes.get(nome, {}).get(texto.strip().upper())
+            if valor is None:
+                raise ErroFormulario(f"Opção '{texto}' não encontrada em {campo}")
+        self.campos[nome] = valor
+
+    def _botao(self, campo: str = None, texto: str = None) -> Optional[str]:
+        # Nome do botão de envio (pelo id/name ou pelo texto)
+        if texto is not None:
+            if texto not in self.botoes:
+                raise ErroFormulario(f"Botão '{texto}' não encontrado")
+            return self.botoes[texto]
+        return self._nome(campo) if campo else None
+
+    def enviar(self, campo: str = None, texto: str = None, timeout: float = None,
+               stream: bool = False) -> requests.Response:
+        # Envia o formulário pelo botão (id/name ou texto); páginas HTML de volta atualizam o estado
+        nome = self._botao(campo, texto)
+        dados = dict(self.campos)
+        if nome:
+            dados[nome] = next((rotulo for rotulo, botao in self.botoes.items() if botao == nome), nome)
+
+        opcoes = self._timeout(timeout)
+        if self.metodo == 'POST':
+            resposta = self.sessao.post(self.acao, data=dados, stream=stream, **opcoes)
+        else:
+            resposta = self.sessao.get(self.acao, params=dados, stream=stream, **opcoes)
+        if not stream and 'html' in resposta.headers.get('Content-Type', '').lower():
+            self._ler_html(resposta.text, resposta.url)
+        return resposta
+
+    @staticmethod
+    def _timeout(timeout: float = None) -> Dict:
+        return {'timeout': timeout} if timeout else {}
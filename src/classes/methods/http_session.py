@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+# SessaoHTTP - Sessão requests com pool de conexões para os motores que consultam os sites sem navegador
+
+import os
+import sys
+from contextlib import contextmanager
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import HTTP_CONFIG
+from src.classes.methods.governor import obter_governador
+from src.classes.methods.cancel_method import ExecucaoCancelada
+
+
+class SessaoHTTP:
+    # Conexões keep-alive reaproveitadas entre requisições; cada requisição passa pelo governador do site
+
+    def __init__(self, token=None, cabecalhos: Dict = None):
+        # token: TokenCancelamento do bot (requisição não começa depois do cancelamento)
+        self.token = token
+        self.sessao = requests.Session()
+
+        tentativas = Retry(
+            total=HTTP_CONFIG['tentativas'],
+            backoff_factor=HTTP_CONFIG['fator_espera'],
+            status_forcelist=HTTP_CONFIG['status_repetir'],
+            allowed_methods=None  # Consultas: POST também pode ser repetido
+        )
+        adaptador = HTTPAdapter(
+            pool_connections=HTTP_CONFIG['pool_hosts'],
+            pool_maxsize=HTTP_CONFIG['pool_conexoes'],
+            max_retries=tentativas
+        )
+        self.sessao.mount('https://', adaptador)
+        self.sessao.mount('http://', adaptador)
+        self.sessao.headers.update(HTTP_CONFIG['cabecalhos'])
+        self.sessao.headers.update(cabecalhos or {})
+
+    def requisitar(self, metodo: str, url: str, **kwargs) -> requests.Response:
+        # Envia a requisição; lança requests.RequestException em falha de rede ou status de erro
+        if self.token is not None and self.token.cancelado():
+            raise ExecucaoCancelada("Cancelado pelo usuário")
+        kwargs.setdefault('timeout', HTTP_CONFIG['timeout'])
+
+        with obter_governador().requisicao(url):
+            resposta = self.sessao.request(metodo, url, **kwargs)
+        resposta.raise_for_status()
+
+        # Páginas sem charset no cabeçalho (comum nos sistemas do governo): detecta pelo conteúdo
+        if 'charset' not in resposta.headers.get('Content-Type', '').lower():
+            resposta.encoding = resposta.apparent_encoding
+        return resposta
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.requisitar('GET', url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.requisitar('POST', url, **kwargs)
+
+    @contextmanager
+    def transmitir(self, url: str, **kwargs):
+        # GET em streaming (downloads): a vaga do host no governador fica ocupada até o corpo ser lido
+        if self.token is not None and self.token.cancelado():
+            raise ExecucaoCancelada("Cancelado pelo usuário")
+        kwargs.setdefault('timeout', HTTP_CONFIG['timeout'])
+
+        with obter_governador().requisicao(url):
+            resposta = self.sessao.get(url, stream=True, **kwargs)
+            try:
+                resposta.raise_for_status()
+                yield resposta
+            finally:
+                resposta.close()
+
+    def fechar(self):
+        # Fecha as conexões guardadas
+        self.sessao.close()
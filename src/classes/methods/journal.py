@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+# DiarioExecucao - Registro durável (JSONL, só acrescenta) do progresso de execuções longas
+
+import os
+import sys
+import json
+import hashlib
+import threading
+from datetime import datetime
+from typing import Callable, Dict, List, Any
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.file.path_manager import obter_diretorio_config
+
+
+class DiarioExecucao:
+    # Uma linha por item concluído, por bot e conjunto de parâmetros; permite retomar de onde parou
+
+    def __init__(self, bot: str, parametros: Dict = None, retomar: bool = False, descrever: Callable = None):
+        # Abre (ou cria) o diário do bot com estes parâmetros
+        # descrever: descrever_item do bot, chave dos itens que não são só um município (período, cidade + ano)
+        self.bot = bot
+        self.parametros = parametros or {}
+        self.retomar = retomar
+        self.descrever = descrever
+        self._lock = threading.Lock()
+
+        chave = hashlib.sha1(
+            json.dumps(self.parametros, sort_keys=True, default=str).encode('utf-8')
+        ).hexdigest()[:12]
+        diretorio = os.path.join(obter_diretorio_config(), 'diario_execucao')
+        os.makedirs(diretorio, exist_ok=True)
+        self.caminho = os.path.join(diretorio, f"{bot}_{chave}.jsonl")
+
+    def chave(self, item: Any) -> str:
+        # Chave do item no diário: o próprio nome ou a descrição do item (descrever_item do bot)
+        if not isinstance(item, dict):
+            return item
+        return self.descrever(item) if self.descrever else item.get('municipio')
+
+    @staticmethod
+    def chave_resultado(resultado: Dict) -> str:
+        # Chave gravada pelo BotBase.processar_fila em 'item' (resultados de laços próprios: o município)
+        return resultado.get('item') or resultado.get('municipio')
+
+    def registrar(self, chave: str, resultado: Dict):
+        # Acrescenta o resultado de um item e força a gravação em disco
+        linha = {
+            'item': chave,
+            'sucesso': bool(resultado.get('sucesso')),
+            'erro': resultado.get('erro'),
+            'data_hora': datetime.now().isoformat(timespec='seconds'),
+            'parametros': self.parametros
+        }
+        with self._lock:
+            with open(self.caminho, 'a', encoding='utf-8') as arquivo:
+                arquivo.write(json.dumps(linha, ensure_ascii=False, default=str) + '\n')
+                arquivo.flush()
+                os.fsync(arquivo.fileno())
+
+    def carregar(self) -> Dict[str, bool]:
+        # Último status de cada item (linhas corrompidas por queda no meio da escrita são ignoradas)
+        status = {}
+        if not os.path.exists(self.caminho):
+            return status
+        with open(self.caminho, 'r', encoding='utf-8') as arquivo:
+            for linha in arquivo:
+                try:
+                    registro = json.loads(linha)
+                except ValueError:
+                    continue
+                status[registro.get('item', registro.get('municipio'))] = registro['sucesso']
+        return status
+
+    def filtrar_pendentes(self, itens: List[Any]) -> List[Any]:
+        # Remove os itens já concluídos com sucesso (itens podem ser nomes ou dicts de trabalho)
+        status = self.carregar()
+        pendentes = [item for item in itens if not status.get(self.chave(item))]
+        concluidos = len(itens) - len(pendentes)
+        falhas = sum(1 for item in pendentes if status.get(self.chave(item)) is False)
+        print(f"Retomando execução: {concluidos} já concluídos, {len(pendentes)} pendentes "
+              f"({falhas} falhas anteriores serão refeitas)")
+        return pendentes
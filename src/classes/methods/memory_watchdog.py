@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+# VigiaMemoria - Mede o Chrome de cada bot entre municípios e pede a troca do navegador antes de a máquina trocar memória
+
+import os
+import sys
+import csv
+import threading
+from datetime import datetime
+from typing import Optional
+
+import psutil
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import MEMORIA_CONFIG
+from src.classes.file.path_manager import obter_diretorio_config
+
+
+def memoria_navegador_mb(navegador) -> Optional[float]:
+    # RSS da árvore de processos do navegador (ChromeDriver + Chrome e seus filhos); None se não der para medir
+    try:
+        processo = psutil.Process(navegador.service.process.pid)
+        processos = [processo] + processo.children(recursive=True)
+    except (AttributeError, psutil.Error):
+        return None
+    total = 0
+    for item in processos:
+        try:
+            total += item.memory_info().rss
+        except (psutil.NoSuchProcess, psutil.AccessDenied):
+            continue
+    return total / (1024 * 1024)
+
+
+class VigiaMemoria:
+    # Uma por bot/instância: amostra após cada item, grava a curva em CSV e diz quando reciclar o navegador
+
+    def __init__(self, nome_bot: str, id_instancia: int = None):
+        self.nome_bot = nome_bot
+        self.id_instancia = id_instancia
+        self.itens = 0                 # Itens processados na execução
+        self.itens_navegador = 0       # Itens desde que o navegador atual foi aberto
+        self.reinicios = 0
+        self.pico_mb = 0.0
+        self._lock = threading.Lock()
+
+        self.caminho = None
+        if MEMORIA_CONFIG['registrar_curva']:
+            diretorio = os.path.join(obter_diretorio_config(), 'curvas_memoria')
+            os.makedirs(diretorio, exist_ok=True)
+            sufixo = f"_instancia{id_instancia}" if id_instancia else ""
+            self.caminho = os.path.join(
+                diretorio, f"{nome_bot}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{sufixo}.csv"
+            )
+
+    def _gravar(self, item: str, memoria_mb: Optional[float], evento: str):
+        # Acrescenta uma linha à curva de memória (data_hora, item, itens, itens_navegador, rss_mb, evento)
+        if not self.caminho:
+            return
+        with self._lock:
+            # Conferido sob o lock: duas gravações seguidas não repetem o cabeçalho
+            novo = not os.path.exists(self.caminho)
+            with open(self.caminho, 'a', newline='', encoding='utf-8') as arquivo:
+                escritor = csv.writer(arquivo, delimiter=';')
+                if novo:
+                    escritor.writerow(['data_hora', 'item', 'itens', 'itens_navegador', 'rss_mb', 'evento'])
+                escritor.writerow([
+                    datetime.now().isoformat(timespec='seconds'), item, self.itens, self.itens_navegador,
+                    f"{memoria_mb:.1f}" if memoria_mb is not None else '', evento
+                ])
+
+    def amostrar(self, navegador, item: str = '') -> Optional[str]:
+        # Mede o navegador depois de um item; retorna o motivo para reciclá-lo ou None
+        self.itens += 1
+        self.itens_navegador += 1
+        memoria_mb = memoria_navegador_mb(navegador)
+        if memoria_mb is not None:
+            self.pico_mb = max(self.pico_mb, memoria_mb)
+
+        motivo = None
+        if memoria_mb is not None and memoria_mb > MEMORIA_CONFIG['limite_rss_mb']:
+            motivo = f"{memoria_mb:.0f} MB de memória"
+        elif MEMORIA_CONFIG['reciclar_apos_itens'] and self.itens_navegador >= MEMORIA_CONFIG['reciclar_apos_itens']:
+            motivo = f"{self.itens_navegador} itens no mesmo navegador"
+        self._gravar(item, memoria_mb, 'amostra')
+        return motivo
+
+    def registrar_reinicio(self, motivo: str, sucesso: bool):
+        # Navegador trocado: zera a contagem de itens do navegador e marca o ponto na curva
+        self.reinicios += 1
+        self.itens_navegador = 0
+        self._gravar(motivo, None, 'reinicio' if sucesso else 'falha_reinicio')
+
+    def resumo(self) -> str:
+        # Linha de resumo para o fim da execução
+        texto = f"Memória do navegador: pico {self.pico_mb:.0f} MB, {self.reinicios} reinícios em {self.itens} itens"
+        if self.caminho:
+            texto += f" (curva: {self.caminho})"
+        return texto
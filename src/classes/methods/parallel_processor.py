@@ -3,10 +3,17 @@
 
 import os
 import sys
+import json
+import queue
+import socket
+import selectors
 import subprocess
 import threading
+import time
 import concurrent.futures
-from typing import List, Dict, Optional
+import itertools
+import functools
+from typing import List, Dict, Optional, Callable
 from datetime import datetime
 
 # Adiciona o diretório pai ao path
@@ -15,7 +22,35 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from src.classes.city_manager import CitySplitter
 from src.classes.date_calculator import DateCalculator
 from src.classes.file.file_manager import FileManager
-from src.classes.central import ARQUIVOS_CONFIG
+from src.classes.central import ARQUIVOS_CONFIG, PARALELO_CONFIG
+from src.classes.report_generator import ReportGenerator
+from src.classes.methods.journal import DiarioExecucao
+from src.classes.methods.cancel_method import TokenCancelamento
+from src.classes.methods.governor import obter_governador
+from src.classes.methods.waits import obter_medidor_esperas
+from src.classes.methods.scheduling import HistoricoDuracoes, ordenar_itens, prever_termino
+
+
+def gerar_itens_trabalho(municipios: List[str] = None, anos: List[str] = None,
+                         meses: List[str] = None, **parametros) -> List[Dict]:
+    # Gera itens de trabalho (município × ano × mês) com parâmetros fixos repetidos em cada item
+    dimensoes = [(chave, valores) for chave, valores in
+                 (('municipio', municipios), ('ano', anos), ('mes', meses)) if valores]
+    if not dimensoes:
+        return [dict(parametros)] if parametros else []
+    
+    chaves = [chave for chave, _ in dimensoes]
+    itens = []
+    for combinacao in itertools.product(*(valores for _, valores in dimensoes)):
+        item = dict(parametros)
+        item.update(zip(chaves, combinacao))
+        itens.append(item)
+    return itens
+
+
+def gerar_itens_periodos(periodos: List[tuple], **parametros) -> List[Dict]:
+    # Gera um item por período (ano, mês) - usado pelos bots que trabalham por período
+    return [dict(parametros, ano=ano, mes=mes) for ano, mes in periodos]
 
 
 class ProcessadorParalelo:
@@ -27,318 +62,513 @@ class ProcessadorParalelo:
         self.date_calculator = DateCalculator()
         self.processos = []
         self.resultados = []
-        self._cancelado = False
+        self.token = TokenCancelamento()  # Compartilhado com todos os bots criados pelo processador
         self.bots_ativos = []  # Lista para rastrear todas as instâncias de bot ativas
         self.executor = None   # Referência ao executor atual
+        self.total_itens = 0
+        self.resultados_itens = []  # Resultados por item, na ordem em que terminam
+        self._lock_resultados = threading.Lock()
+        self.escalador = None  # AutoEscalador quando o modo de autoescala está ativo
+        self.diario = None     # DiarioExecucao opcional: registra cada item e permite retomar
+        self.politica = None   # Política de escalonamento da fila (None: PARALELO_CONFIG)
+        self.historico = None  # HistoricoDuracoes do bot em execução
+        self._termino_previsto = 0.0
+        self._inicio_execucao = 0.0
+        self.instancias_aposentadas = set()
+        self._contador_instancias = 0
+    
+    @property
+    def _cancelado(self) -> bool:
+        # Estado de cancelamento (lido do token compartilhado)
+        return self.token.cancelado()
     
     def executar_paralelo_subprocess(self, num_instancias: int, 
                                     data_inicial: str = None, 
-                                    data_final: str = None) -> Dict:
-        # Executa processamento paralelo usando subprocessos
+                                    data_final: str = None,
+                                    callback_resultado=None,
+                                    autoescalar: bool = False,
+                                    min_instancias: int = None,
+                                    max_instancias: int = None) -> Dict:
+        # Executa processamento paralelo usando subprocessos alimentados por uma fila compartilhada
+        servidor = None
         try:
-            # Limita a 5 instâncias
-            if num_instancias > 5:
-                num_instancias = 5
-                print(f"Número de instâncias limitado a 5")
-            # Prepara divisão de cidades
-            resultado_divisao = self.city_splitter.dividir_cidades(num_instancias)
-            
-            if not resultado_divisao.get('sucesso'):
-                return {'sucesso': False, 'erro': resultado_divisao.get('erro')}
+            cidades = self._filtrar_concluidos(self.city_splitter.lista_cidades)
+            if not cidades:
+                if self._retomando():
+                    return self._consolidar_resultados_genericos([])
+                return {'sucesso': False, 'erro': 'Nenhuma cidade para processar'}
+            num_instancias = self._definir_instancias_iniciais(
+                num_instancias, len(cidades), autoescalar, min_instancias, max_instancias
+            )
             
             # Calcula datas se necessário
             if data_inicial is None or data_final is None:
                 data_inicial, data_final = self.date_calculator.obter_datas_formatadas()
             
-            arquivos_criados = resultado_divisao['arquivos_criados']
+            cidades = self._escalonar(cidades, num_instancias, 'BotBBDAF')
+            fila = self._criar_fila(cidades)
             self.processos = []
             
-            # Inicia todos os processos
-            for arquivo_info in arquivos_criados:
+            # Canal de eventos: socket local (selectors não funciona com pipes no Windows)
+            servidor = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            servidor.bind(('127.0.0.1', 0))
+            servidor.listen(max(num_instancias, self.escalador.maximo if self.escalador else 0))
+            porta = servidor.getsockname()[1]
+            
+            def iniciar_processo():
+                # Inicia um processo em modo fila - a saída de cada um vai direto para o console
+                instancia = self._nova_instancia()
                 cmd = [
                     sys.executable,
                     os.path.join(os.path.dirname(__file__), '..', 'run_instance.py'),
-                    arquivo_info['arquivo'],
+                    '--fila',
                     data_inicial,
-                    data_final
+                    data_final,
+                    str(porta),
+                    str(instancia)
                 ]
-                
-                processo = subprocess.Popen(
-                    cmd,
-                    stdout=subprocess.PIPE,
-                    stderr=subprocess.PIPE,
-                    text=True
-                )
-                
                 self.processos.append({
-                    'processo': processo,
-                    'instancia': arquivo_info['instancia'],
-                    'arquivo': arquivo_info['arquivo'],
-                    'num_cidades': arquivo_info['num_cidades']
+                    'processo': subprocess.Popen(cmd, stdin=subprocess.DEVNULL),
+                    'instancia': instancia
                 })
-                
-                print(f"Instância {arquivo_info['instancia']}: {arquivo_info['num_cidades']} cidades")
             
-            # Aguarda conclusão e coleta resultados
+            for _ in range(num_instancias):
+                iniciar_processo()
+            
+            print(f"{num_instancias} instâncias consumindo fila de {len(cidades)} cidades")
+            
+            estatisticas = self._multiplexar_instancias(servidor, fila, callback_resultado, iniciar_processo)
+            
+            for proc_info in self.processos:
+                proc_info['processo'].wait()
+            
+            if self._cancelado:
+                return {'sucesso': False, 'erro': 'Cancelado pelo usuário'}
+            
             resultados = []
             for proc_info in self.processos:
-                stdout, stderr = proc_info['processo'].communicate()
-                
+                stats = estatisticas.get(proc_info['instancia'], ReportGenerator.criar_estatisticas(0))
+                ReportGenerator.calcular_taxa_sucesso(stats)
                 resultados.append({
                     'instancia': proc_info['instancia'],
+                    'sucesso': proc_info['processo'].returncode == 0 or stats['total'] > 0,
                     'returncode': proc_info['processo'].returncode,
-                    'stdout': stdout,
-                    'stderr': stderr,
-                    'num_cidades': proc_info['num_cidades']
+                    'estatisticas': stats
                 })
-                
-                # Remove arquivo temporário
-                try:
-                    os.remove(proc_info['arquivo'])
-                except:
-                    pass
             
             # Consolida resultados
-            return self._consolidar_resultados(resultados)
+            consolidado = self._consolidar_resultados_genericos(resultados)
+            self._relatar_termino(consolidado)
+            pendentes = fila.qsize()
+            if pendentes:
+                print(f"Aviso: {pendentes} itens não foram processados")
+                consolidado['pendentes'] = pendentes
+            return consolidado
             
         except Exception as e:
             return {'sucesso': False, 'erro': str(e)}
+        finally:
+            if servidor:
+                servidor.close()
+    
+    def _multiplexar_instancias(self, servidor: socket.socket, fila: queue.Queue,
+                                callback_resultado=None, iniciar_processo: Callable = None) -> Dict[int, Dict]:
+        # Atende todas as instâncias num único laço: entrega cidades e recebe eventos ao vivo
+        seletor = selectors.DefaultSelector()
+        servidor.setblocking(False)
+        seletor.register(servidor, selectors.EVENT_READ, data=None)
+        estatisticas = {p['instancia']: ReportGenerator.criar_estatisticas(0) for p in self.processos}
+        conexoes = 0
+        proxima_avaliacao = time.time() + (self.escalador.intervalo if self.escalador else 0)
+        
+        try:
+            while not self._cancelado:
+                # Termina quando todos os processos saíram e não há conexão aberta
+                if conexoes == 0 and all(p['processo'].poll() is not None for p in self.processos):
+                    break
+                
+                # Autoescala: reavalia a quantidade de processos periodicamente
+                if self.escalador and iniciar_processo and time.time() >= proxima_avaliacao:
+                    proxima_avaliacao = time.time() + self.escalador.intervalo
+                    ativas = [p['instancia'] for p in self.processos
+                              if p['processo'].poll() is None and p['instancia'] not in self.instancias_aposentadas]
+                    decisao = self.escalador.decidir(len(ativas), fila.qsize())
+                    if decisao > 0:
+                        iniciar_processo()
+                    elif decisao < 0 and ativas:
+                        self._aposentar_instancia(max(ativas))
+                
+                for chave, _ in seletor.select(timeout=0.5):
+                    if chave.data is None:
+                        conexao, _ = servidor.accept()
+                        conexao.setblocking(False)
+                        seletor.register(conexao, selectors.EVENT_READ,
+                                         data={'buffer': b'', 'instancia': None, 'item': None})
+                        conexoes += 1
+                        continue
+                    
+                    conexao, estado = chave.fileobj, chave.data
+                    try:
+                        dados = conexao.recv(65536)
+                    except OSError:
+                        dados = b''
+                    
+                    if not dados:
+                        # Instância encerrou - devolve a cidade em andamento para as demais
+                        if estado['item'] is not None:
+                            print(f"Instância {estado['instancia']}: encerrada, {estado['item']} devolvida para a fila")
+                            fila.put(estado['item'])
+                        seletor.unregister(conexao)
+                        conexao.close()
+                        conexoes -= 1
+                        continue
+                    
+                    estado['buffer'] += dados
+                    while b'\n' in estado['buffer']:
+                        linha, estado['buffer'] = estado['buffer'].split(b'\n', 1)
+                        try:
+                            evento = json.loads(linha.decode('utf-8'))
+                        except ValueError:
+                            continue
+                        self._tratar_evento(conexao, estado, evento, fila, estatisticas, callback_resultado)
+        finally:
+            for chave in list(seletor.get_map().values()):
+                if chave.data is not None:
+                    chave.fileobj.close()
+            seletor.close()
+        
+        return estatisticas
+    
+    def _tratar_evento(self, conexao: socket.socket, estado: Dict, evento: Dict, fila: queue.Queue,
+                       estatisticas: Dict[int, Dict], callback_resultado=None):
+        # Trata um evento JSON recebido de uma instância (pedir, inicio, resultado)
+        tipo = evento.get('evento')
+        estado['instancia'] = evento.get('instancia', estado['instancia'])
+        
+        if tipo == 'pedir':
+            estado['item'] = self._proximo_item(fila, estado['instancia'])
+            resposta = {'municipio': estado['item']} if estado['item'] is not None else {'fim': True}
+            try:
+                conexao.sendall((json.dumps(resposta, ensure_ascii=False) + '\n').encode('utf-8'))
+            except OSError:
+                pass
+        
+        elif tipo == 'inicio':
+            print(f"[Instância {estado['instancia']}] → {evento.get('municipio')}")
+        
+        elif tipo == 'resultado':
+            resultado = evento.get('resultado', {})
+            estado['item'] = None
+            stats = estatisticas.setdefault(estado['instancia'], ReportGenerator.criar_estatisticas(0))
+            stats['total'] += 1
+            ReportGenerator.atualizar_estatisticas(stats, resultado)
+            self._registrar_resultado(estado['instancia'], resultado, callback_resultado)
     
     def executar_paralelo_threads(self, num_instancias: int,
                                  data_inicial: str = None,
-                                 data_final: str = None) -> Dict:
-        # Executa processamento paralelo usando threads
+                                 data_final: str = None,
+                                 callback_resultado=None,
+                                 autoescalar: bool = False,
+                                 min_instancias: int = None,
+                                 max_instancias: int = None) -> Dict:
+        # Executa processamento paralelo do BB DAF usando o motor genérico em threads
         try:
-            # Limita a 5 instâncias
-            if num_instancias > 5:
-                num_instancias = 5
-                print(f"Número de instâncias limitado a 5")
-            from bots.bot_bbdaf import BotBBDAF
-            from classes.data_extractor import DataExtractor
-            
-            # Prepara divisão de cidades
-            resultado_divisao = self.city_splitter.dividir_cidades(num_instancias)
-            
-            if not resultado_divisao.get('sucesso'):
-                return {'sucesso': False, 'erro': resultado_divisao.get('erro')}
+            from src.bots.bot_bbdaf import BotBBDAF
+            from src.classes.data_extractor import DataExtractor
             
             # Calcula datas se necessário
             if data_inicial is None or data_final is None:
                 data_inicial, data_final = self.date_calculator.obter_datas_formatadas()
             
-            arquivos_criados = resultado_divisao['arquivos_criados']
+            def criar_bot():
+                bot = BotBBDAF()
+                bot.configurar_extrator_dados(DataExtractor("bbdaf"))
+                return bot
+            
+            itens = gerar_itens_trabalho(
+                municipios=self.city_splitter.lista_cidades,
+                data_inicial=data_inicial,
+                data_final=data_final
+            )
+            return self.executar_paralelo_generico(
+                criar_bot, itens, num_instancias, callback_resultado,
+                autoescalar=autoescalar, min_instancias=min_instancias, max_instancias=max_instancias,
+                nome_bot='BotBBDAF'
+            )
+            
+        except Exception as e:
+            return {'sucesso': False, 'erro': str(e)}
+    
+    def executar_paralelo_generico(self, criar_bot: Callable, itens: List[Dict],
+                                   num_instancias: int, callback_resultado=None,
+                                   autoescalar: bool = False,
+                                   min_instancias: int = None,
+                                   max_instancias: int = None,
+                                   nome_bot: str = None) -> Dict:
+        # Motor paralelo genérico: N instâncias de qualquer BotBase consomem a mesma fila de itens
+        try:
+            itens = self._filtrar_concluidos(list(itens))
+            if not itens:
+                if self._retomando():
+                    return self._consolidar_resultados_genericos([])
+                return {'sucesso': False, 'erro': 'Nenhum item para processar'}
+            num_instancias = self._definir_instancias_iniciais(
+                num_instancias, len(itens), autoescalar, min_instancias, max_instancias
+            )
+            limite = min(self.escalador.maximo, len(itens)) if self.escalador else num_instancias
+            
+            itens = self._escalonar(itens, num_instancias, nome_bot or getattr(criar_bot, '__name__', 'Bot'))
+            fila = self._criar_fila(itens)
+            print(f"{num_instancias} instâncias consumindo fila de {len(itens)} itens")
             
-            # Executa em threads paralelas
-            self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_instancias)
+            # Referência local: cancelar() pode zerar self.executor a qualquer momento
+            executor = concurrent.futures.ThreadPoolExecutor(max_workers=limite)
+            self.executor = executor
+            futures = {}
             try:
-                futures = []
+                for _ in range(num_instancias):
+                    self._iniciar_instancia_thread(executor, criar_bot, fila, futures, callback_resultado)
                 
-                for arquivo_info in arquivos_criados:
-                    # Cria nova instância do bot para cada thread
-                    bot = BotBBDAF()
-                    bot.configurar_extrator_dados(DataExtractor("bbdaf"))
-                    self.bots_ativos.append(bot)  # Registra bot ativo
+                # Aguarda as instâncias (com autoescala, reavalia a quantidade a cada intervalo)
+                pendentes = set(futures)
+                proxima_avaliacao = time.time() + (self.escalador.intervalo if self.escalador else 0)
+                while pendentes:
+                    if self._cancelado:
+                        return {'sucesso': False, 'erro': 'Cancelado pelo usuário'}
+                    
+                    _, pendentes = concurrent.futures.wait(pendentes, timeout=1.0)
                     
-                    future = self.executor.submit(
-                        self._executar_bot_thread,
-                        bot,
-                        arquivo_info,
-                        data_inicial,
-                        data_final
-                    )
-                    futures.append((future, arquivo_info))
+                    if self.escalador and pendentes and time.time() >= proxima_avaliacao:
+                        proxima_avaliacao = time.time() + self.escalador.intervalo
+                        ativas = [futures[f] for f in pendentes if futures[f] not in self.instancias_aposentadas]
+                        decisao = self.escalador.decidir(len(ativas), fila.qsize())
+                        if decisao > 0 and len(pendentes) < limite:
+                            pendentes.add(self._iniciar_instancia_thread(executor, criar_bot, fila, futures,
+                                                                         callback_resultado))
+                        elif decisao < 0 and ativas:
+                            self._aposentar_instancia(max(ativas))
                 
                 # Coleta resultados
                 resultados = []
-                for future, arquivo_info in futures:
-                    if self._cancelado:
-                        self.executor.shutdown(wait=False, cancel_futures=True)
-                        return {'sucesso': False, 'erro': 'Cancelado pelo usuário'}
-                    
+                for future, instancia in futures.items():
                     resultado = future.result()
-                    resultado['instancia'] = arquivo_info['instancia']
-                    resultado['num_cidades'] = arquivo_info['num_cidades']
+                    resultado['instancia'] = instancia
                     resultados.append(resultado)
             finally:
-                if self.executor:
-                    self.executor.shutdown(wait=True)
+                # Cancelado: não espera as threads (os bots já foram cancelados e fecham sozinhos)
+                executor.shutdown(wait=not self._cancelado, cancel_futures=self._cancelado)
+                if self.executor is executor:
                     self.executor = None
                 self.bots_ativos.clear()  # Limpa lista de bots
             
-            # Consolida resultados
-            return self._consolidar_resultados(resultados)
+            consolidado = self._consolidar_resultados_genericos(resultados)
+            self._relatar_termino(consolidado)
+            
+            # Itens que nenhuma instância conseguiu pegar (ex: todas falharam ao abrir o navegador)
+            pendentes = fila.qsize()
+            if pendentes:
+                print(f"Aviso: {pendentes} itens não foram processados")
+                consolidado['pendentes'] = pendentes
+            return consolidado
             
         except Exception as e:
             return {'sucesso': False, 'erro': str(e)}
     
-    def _executar_bot_thread(self, bot, arquivo_info, data_inicial, data_final):
-        # Executa uma instância do bot em thread
+    def _definir_instancias_iniciais(self, num_instancias: int, total_itens: int, autoescalar: bool,
+                                     min_instancias: int = None, max_instancias: int = None) -> int:
+        # Define quantas instâncias iniciar (modo manual: limite de central.py; autoescala: mínimo da faixa)
+        self._contador_instancias = 0
+        self.instancias_aposentadas = set()
+        
+        if autoescalar:
+            from src.classes.methods.autoscaler import AutoEscalador
+            self.escalador = AutoEscalador(min_instancias, max_instancias)
+            num_instancias = self.escalador.minimo
+            print(f"Autoescala ativa: {self.escalador.minimo} a {self.escalador.maximo} instâncias")
+        else:
+            self.escalador = None
+            limite = PARALELO_CONFIG['max_instancias']
+            if num_instancias > limite:
+                num_instancias = limite
+                print(f"Número de instâncias limitado a {limite}")
+        
+        return max(1, min(num_instancias, total_itens))
+    
+    def _nova_instancia(self) -> int:
+        # Gera o número da próxima instância
+        self._contador_instancias += 1
+        return self._contador_instancias
+    
+    def _iniciar_instancia_thread(self, executor: concurrent.futures.ThreadPoolExecutor, criar_bot: Callable,
+                                  fila: queue.Queue, futures: Dict,
+                                  callback_resultado=None) -> concurrent.futures.Future:
+        # Cria um novo bot e coloca a instância para consumir a fila
+        instancia = self._nova_instancia()
+        bot = criar_bot()
+        bot.id_instancia = instancia
+        bot.token = self.token  # Cancelar o processador acorda as esperas de todos os bots
+        self.bots_ativos.append(bot)  # Registra bot ativo
+        
+        future = executor.submit(self._executar_bot_fila, bot, fila, instancia, callback_resultado)
+        futures[future] = instancia
+        return future
+    
+    def _aposentar_instancia(self, instancia: int):
+        # Marca a instância para parar ao terminar o item atual (não pega novos itens)
+        self.instancias_aposentadas.add(instancia)
+        print(f"Autoescala: instância {instancia} será encerrada após o item atual")
+    
+    def _executar_bot_fila(self, bot, fila: queue.Queue, instancia: int, callback_resultado=None) -> Dict:
+        # Executa uma instância do bot em thread retirando itens da fila até esvaziá-la
         try:
-            print(f"Instância {arquivo_info['instancia']}: Iniciando processamento...")
-            
-            resultado = bot.executar_completo(
-                arquivo_cidades=arquivo_info['arquivo'],
-                data_inicial=data_inicial,
-                data_final=data_final
-            )
+            print(f"Instância {instancia}: Iniciando processamento...")
             
-            # Remove arquivo temporário
-            try:
-                os.remove(arquivo_info['arquivo'])
-            except:
-                pass
+            if self._cancelado or not bot.iniciar_sessao():
+                return {'sucesso': False, 'erro': 'Cancelado ou falha navegador'}
             
-            return resultado
+            return bot.processar_fila(
+                lambda: self._proximo_item(fila, instancia),
+                callback_resultado=lambda resultado: self._registrar_resultado(
+                    instancia, resultado, callback_resultado
+                )
+            )
             
         except Exception as e:
             return {'sucesso': False, 'erro': str(e)}
+        finally:
+            bot.encerrar_sessao()
+            if bot in self.bots_ativos:
+                self.bots_ativos.remove(bot)
     
-    def _consolidar_resultados(self, resultados: List[Dict]) -> Dict:
-        # Consolida resultados de múltiplas instâncias
-        total_cidades = 0
-        total_sucessos = 0
-        total_erros = 0
-        instancias_sucesso = 0
-        instancias_erro = 0
-        
-        for resultado in resultados:
-            if resultado.get('sucesso') or resultado.get('returncode') == 0:
-                instancias_sucesso += 1
-                # Tenta extrair estatísticas
-                if 'estatisticas' in resultado:
-                    stats = resultado['estatisticas']
-                    total_cidades += stats.get('total', 0)
-                    total_sucessos += stats.get('sucessos', 0)
-                    total_erros += stats.get('erros', 0)
-                elif 'stdout' in resultado:
-                    # Tenta parsear do stdout
-                    self._parsear_estatisticas_stdout(resultado['stdout'])
-            else:
-                instancias_erro += 1
-        
-        taxa_sucesso = (total_sucessos / total_cidades * 100) if total_cidades > 0 else 0
-        
-        return {
-            'sucesso': True,
-            'instancias': {
-                'total': len(resultados),
-                'sucesso': instancias_sucesso,
-                'erro': instancias_erro
-            },
-            'estatisticas': {
-                'total': total_cidades,
-                'sucessos': total_sucessos,
-                'erros': total_erros,
-                'taxa_sucesso': taxa_sucesso
-            },
-            'detalhes': resultados
-        }
+    def _retomando(self) -> bool:
+        # Indica se a execução está retomando um diário anterior
+        return bool(self.diario and self.diario.retomar)
     
-    def _parsear_estatisticas_stdout(self, stdout: str) -> Dict:
-        # Extrai estatísticas do stdout do processo
-        stats = {'total': 0, 'sucessos': 0, 'erros': 0}
-        
-        # Procura por padrões conhecidos no stdout
-        for linha in stdout.split('\n'):
-            if 'Total:' in linha:
-                try:
-                    stats['total'] = int(linha.split(':')[1].split()[0])
-                except:
-                    pass
-            elif 'Sucessos:' in linha:
-                try:
-                    stats['sucessos'] = int(linha.split(':')[1].split()[0])
-                except:
-                    pass
-            elif 'Erros:' in linha:
-                try:
-                    stats['erros'] = int(linha.split(':')[1].split()[0])
-                except:
-                    pass
+    def _filtrar_concluidos(self, itens: List) -> List:
+        # Na retomada, remove da fila os itens que o diário já registra como concluídos
+        return self.diario.filtrar_pendentes(itens) if self._retomando() else itens
+    
+    def _escalonar(self, itens: List, num_instancias: int, nome_bot: str) -> List:
+        # Ordena os itens pela política de escalonamento e prevê o término pelo histórico de durações
+        self.historico = HistoricoDuracoes(nome_bot)
+        itens = ordenar_itens(itens, self.historico, self.politica)
+        self._termino_previsto = prever_termino(itens, num_instancias, self.historico)
+        self._inicio_execucao = time.time()
+        politica = self.politica or PARALELO_CONFIG['politica_escalonamento']
+        print(f"Escalonamento {politica.upper()}: término previsto em {self._termino_previsto / 60:.1f} min")
+        return itens
+    
+    def _relatar_termino(self, consolidado: Dict):
+        # Salva o histórico de durações e compara o término previsto com o real
+        if not self.historico:
+            return
+        real = time.time() - self._inicio_execucao
+        try:
+            self.historico.salvar()
+        except OSError as e:
+            print(f"Aviso: Erro ao salvar histórico de durações - {e}")
+        print(f"Término previsto: {self._termino_previsto / 60:.1f} min | real: {real / 60:.1f} min")
+        consolidado['termino_previsto'] = round(self._termino_previsto, 1)
+        consolidado['termino_real'] = round(real, 1)
         
-        return stats
+        # Espera na fila do governador por site (mesmo processo: modo threads)
+        governador = obter_governador()
+        governador.imprimir_metricas()
+        consolidado['governador'] = governador.obter_metricas()
+
+        # Tempo ganho pelas esperas por condição em relação às pausas fixas (modo threads)
+        medidor = obter_medidor_esperas()
+        medidor.imprimir_resumo()
+        consolidado['esperas'] = medidor.resumo()
     
-    def executar_paralelo_fnde(self, bot_template, ano: str, num_instancias: int = 2) -> Dict:
-        from src.bots.bot_fnde import BotFNDE
-        municipios = bot_template.obter_lista_municipios()
-        lotes = self._dividir_municipios(municipios, num_instancias)
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_instancias)
+    def _criar_fila(self, itens: List) -> queue.Queue:
+        # Cria a fila compartilhada em memória e zera o acompanhamento de resultados
+        fila = queue.Queue()
+        for item in itens:
+            fila.put(item)
+        self.total_itens = len(itens)
+        self.resultados_itens = []
+        return fila
+    
+    def _proximo_item(self, fila: queue.Queue, instancia: int = None):
+        # Retira o próximo item da fila (None quando a fila acabou, a execução foi cancelada
+        # ou a instância foi aposentada pela autoescala)
+        if self._cancelado or instancia in self.instancias_aposentadas:
+            return None
         try:
-            futures = []
-            for i, lote in enumerate(lotes, 1):
-                bot = BotFNDE()
-                self.bots_ativos.append(bot)
-                futures.append((self.executor.submit(self._executar_bot_lote, bot, {'ano': ano, 'municipios': lote}, i), i))
-            resultados = [f.result() for f, _ in futures]
-        finally:
-            self.executor.shutdown(wait=True); self.executor = None; self.bots_ativos.clear()
-        return self._consolidar_resultados_genericos(resultados)
+            return fila.get_nowait()
+        except queue.Empty:
+            return None
     
-    def _dividir_municipios(self, municipios: List[str], num_instancias: int) -> List[List[str]]:
-        # Divide lista de municípios em lotes para processamento paralelo
-        import math
+    def _registrar_resultado(self, instancia: int, resultado: Dict, callback_resultado=None):
+        # Registra o resultado de um item assim que ele termina e repassa ao callback
+        with self._lock_resultados:
+            resultado['instancia'] = instancia
+            self.resultados_itens.append(resultado)
+            concluidos = len(self.resultados_itens)
+            if self.escalador:
+                self.escalador.registrar_resultado(resultado)
         
-        total_municipios = len(municipios)
-        municipios_por_instancia = math.ceil(total_municipios / num_instancias)
+        if self.diario:
+            self.diario.registrar(DiarioExecucao.chave_resultado(resultado), resultado)
         
-        lotes = []
-        for i in range(num_instancias):
-            inicio = i * municipios_por_instancia
-            fim = min(inicio + municipios_por_instancia, total_municipios)
-            
-            if inicio < total_municipios:
-                lote = municipios[inicio:fim]
-                lotes.append(lote)
+        status = "✓" if resultado.get('sucesso') else "✗"
+        duracao = resultado.get('duracao') or sum(resultado.get('tempos', {}).values())
+        if self.historico and resultado.get('sucesso'):
+            self.historico.registrar(resultado.get('municipio'), duracao)
+        tempo = f" em {duracao:.1f}s" if duracao else ""
+        print(f"[{concluidos}/{self.total_itens}] {status} {resultado.get('municipio', '')} (instância {instancia}){tempo}")
         
-        return lotes
+        if callback_resultado:
+            try:
+                callback_resultado(resultado)
+            except Exception as e:
+                print(f"Aviso: Erro no callback de resultado - {e}")
+    
+    def executar_paralelo_fnde(self, bot_template, ano: str, num_instancias: int = 2,
+                               autoescalar: bool = False, motor: str = None) -> Dict:
+        # Executa FNDE em paralelo: um item por município do ano informado
+        # motor: 'http' (sem navegador) ou 'selenium'; padrão: o motor do bot_template
+        from src.bots.bot_fnde import BotFNDE
+        itens = gerar_itens_trabalho(municipios=bot_template.obter_lista_municipios(), ano=ano)
+        criar_bot = functools.partial(BotFNDE, motor=motor or bot_template.motor)
+        return self.executar_paralelo_generico(criar_bot, itens, num_instancias, autoescalar=autoescalar,
+                                               nome_bot='BotFNDE')
 
-    def _executar_bot_lote(self, bot, metodo_kwargs: Dict, instancia: int) -> Dict:
-        """Worker genérico para qualquer bot (FNDE, ConsFNS, BBDAF)"""
-        try:
-            # Extract municipality count for logging (works with municipios or cidades key)
-            num_mun = len(metodo_kwargs.get('municipios', metodo_kwargs.get('cidades', [])))
-            print(f"Instância {instancia}: {num_mun} municípios...")
-            if self._cancelado or not bot.configurar_navegador():
-                bot.limpar_recursos()
-                return {'sucesso': False, 'erro': 'Cancelado ou falha navegador'}
-            resultado = bot.processar_lote_municipios(**metodo_kwargs)
-            return resultado
-        except Exception as e:
-            return {'sucesso': False, 'erro': str(e)}
-        finally:
-            bot.limpar_recursos()
+    def executar_paralelo_consfns(self, bot_template, num_instancias: int = 2,
+                                  autoescalar: bool = False) -> Dict:
+        # Executa Consulta FNS em paralelo: um item por município
+        from src.bots.bot_cons_fns import BotConsFNS
+        itens = gerar_itens_trabalho(municipios=bot_template.obter_lista_municipios())
+        return self.executar_paralelo_generico(BotConsFNS, itens, num_instancias, autoescalar=autoescalar,
+                                               nome_bot='BotConsFNS')
 
     def _consolidar_resultados_genericos(self, resultados: List[Dict]) -> Dict:
         """Consolidação única para TODOS os bots"""
         total = sucessos = erros = inst_ok = 0
         for r in resultados:
-            if r.get('sucesso'): inst_ok += 1; s = r.get('estatisticas', {})
+            if not r.get('sucesso'):
+                continue
+            inst_ok += 1
+            s = r.get('estatisticas', {})
             total += s.get('total', 0); sucessos += s.get('sucessos', 0); erros += s.get('erros', 0)
-        return {'sucesso': True, 'estatisticas': {'total': total, 'sucessos': sucessos,
-                'erros': erros, 'taxa_sucesso': (sucessos/total*100) if total else 0}}
-
-    def executar_paralelo_consfns(self, bot_template, num_instancias: int = 2) -> Dict:
-        from src.bots.bot_cons_fns import BotConsFNS
-        municipios = bot_template.obter_lista_municipios()
-        lotes = self._dividir_municipios(municipios, num_instancias)
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_instancias)
-        try:
-            futures = []
-            for i, lote in enumerate(lotes, 1):
-                bot = BotConsFNS()
-                self.bots_ativos.append(bot)
-                futures.append((self.executor.submit(self._executar_bot_lote, bot, {'municipios': lote}, i), i))
-            resultados = [f.result() for f, _ in futures]
-        finally:
-            self.executor.shutdown(wait=True); self.executor = None; self.bots_ativos.clear()
-        return self._consolidar_resultados_genericos(resultados)
+        return {'sucesso': True,
+                'instancias': {'total': len(resultados), 'sucesso': inst_ok, 'erro': len(resultados) - inst_ok},
+                'estatisticas': {'total': total, 'sucessos': sucessos,
+                                 'erros': erros, 'taxa_sucesso': (sucessos/total*100) if total else 0},
+                'detalhes': resultados}
 
     def cancelar(self):
         # Cancela a execução paralela em andamento
-        print("Cancelando execução paralela - forçando fechamento de todos os bots...")
-        self._cancelado = True
+        print("Cancelando execução paralela...")
+        self.token.cancelar()
         
-        # PRIMEIRO: Cancela TODOS os bots ativos forçadamente
+        # PRIMEIRO: dá um instante para os bots saírem das esperas e fecharem o navegador sozinhos
+        limite = time.time() + PARALELO_CONFIG['tolerancia_cancelamento']
+        while self.bots_ativos and time.time() < limite:
+            time.sleep(0.1)
+        
+        # Força o fechamento dos bots que não saíram a tempo
         for bot in self.bots_ativos[:]:  # Cria cópia da lista para evitar modificação durante iteração
             try:
                 if hasattr(bot, 'cancelar_forcado'):
@@ -372,11 +602,6 @@ class ProcessadorParalelo:
                     processo.kill()
                     processo.wait()
                 
-                # Remove arquivo temporário
-                try:
-                    os.remove(proc_info['arquivo'])
-                except:
-                    pass
             except:
                 pass
         
@@ -391,7 +616,7 @@ def main():
     
     parser = argparse.ArgumentParser(description='Processador Paralelo BB DAF')
     parser.add_argument('--instancias', type=int, default=2,
-                       help='Número de instâncias paralelas (máximo 5)')
+                       help=f"Número de instâncias paralelas (máximo {PARALELO_CONFIG['max_instancias']})")
     parser.add_argument('--data-inicial', type=str, default=None,
                        help='Data inicial (DD/MM/AAAA)')
     parser.add_argument('--data-final', type=str, default=None,
@@ -399,18 +624,37 @@ def main():
     parser.add_argument('--modo', choices=['subprocess', 'threads'], 
                        default='subprocess',
                        help='Modo de execução paralela')
+    parser.add_argument('--autoescalar', action='store_true',
+                       help='Ajusta o número de instâncias conforme CPU, RAM e memória do Chrome')
+    parser.add_argument('--min', type=int, default=None,
+                       help='Mínimo de instâncias na autoescala')
+    parser.add_argument('--max', type=int, default=None,
+                       help='Máximo de instâncias na autoescala')
+    parser.add_argument('--retomar', '--resume', action='store_true',
+                       help='Pula as cidades já concluídas numa execução anterior com as mesmas datas')
+    parser.add_argument('--politica', choices=['lpt', 'fifo'], default=None,
+                       help='Ordem da fila: lpt (mais demoradas primeiro) ou fifo (ordem da lista)')
     
     args = parser.parse_args()
     
     # Valida número de instâncias
-    if args.instancias > 5:
-        print(f"Aviso: Número de instâncias limitado a 5 (solicitado: {args.instancias})")
-        args.instancias = 5
+    limite = PARALELO_CONFIG['max_instancias']
+    if not args.autoescalar and args.instancias > limite:
+        print(f"Aviso: Número de instâncias limitado a {limite} (solicitado: {args.instancias})")
+        args.instancias = limite
     elif args.instancias < 1:
         print("Erro: Número de instâncias deve ser pelo menos 1")
         return 1
     
     processador = ProcessadorParalelo()
+    processador.politica = args.politica
+    
+    # Diário de progresso (mesma chave do BotBBDAF: bot + datas)
+    if args.data_inicial is None or args.data_final is None:
+        args.data_inicial, args.data_final = processador.date_calculator.obter_datas_formatadas()
+    processador.diario = DiarioExecucao(
+        'BotBBDAF', {'data_inicial': args.data_inicial, 'data_final': args.data_final}, args.retomar
+    )
     
     print(f"Iniciando processamento paralelo com {args.instancias} instâncias...")
     
@@ -418,13 +662,19 @@ def main():
         resultado = processador.executar_paralelo_subprocess(
             args.instancias,
             args.data_inicial,
-            args.data_final
+            args.data_final,
+            autoescalar=args.autoescalar,
+            min_instancias=args.min,
+            max_instancias=args.max
         )
     else:
         resultado = processador.executar_paralelo_threads(
             args.instancias,
             args.data_inicial,
-            args.data_final
+            args.data_final,
+            autoescalar=args.autoescalar,
+            min_instancias=args.min,
+            max_instancias=args.max
         )
     
     if resultado['sucesso']:
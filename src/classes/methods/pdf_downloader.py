@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# BaixadorPDF - Baixa vários PDFs ao mesmo tempo por uma sessão HTTP compartilhada (pool de conexões keep-alive)
+
+import os
+import sys
+import random
+import hashlib
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, Dict, List
+
+import requests
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import DOWNLOAD_PDF_CONFIG
+from src.classes.methods.cancel_method import ExecucaoCancelada, TokenCancelamento
+from src.classes.methods.http_session import SessaoHTTP
+from src.classes.methods.download_index import IndiceDownloads
+
+ASSINATURA_PDF = b'%PDF-'
+
+
+class ArquivoNaoPDF(Exception):
+    # Servidor devolveu outra coisa (página de erro, HTML de login): não adianta tentar de novo
+    pass
+
+
+class BaixadorPDF:
+    # Fila de downloads em threads; o limite de acessos simultâneos por host fica com o governador
+
+    def __init__(self, token: TokenCancelamento = None, sessao: SessaoHTTP = None, simultaneos: int = None,
+                 tentativas: int = None, tamanho_minimo: int = None, indice: IndiceDownloads = None):
+        # token: TokenCancelamento do bot; sessao: SessaoHTTP compartilhada (criada aqui se não for passada)
+        # indice: IndiceDownloads para pedir só o que mudou desde a última execução (None: baixa sempre)
+        self.token = token or TokenCancelamento()
+        self.indice = indice
+        self._sessao_propria = sessao is None
+        self.sessao = sessao or SessaoHTTP(token=self.token, cabecalhos={'Accept': 'application/pdf,*/*'})
+        self.simultaneos = simultaneos or DOWNLOAD_PDF_CONFIG['simultaneos']
+        self.tentativas = tentativas or DOWNLOAD_PDF_CONFIG['tentativas']
+        self.tamanho_minimo = tamanho_minimo if tamanho_minimo is not None else DOWNLOAD_PDF_CONFIG['tamanho_minimo']
+
+    def _espera_tentativa(self, tentativa: int) -> float:
+        # Espera exponencial com jitter: evita que as threads que falharam juntas voltem juntas
+        teto = min(DOWNLOAD_PDF_CONFIG['espera_maxima'], DOWNLOAD_PDF_CONFIG['espera_base'] * 2 ** (tentativa - 1))
+        return random.uniform(teto / 2, teto)
+
+    def _transferir(self, url: str, destino: str) -> Dict:
+        # Uma tentativa: confere a assinatura no primeiro bloco e grava em temporário antes de renomear
+        registro = self.indice.obter(url) if self.indice else None
+        # Requisição condicional só vale se o arquivo indexado ainda é este destino e está inteiro no disco
+        # (pasta apagada, diretório de saída trocado ou arquivo truncado: baixa de novo e grava)
+        no_disco = (registro is not None and bool(registro['caminho'])
+                    and os.path.abspath(registro['caminho']) == os.path.abspath(destino)
+                    and os.path.exists(destino) and os.path.getsize(destino) == registro['tamanho'])
+        cabecalhos = {}
+        if no_disco and registro['etag']:
+            cabecalhos['If-None-Match'] = registro['etag']
+        if no_disco and registro['last_modified']:
+            cabecalhos['If-Modified-Since'] = registro['last_modified']
+
+        temporario = f"{destino}.{threading.get_ident()}.part"
+        tamanho = 0
+        resumo = hashlib.sha256()
+        try:
+            with self.sessao.transmitir(url, headers=cabecalhos) as resposta:
+                if resposta.status_code == 304:
+                    return {'bytes': 0, 'inalterado': True}
+                etag = resposta.headers.get('ETag')
+                last_modified = resposta.headers.get('Last-Modified')
+
+                with open(temporario, 'wb') as arquivo:
+                    for bloco in resposta.iter_content(chunk_size=DOWNLOAD_PDF_CONFIG['tamanho_bloco']):
+                        if not bloco:
+                            continue
+                        if tamanho == 0 and not bloco.startswith(ASSINATURA_PDF):
+                            raise ArquivoNaoPDF(f"Conteúdo não é PDF ({resposta.headers.get('Content-Type', '?')})")
+                        if self.token.cancelado():
+                            raise ExecucaoCancelada("Cancelado pelo usuário")
+                        arquivo.write(bloco)
+                        resumo.update(bloco)
+                        tamanho += len(bloco)
+
+            if tamanho < self.tamanho_minimo:
+                raise ArquivoNaoPDF(f"Arquivo muito pequeno: {tamanho} bytes")
+
+            # Servidor sem validadores (ou que os trocou) mas mesmo conteúdo: documento não mudou
+            sha256 = resumo.hexdigest()
+            inalterado = no_disco and registro['sha256'] == sha256
+            if not inalterado:
+                os.replace(temporario, destino)
+            if self.indice:
+                self.indice.registrar(url, etag, last_modified, tamanho, sha256, destino)
+            return {'bytes': tamanho, 'inalterado': inalterado}
+        finally:
+            if os.path.exists(temporario):
+                os.remove(temporario)
+
+    def baixar(self, url: str, destino: str) -> Dict:
+        # Baixa um PDF com novas tentativas; nunca lança exceção (resultado no dicionário)
+        # inalterado=True: documento igual ao da última execução, nada foi gravado
+        resultado = {'sucesso': False, 'url': url, 'caminho': destino, 'bytes': 0, 'inalterado': False, 'erro': None}
+        for tentativa in range(1, self.tentativas + 1):
+            try:
+                resultado.update(self._transferir(url, destino))
+                resultado['sucesso'] = True
+                resultado['erro'] = None
+                return resultado
+            except ExecucaoCancelada:
+                resultado['erro'] = 'Cancelado'
+                return resultado
+            except ArquivoNaoPDF as e:
+                resultado['erro'] = str(e)
+                return resultado
+            except (requests.RequestException, OSError, sqlite3.Error) as e:
+                resultado['erro'] = str(e)
+                if tentativa < self.tentativas:
+                    print(f"  Tentativa {tentativa}/{self.tentativas} falhou ({url}): {e}")
+                    if self.token.aguardar(self._espera_tentativa(tentativa)):
+                        resultado['erro'] = 'Cancelado'
+                        return resultado
+        return resultado
+
+    def baixar_todos(self, tarefas: List[Dict], callback: Callable = None) -> List[Dict]:
+        # tarefas: [{'url', 'caminho', ...}]; callback(concluidos, total, resultado) na thread que chamou
+        resultados = []
+        if not tarefas:
+            return resultados
+
+        with ThreadPoolExecutor(max_workers=self.simultaneos, thread_name_prefix='BaixadorPDF') as executor:
+            futuros = {executor.submit(self.baixar, tarefa['url'], tarefa['caminho']): tarefa for tarefa in tarefas}
+            try:
+                for concluidos, futuro in enumerate(as_completed(futuros), 1):
+                    resultado = {**futuros[futuro], **futuro.result()}
+                    resultados.append(resultado)
+                    if callback:
+                        callback(concluidos, len(tarefas), resultado)
+            finally:
+                # Cancelamento ou erro no callback: downloads que ainda não começaram não são iniciados
+                for futuro in futuros:
+                    futuro.cancel()
+        return resultados
+
+    def fechar(self):
+        # Fecha a sessão se ela foi criada pelo baixador
+        if self._sessao_propria:
+            self.sessao.fechar()
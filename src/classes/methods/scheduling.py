@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+# Escalonamento - Histórico de duração por município e políticas de ordem da fila (FIFO, LPT)
+
+import os
+import sys
+import json
+import heapq
+import threading
+from statistics import median
+from typing import List, Dict, Any, Callable
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import PARALELO_CONFIG
+from src.classes.file.path_manager import obter_diretorio_config
+
+
+def _municipio(item: Any) -> str:
+    # Chave do item no histórico (itens podem ser nomes ou dicts com 'municipio')
+    return item.get('municipio') if isinstance(item, dict) else item
+
+
+class HistoricoDuracoes:
+    # Duração média (móvel exponencial) de cada município por bot, salva em JSON local
+
+    _lock = threading.Lock()
+
+    def __init__(self, bot: str):
+        # Carrega o histórico do bot
+        self.bot = bot
+        self.caminho = os.path.join(obter_diretorio_config(), 'historico_duracoes.json')
+        self.duracoes = self._carregar().get(bot, {})
+
+    def _carregar(self) -> Dict:
+        # Lê o arquivo inteiro (todos os bots)
+        try:
+            with open(self.caminho, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (OSError, ValueError):
+            return {}
+
+    def registrar(self, municipio: str, duracao: float):
+        # Atualiza a média do município com a nova duração medida
+        if not municipio or not duracao:
+            return
+        peso = PARALELO_CONFIG['peso_duracao_recente']
+        with self._lock:
+            anterior = self.duracoes.get(municipio)
+            self.duracoes[municipio] = duracao if anterior is None else peso * duracao + (1 - peso) * anterior
+
+    def prever(self, municipio: str) -> float:
+        # Duração prevista (municípios sem histórico usam a mediana dos conhecidos)
+        if municipio in self.duracoes:
+            return self.duracoes[municipio]
+        if self.duracoes:
+            return median(self.duracoes.values())
+        return PARALELO_CONFIG['duracao_padrao_item']
+
+    def salvar(self):
+        # Grava o histórico sem perder o dos outros bots (escrita atômica)
+        with self._lock:
+            dados = self._carregar()
+            dados[self.bot] = self.duracoes
+            temporario = self.caminho + '.tmp'
+            with open(temporario, 'w', encoding='utf-8') as arquivo:
+                json.dump(dados, arquivo, ensure_ascii=False, indent=1)
+            os.replace(temporario, self.caminho)
+
+
+def politica_fifo(itens: List, historico: HistoricoDuracoes) -> List:
+    # Mantém a ordem original dos itens
+    return list(itens)
+
+
+def politica_lpt(itens: List, historico: HistoricoDuracoes) -> List:
+    # Longest Processing Time first: os itens mais demorados entram primeiro na fila
+    return sorted(itens, key=lambda item: historico.prever(_municipio(item)), reverse=True)
+
+
+# Políticas disponíveis (nome em PARALELO_CONFIG['politica_escalonamento'])
+POLITICAS_ESCALONAMENTO: Dict[str, Callable] = {
+    'fifo': politica_fifo,
+    'lpt': politica_lpt,
+}
+
+
+def ordenar_itens(itens: List, historico: HistoricoDuracoes, politica: str = None) -> List:
+    # Aplica a política de escalonamento à lista de itens
+    politica = politica or PARALELO_CONFIG['politica_escalonamento']
+    if politica not in POLITICAS_ESCALONAMENTO:
+        raise ValueError(f"Política de escalonamento desconhecida: {politica}")
+    return POLITICAS_ESCALONAMENTO[politica](itens, historico)
+
+
+def particionar_itens(itens: List, num_instancias: int, historico: HistoricoDuracoes,
+                      politica: str = None) -> List[List]:
+    # Divide os itens em lotes fixos: cada item (na ordem da política) vai para o lote menos carregado
+    cargas = [(0.0, i) for i in range(num_instancias)]
+    lotes = [[] for _ in range(num_instancias)]
+    for item in ordenar_itens(itens, historico, politica):
+        carga, indice = heapq.heappop(cargas)
+        lotes[indice].append(item)
+        heapq.heappush(cargas, (carga + historico.prever(_municipio(item)), indice))
+    return lotes
+
+
+def prever_termino(itens: List, num_instancias: int, historico: HistoricoDuracoes) -> float:
+    # Tempo total previsto (makespan) para N instâncias consumindo a fila na ordem dada
+    cargas = [0.0] * max(1, num_instancias)
+    for item in itens:
+        menor = heapq.heappop(cargas)
+        heapq.heappush(cargas, menor + historico.prever(_municipio(item)))
+    return max(cargas)
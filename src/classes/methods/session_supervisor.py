@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+# Supervisão da sessão - reconhece navegador morto ou travado para o bot reabrir a sessão e repetir o item
+
+import os
+import sys
+import threading
+
+import psutil
+from selenium.common.exceptions import WebDriverException
+from urllib3.exceptions import HTTPError as ErroConexaoDriver
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import SESSAO_CONFIG
+
+# Trechos das mensagens do ChromeDriver quando o navegador, a aba ou o renderizador não respondem mais
+_SINAIS_NAVEGADOR_CAIDO = (
+    'invalid session id',
+    'session deleted',
+    'chrome not reachable',
+    'tab crashed',
+    'page crash',
+    'disconnected',
+    'no such window',
+    'target window already closed',
+    'unable to receive message from renderer',
+    'timed out receiving message from renderer',
+    'cannot determine loading status',
+)
+
+
+def falha_de_navegador(erro: BaseException) -> bool:
+    # Erro do navegador em si (morto, aba caída, renderizador travado) e não da página consultada
+    if isinstance(erro, (ConnectionError, ErroConexaoDriver)):
+        return True  # ChromeDriver encerrado: a conexão local com ele é recusada
+    if isinstance(erro, WebDriverException):
+        mensagem = (erro.msg or str(erro)).lower()
+        return any(sinal in mensagem for sinal in _SINAIS_NAVEGADOR_CAIDO)
+    return False
+
+
+def navegador_respondendo(navegador, timeout: float = None) -> bool:
+    # O navegador executa um script trivial dentro do prazo (renderizador travado não responde)
+    if navegador is None:
+        return False
+    resposta = {}
+
+    def verificar():
+        try:
+            resposta['ok'] = navegador.execute_script("return 1") == 1
+        except Exception:
+            resposta['ok'] = False
+
+    # Em thread: um renderizador travado prende a chamada até o timeout de carregamento da página
+    verificacao = threading.Thread(target=verificar, name='VerificaNavegador', daemon=True)
+    verificacao.start()
+    verificacao.join(timeout or SESSAO_CONFIG['timeout_verificacao'])
+    return resposta.get('ok', False)
+
+
+def encerrar_processos(navegador):
+    # Mata o ChromeDriver e os Chrome do navegador (travado, ele não atende ao quit)
+    try:
+        processo = psutil.Process(navegador.service.process.pid)
+        processos = processo.children(recursive=True) + [processo]
+    except (AttributeError, psutil.Error):
+        return
+    for item in processos:
+        try:
+            item.kill()
+        except psutil.Error:
+            continue
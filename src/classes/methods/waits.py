@@ -0,0 +1,297 @@
+#!/usr/bin/env python3
+# Esperas por condição - cada etapa declara quando a página está pronta, no lugar de uma pausa fixa
+
+import os
+import sys
+import time
+import threading
+from typing import Dict, List, Optional
+
+from selenium.webdriver.support import expected_conditions as EC
+
+# Adiciona o diretório pai ao path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+from src.classes.central import ESPERAS_CONFIG
+from src.classes.chrome_driver import eventos_rede
+
+
+# Angular (2+): todas as aplicações estáveis; AngularJS: nenhuma requisição $http pendente
+_JS_ANGULAR_ESTAVEL = """
+if (window.getAllAngularTestabilities) {
+    var apps = window.getAllAngularTestabilities();
+    if (apps.length) { return apps.every(function (app) { return app.isStable(); }); }
+}
+if (window.angular) {
+    try {
+        var injetor = window.angular.element(document.body).injector();
+        if (injetor) { return injetor.get('$http').pendingRequests.length === 0; }
+    } catch (e) {}
+}
+return document.readyState === 'complete';
+"""
+
+# MutationObserver registra o instante da última alteração do DOM
+_JS_INICIAR_OBSERVADOR = """
+window.__ultimaMutacao = Date.now();
+if (!window.__observadorEsperas) {
+    window.__observadorEsperas = new MutationObserver(function () { window.__ultimaMutacao = Date.now(); });
+    window.__observadorEsperas.observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+"""
+
+_JS_DOM_QUIETO = """
+if (!window.__observadorEsperas) { return null; }
+return Date.now() - window.__ultimaMutacao >= arguments[0];
+"""
+
+# MutationObserver junta os links (seletor) acrescentados à página, sem repetir URL, até serem retirados
+_JS_INICIAR_COLETOR = """
+var seletor = arguments[0];
+if (window.__coletorLinks && window.__coletorLinks.seletor === seletor) { return; }
+var coletor = {seletor: seletor, vistos: {}, novos: [], ultimaChegada: Date.now()};
+function registrar(link) {
+    if (!link.href || coletor.vistos[link.href]) { return; }
+    coletor.vistos[link.href] = true;
+    coletor.novos.push({url: link.href, titulo: (link.textContent || '').trim()});
+    coletor.ultimaChegada = Date.now();
+}
+document.querySelectorAll(seletor).forEach(registrar);
+coletor.observador = new MutationObserver(function (mutacoes) {
+    mutacoes.forEach(function (mutacao) {
+        mutacao.addedNodes.forEach(function (no) {
+            if (no.nodeType !== 1) { return; }
+            if (no.matches(seletor)) { registrar(no); }
+            no.querySelectorAll(seletor).forEach(registrar);
+        });
+    });
+});
+coletor.observador.observe(document.body, {childList: true, subtree: true});
+window.__coletorLinks = coletor;
+"""
+
+_JS_ITENS_CHEGARAM = """
+var coletor = window.__coletorLinks;
+if (!coletor) { return null; }
+return coletor.novos.length > 0 && Date.now() - coletor.ultimaChegada >= arguments[0];
+"""
+
+_JS_RETIRAR_ITENS = """
+var coletor = window.__coletorLinks;
+if (!coletor) { return null; }
+return coletor.novos.splice(0, coletor.novos.length);
+"""
+
+
+class Condicao:
+    # Condição de prontidão avaliada a cada intervalo pela espera (iniciar é chamado uma vez, antes da espera)
+
+    descricao = 'condição'
+
+    def iniciar(self, navegador):
+        pass
+
+    def __call__(self, navegador):
+        raise NotImplementedError
+
+
+class AngularEstavel(Condicao):
+    # Aplicação Angular sem tarefas pendentes (Testability.isStable / $http.pendingRequests)
+
+    descricao = 'Angular estável'
+
+    def __call__(self, navegador):
+        return navegador.execute_script(_JS_ANGULAR_ESTAVEL)
+
+
+class DomEstavel(Condicao):
+    # DOM sem alterações há quieto_ms milissegundos (MutationObserver)
+
+    descricao = 'DOM estável'
+
+    def __init__(self, quieto_ms: int = None):
+        self.quieto_ms = quieto_ms or ESPERAS_CONFIG['dom_quieto_ms']
+
+    def iniciar(self, navegador):
+        navegador.execute_script(_JS_INICIAR_OBSERVADOR)
+
+    def __call__(self, navegador):
+        quieto = navegador.execute_script(_JS_DOM_QUIETO, self.quieto_ms)
+        if quieto is None:
+            # Página trocou durante a espera: observa a nova página
+            self.iniciar(navegador)
+            return False
+        return quieto
+
+
+class RedeOciosa(Condicao):
+    # Nenhuma requisição em andamento há quieto_ms milissegundos (eventos de rede do log de performance)
+
+    descricao = 'rede ociosa'
+
+    def __init__(self, quieto_ms: int = None):
+        self.quieto_ms = quieto_ms or ESPERAS_CONFIG['rede_quieta_ms']
+        self._em_andamento = set()
+        self._ultima_atividade = 0.0
+
+    def iniciar(self, navegador):
+        self._em_andamento = set()
+        self._ultima_atividade = time.monotonic()
+
+    def __call__(self, navegador):
+        for evento in eventos_rede(navegador):
+            metodo = evento.get('method', '')
+            id_requisicao = evento.get('params', {}).get('requestId')
+            if metodo == 'Network.requestWillBeSent':
+                self._em_andamento.add(id_requisicao)
+            elif metodo in ('Network.loadingFinished', 'Network.loadingFailed'):
+                self._em_andamento.discard(id_requisicao)
+            else:
+                continue
+            self._ultima_atividade = time.monotonic()
+
+        if self._em_andamento:
+            return False
+        quieta = (time.monotonic() - self._ultima_atividade) * 1000 >= self.quieto_ms
+        return quieta and navegador.execute_script("return document.readyState") == 'complete'
+
+
+class ElementoPronto(Condicao):
+    # Elemento visível e habilitado (pronto para clique ou digitação)
+
+    descricao = 'elemento habilitado'
+
+    def __init__(self, by: str, seletor: str):
+        self._condicao = EC.element_to_be_clickable((by, seletor))
+
+    def __call__(self, navegador):
+        return self._condicao(navegador)
+
+
+class ElementoPresente(Condicao):
+    # Elemento presente no DOM
+
+    descricao = 'elemento presente'
+
+    def __init__(self, by: str, seletor: str):
+        self._condicao = EC.presence_of_element_located((by, seletor))
+
+    def __call__(self, navegador):
+        return self._condicao(navegador)
+
+
+class ItensNovos(Condicao):
+    # Chegaram links novos (seletor) e o lote parou de crescer há quieto_ms milissegundos (MutationObserver)
+    # Os links ficam guardados na página até retirar(): nenhum find_elements sobre a lista inteira
+
+    descricao = 'itens novos'
+
+    def __init__(self, seletor: str, quieto_ms: int = None):
+        self.seletor = seletor
+        self.quieto_ms = quieto_ms or ESPERAS_CONFIG['dom_quieto_ms']
+
+    def iniciar(self, navegador):
+        # Instala o coletor (uma vez por página); os links já presentes formam o primeiro lote
+        navegador.execute_script(_JS_INICIAR_COLETOR, self.seletor)
+
+    def __call__(self, navegador):
+        chegaram = navegador.execute_script(_JS_ITENS_CHEGARAM, self.quieto_ms)
+        if chegaram is None:
+            # Página trocou durante a espera: observa a nova página
+            self.iniciar(navegador)
+            return False
+        return chegaram
+
+    def retirar(self, navegador) -> Optional[List[Dict]]:
+        # Links acumulados desde a última retirada ({'url', 'titulo'}); None se a página trocou
+        return navegador.execute_script(_JS_RETIRAR_ITENS)
+
+
+class Todas(Condicao):
+    # Todas as condições satisfeitas ao mesmo tempo
+
+    def __init__(self, *condicoes: Condicao):
+        self.condicoes = condicoes
+        self.descricao = ' + '.join(c.descricao for c in condicoes)
+
+    def iniciar(self, navegador):
+        for condicao in self.condicoes:
+            condicao.iniciar(navegador)
+
+    def __call__(self, navegador):
+        return all(condicao(navegador) for condicao in self.condicoes)
+
+
+class Alguma(Condicao):
+    # Basta uma das condições (a primeira que se cumprir encerra a espera)
+
+    def __init__(self, *condicoes: Condicao):
+        self.condicoes = condicoes
+        self.descricao = ' ou '.join(c.descricao for c in condicoes)
+
+    def iniciar(self, navegador):
+        for condicao in self.condicoes:
+            condicao.iniciar(navegador)
+
+    def __call__(self, navegador):
+        return any(condicao(navegador) for condicao in self.condicoes)
+
+
+def tempo_limite(etapa: str, pausa_antiga: float = None) -> float:
+    # Tempo máximo de espera da etapa (central.py), depois do qual o bot segue adiante
+    # pausa_antiga: a espera no lugar de uma pausa fixa nunca passa de multiplo_pausa vezes essa pausa
+    limite = ESPERAS_CONFIG['timeouts'].get(etapa, ESPERAS_CONFIG['timeout_padrao'])
+    if pausa_antiga is None:
+        return limite
+    return min(limite, ESPERAS_CONFIG['multiplo_pausa'] * pausa_antiga)
+
+
+class MedidorEsperas:
+    # Compara, por etapa, o tempo realmente esperado com a pausa fixa que a etapa usava
+
+    def __init__(self):
+        self._etapas: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+
+    def registrar(self, etapa: str, pausa_antiga: float, gasto: float, resolvida: bool):
+        # Registra uma espera da etapa
+        with self._lock:
+            dados = self._etapas.setdefault(etapa, {
+                'esperas': 0, 'resolvidas': 0, 'tempo_gasto': 0.0, 'tempo_pausas': 0.0
+            })
+            dados['esperas'] += 1
+            dados['resolvidas'] += int(resolvida)
+            dados['tempo_gasto'] += gasto
+            dados['tempo_pausas'] += pausa_antiga
+
+    def resumo(self) -> Dict[str, Dict]:
+        # Estatísticas por etapa, com a economia (positiva) ou custo extra (negativa) em segundos
+        with self._lock:
+            resumo = {etapa: dict(dados) for etapa, dados in self._etapas.items()}
+        for dados in resumo.values():
+            dados['economia'] = dados['tempo_pausas'] - dados['tempo_gasto']
+        return resumo
+
+    def imprimir_resumo(self):
+        # Exibe a economia de tempo das esperas por condição
+        resumo = self.resumo()
+        if not resumo:
+            return
+        total = sum(dados['economia'] for dados in resumo.values())
+        print(f"Esperas por condição: {total:+.1f}s em relação às pausas fixas")
+        for etapa, dados in sorted(resumo.items()):
+            print(f"  {etapa}: {dados['esperas']} esperas ({dados['resolvidas']} resolvidas), "
+                  f"média {dados['tempo_gasto'] / dados['esperas']:.2f}s, economia {dados['economia']:+.1f}s")
+
+
+_medidor = None
+_medidor_lock = threading.Lock()
+
+
+def obter_medidor_esperas() -> MedidorEsperas:
+    # Obtém o medidor único do processo
+    global _medidor
+    with _medidor_lock:
+        if _medidor is None:
+            _medidor = MedidorEsperas()
+        return _medidor
@@ -3,6 +3,8 @@
 
 import sys
 import os
+import json
+import socket
 
 # Adiciona o diretório raiz do projeto ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
@@ -10,26 +12,98 @@ sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(
 from src.bots.bot_bbdaf import BotBBDAF
 from src.classes.data_extractor import DataExtractor
 
+
+class CanalEventos:
+    # Canal JSON-lines com o processador paralelo (socket local): pede cidades e envia eventos
+
+    def __init__(self, porta, instancia):
+        self.instancia = instancia
+        self.conexao = socket.create_connection(('127.0.0.1', porta))
+        self.arquivo = self.conexao.makefile('rw', encoding='utf-8', newline='\n')
+
+    def emitir(self, evento, **dados):
+        # Envia um evento em uma única linha JSON
+        dados.update({'evento': evento, 'instancia': self.instancia})
+        self.arquivo.write(json.dumps(dados, ensure_ascii=False, default=str) + '\n')
+        self.arquivo.flush()
+
+    def obter_proxima_cidade(self):
+        # Pede a próxima cidade da fila (None quando a fila acabar)
+        self.emitir('pedir')
+        linha = self.arquivo.readline()
+        if not linha:
+            return None
+        cidade = json.loads(linha).get('municipio')
+        if cidade:
+            self.emitir('inicio', municipio=cidade)
+        return cidade
+
+    def emitir_resultado(self, resultado):
+        # Envia o resultado completo de uma cidade (sucesso/erro, arquivo e tempos por etapa)
+        self.emitir('resultado', resultado=resultado)
+
+    def fechar(self):
+        # Fecha o canal (o processador paralelo detecta o fim da instância)
+        try:
+            self.arquivo.close()
+            self.conexao.close()
+        except OSError:
+            pass
+
+
+def executar_fila(data_inicial, data_final, porta, instancia):
+    # Modo fila: processa cidades entregues pelo processador paralelo até a fila acabar
+    bot = BotBBDAF()
+    bot.configurar_extrator_dados(DataExtractor("bbdaf"))
+
+    try:
+        if not bot.configurar_navegador():
+            print("Erro: Falha ao configurar navegador")
+            return 1
+        if not bot.abrir_pagina_inicial():
+            print("Erro: Falha ao abrir página inicial")
+            return 1
+
+        # Conecta só com o navegador pronto, para não segurar cidades numa instância que não sobe
+        canal = CanalEventos(porta, instancia)
+        try:
+            bot.processar_fila_cidades(
+                canal.obter_proxima_cidade,
+                data_inicial,
+                data_final,
+                callback_resultado=canal.emitir_resultado
+            )
+        finally:
+            canal.fechar()
+        return 0
+    finally:
+        bot.fechar_navegador()
+
+
 def main():
     # Executa uma instância do bot com os parâmetros fornecidos
+    if len(sys.argv) == 6 and sys.argv[1] == '--fila':
+        return executar_fila(sys.argv[2], sys.argv[3], int(sys.argv[4]), int(sys.argv[5]))
+
     if len(sys.argv) < 4:
         print("Uso: run_instance.py <arquivo_cidades> <data_inicial> <data_final>")
+        print("     run_instance.py --fila <data_inicial> <data_final> <porta> <instancia>")
         return 1
-    
+
     arquivo_cidades = sys.argv[1]
     data_inicial = sys.argv[2]
     data_final = sys.argv[3]
-    
+
     # Inicializa e executa o bot
     bot = BotBBDAF()
     bot.configurar_extrator_dados(DataExtractor("bbdaf"))
-    
+
     resultado = bot.executar_completo(
         arquivo_cidades=arquivo_cidades,
         data_inicial=data_inicial,
         data_final=data_final
     )
-    
+
     if resultado['sucesso']:
         stats = resultado['estatisticas']
         print(f"\nProcessamento concluído:")
@@ -43,4 +117,4 @@ def main():
         return 1
 
 if __name__ == "__main__":
-    sys.exit(main())
\ No newline at end of file
+    sys.exit(main())
@@ -17,6 +17,7 @@ from typing import Dict, Callable
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
 
 from src.classes.city_manager import CitySplitter
+from src.classes.central import PARALELO_CONFIG
 from src.classes.file.path_manager import obter_caminho_dados, obter_caminho_recurso, copiar_arquivo_cidades_se_necessario
 from src.classes.city_manager import CityManager
 from src.view.modules.buttons import ButtonFactory
@@ -58,6 +59,7 @@ class GUI1:
         self.city_splitter = CitySplitter(caminho_cidades)
         self.num_instancias = 1
         self.modo_execucao = "individual"
+        self.retomar_var = ctk.BooleanVar(value=False)  # Pula as cidades já concluídas com as mesmas datas
         
         # Frame principal da GUI1
         self.main_frame = None
@@ -346,6 +348,15 @@ class GUI1:
         )
         self.dropdown_modo.set("Individual")
         self.dropdown_modo.pack()
+
+        # Retomada: pula as cidades já concluídas numa execução anterior com as mesmas datas
+        self.check_retomar = ctk.CTkCheckBox(
+            frame_modo,
+            text="Retomar execução anterior",
+            variable=self.retomar_var,
+            font=ctk.CTkFont(size=13)
+        )
+        self.check_retomar.pack(pady=(10, 0))
         
         # Label de status da distribuição
         self.label_distribuicao = ctk.CTkLabel(
@@ -429,9 +440,9 @@ class GUI1:
                 self.label_distribuicao.configure(text="Processamento individual - uma instância do navegador")
                 return
             
-            # Valida número de instâncias (máximo 5)
-            if self.num_instancias > 5:
-                self.num_instancias = 5
+            # Valida número de instâncias (máximo configurado em central.py)
+            if self.num_instancias > PARALELO_CONFIG['max_instancias']:
+                self.num_instancias = PARALELO_CONFIG['max_instancias']
             
             # Calcula distribuição
             if hasattr(self.city_splitter, 'obter_resumo_distribuicao'):
@@ -591,6 +602,7 @@ class GUI1:
         
         # Atualiza controles de execução paralela
         self.dropdown_modo.configure(state="normal" if habilitado else "disabled")
+        self.check_retomar.configure(state="normal" if habilitado else "disabled")
 
         # Controla loading indicator
         if self.loading_indicator:
@@ -653,7 +665,8 @@ class GUI1:
             'cidades': self.cidades_selecionadas.copy(),
             'data_inicial': self.data_inicial_var.get(),
             'data_final': self.data_final_var.get(),
-            'num_instancias': self.num_instancias if self.modo_execucao == 'paralelo' else 1
+            'num_instancias': self.num_instancias if self.modo_execucao == 'paralelo' else 1,
+            'retomar': self.retomar_var.get()
         }
     
     def processar_resultado(self, resultado: Dict):
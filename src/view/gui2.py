@@ -39,6 +39,7 @@ class GUI2:
         self.ano_var = ctk.StringVar()
         self.municipio_var = ctk.StringVar()
         self.modo_var = ctk.StringVar()
+        self.retomar_var = ctk.BooleanVar(value=False)
         self.lista_municipios = []
         self.municipios_selecionados = []  # Para preservar seleção no Windows
         
@@ -274,6 +275,15 @@ class GUI2:
             height=40
         )
         self.dropdown_modo.pack()
+
+        # Retomada: pula os municípios já concluídos numa execução anterior com o mesmo ano
+        self.check_retomar = ctk.CTkCheckBox(
+            frame_modo,
+            text="Retomar execução anterior",
+            variable=self.retomar_var,
+            font=ctk.CTkFont(size=13)
+        )
+        self.check_retomar.pack(pady=(10, 0))
         
         # Label de info sobre execução paralela
         self.label_info_paralela = ctk.CTkLabel(
@@ -392,6 +402,7 @@ class GUI2:
             self.dropdown_municipio.configure(state="normal" if habilitado else "disabled")
 
         self.dropdown_modo.configure(state="normal" if habilitado else "disabled")
+        self.check_retomar.configure(state="normal" if habilitado else "disabled")
 
         # Controla loading indicator
         if self.loading_indicator:
@@ -457,7 +468,8 @@ class GUI2:
                     self.processador_paralelo = ProcessadorParalelo()
                     
                     print(f"Iniciando execução paralela com {num_instancias} instâncias")
-                    resultado = self.bot_fnde.executar_paralelo(ano, num_instancias)
+                    resultado = self.bot_fnde.executar_paralelo(ano, num_instancias,
+                                                                retomar=self.retomar_var.get())
                     
                     # Armazena referência do processador paralelo para cancelamento
                     if 'processador' in resultado:
@@ -472,7 +484,7 @@ class GUI2:
                     # Execução individual (código original)
                     if municipio_selecionado == "Todos os Municípios":
                         # Processa todos os municípios sequencialmente
-                        estatisticas = self.bot_fnde.processar_todos_municipios(ano)
+                        estatisticas = self.bot_fnde.processar_todos_municipios(ano, retomar=self.retomar_var.get())
                         if not self._cancelado:
                             self.parent_container.after(0, self._finalizar_execucao_todos, estatisticas)
                     else:
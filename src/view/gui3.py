@@ -44,10 +44,8 @@ class GUI3:
         self.anos_selecionados = []
         self.cidades_selecionadas = []
 
-        # Armazena referência do executor para cancelamento
-        self.executor = None
-        self.futures = []
-        self.bots_ativos = []  # Lista de instâncias BotBetha ativas
+        # Armazena referência do processador paralelo para cancelamento
+        self.processador_paralelo = None
 
         # Loading indicator
         self.loading_indicator = None
@@ -496,26 +494,10 @@ class GUI3:
                 else:
                     self.bot_betha.fechar_navegador()
 
-            # Cancela todos os bots ativos (execução paralela)
-            for bot in self.bots_ativos:
-                try:
-                    if hasattr(bot, 'cancelar'):
-                        bot.cancelar()
-                    else:
-                        bot.fechar_navegador()
-                except:
-                    pass  # Ignorar erros ao cancelar bots
-            self.bots_ativos.clear()
-
-            # Cancela executor paralelo se existir
-            if self.executor:
-                # Tenta cancelar futures pendentes
-                for future in self.futures:
-                    future.cancel()
-                # Shutdown sem esperar
-                self.executor.shutdown(wait=False)
-                self.executor = None
-                self.futures = []
+            # Cancela processador paralelo se existir (fecha todos os bots ativos)
+            if self.processador_paralelo:
+                self.processador_paralelo.cancelar()
+                self.processador_paralelo = None
 
             self._habilitar_interface(True)
             messagebox.showinfo("Cancelado", "Processamento cancelado")
@@ -668,29 +650,16 @@ class GUI3:
         
         print(f"Total de tarefas: {len(tarefas)}")
         
-        # Dividir tarefas entre as instâncias
-        import concurrent.futures
+        # Instâncias consomem a mesma fila de tarefas (motor paralelo genérico)
+        from src.classes.methods.parallel_processor import ProcessadorParalelo
 
-        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=num_instancias)
-        self.futures = []
+        self.processador_paralelo = ProcessadorParalelo()
+        itens = [{'cidade_config': cidade_config, 'ano': ano} for cidade_config, ano in tarefas]
 
         try:
-            # Submeter tarefas
-            for cidade_config, ano in tarefas:
-                if self._cancelado:
-                    break
-                future = self.executor.submit(self._executar_tarefa, cidade_config, ano)
-                self.futures.append(future)
-
-            # Aguardar conclusão (ou cancelamento)
-            if not self._cancelado:
-                concurrent.futures.wait(self.futures)
+            self.processador_paralelo.executar_paralelo_generico(BotBetha, itens, num_instancias)
         finally:
-            # Limpar executor
-            if self.executor:
-                self.executor.shutdown(wait=True)
-                self.executor = None
-                self.futures = []
+            self.processador_paralelo = None
         
         print("\n" + "="*60)
         print("EXECUÇÃO PARALELA CONCLUÍDA")
@@ -705,46 +674,6 @@ class GUI3:
                 f"Instâncias utilizadas: {num_instancias}"
             ))
     
-    def _executar_tarefa(self, cidade_config, ano):
-        """Executa uma tarefa individual (para uso em paralelo)"""
-        try:
-            # Verifica cancelamento antes de iniciar
-            if self._cancelado:
-                return
-
-            print(f"\n🔄 Iniciando: {cidade_config['nome']} - {ano}")
-
-            bot = BotBetha(cidade_config, ano)
-
-            # Adicionar à lista de bots ativos para possível cancelamento
-            self.bots_ativos.append(bot)
-
-            # Armazena referência para possível cancelamento
-            # (em execução paralela, múltiplos bots podem estar ativos)
-            resultado = bot.executar_completo()
-
-            if self._cancelado:
-                bot.fechar_navegador()
-                return
-
-            if resultado['sucesso']:
-                print(f"✓ Concluído: {cidade_config['nome']} - {ano}")
-            else:
-                print(f"✗ Falha: {cidade_config['nome']} - {ano}")
-
-            bot.fechar_navegador()
-
-            # Remover da lista de bots ativos
-            if bot in self.bots_ativos:
-                self.bots_ativos.remove(bot)
-
-        except Exception as e:
-            if not self._cancelado:
-                print(f"✗ Erro em {cidade_config['nome']} - {ano}: {e}")
-            # Remover bot da lista em caso de erro
-            if 'bot' in locals() and bot in self.bots_ativos:
-                self.bots_ativos.remove(bot)
-    
     def _buscar_config_cidade(self, nome_cidade):
         """Busca a configuração de uma cidade específica"""
         for cidade in self.lista_cidades_betha:
@@ -42,6 +42,7 @@ class GUI4:
         # Variáveis de configuração
         self.municipio_var = ctk.StringVar()
         self.modo_var = ctk.StringVar()
+        self.retomar_var = ctk.BooleanVar(value=False)
         self.lista_municipios = []
 
         # Frame principal
@@ -245,6 +246,15 @@ class GUI4:
         )
         self.dropdown_modo.pack()
 
+        # Retomada: pula os municípios já concluídos numa execução anterior com a mesma data
+        self.check_retomar = ctk.CTkCheckBox(
+            frame_modo,
+            text="Retomar execução anterior",
+            variable=self.retomar_var,
+            font=ctk.CTkFont(size=13)
+        )
+        self.check_retomar.pack(pady=(10, 0))
+
         # Label de info sobre execução paralela
         self.label_info_paralela = ctk.CTkLabel(
             frame_paralela,
@@ -348,7 +358,7 @@ class GUI4:
                     self.processador_paralelo = ProcessadorParalelo()
 
                     print(f"Iniciando execução paralela com {num_instancias} instâncias")
-                    resultado = self.bot_cons_fns.executar_paralelo(num_instancias)
+                    resultado = self.bot_cons_fns.executar_paralelo(num_instancias, retomar=self.retomar_var.get())
 
                     # Armazena referência do processador paralelo para cancelamento
                     if 'processador' in resultado:
@@ -364,7 +374,7 @@ class GUI4:
                     # Verifica se é para processar todos os municípios
                     if municipio_selecionado == "Todos os Municípios":
                         # Processa todos os municípios sequencialmente
-                        resultado = self.bot_cons_fns.processar_todos_municipios()
+                        resultado = self.bot_cons_fns.processar_todos_municipios(retomar=self.retomar_var.get())
 
                         if not self._cancelado:
                             # Finaliza com sucesso
@@ -489,6 +499,7 @@ class GUI4:
         # Atualiza dropdown de modo de execução
         if hasattr(self, 'dropdown_modo'):
             self.dropdown_modo.configure(state="normal" if habilitado else "disabled")
+            self.check_retomar.configure(state="normal" if habilitado else "disabled")
 
         # Controla loading indicator
         if self.loading_indicator:
@@ -40,6 +40,7 @@ class GUI7:
         self.ano_var = ctk.StringVar()
         self.mes_var = ctk.StringVar()
         self.municipio_var = ctk.StringVar()
+        self.retomar_var = ctk.BooleanVar(value=False)
         self.lista_municipios = []
         self.municipios_selecionados = []  # Para preservar seleção no Windows
 
@@ -256,6 +257,15 @@ class GUI7:
         )
         self.dropdown_municipio.pack()
 
+        # Retomada: pula os municípios já concluídos numa execução anterior com o mesmo ano e mês
+        self.check_retomar = ctk.CTkCheckBox(
+            frame_municipio_campo,
+            text="Retomar execução anterior",
+            variable=self.retomar_var,
+            font=ctk.CTkFont(size=13)
+        )
+        self.check_retomar.pack(pady=(10, 0))
+
         # Label de status da seleção
         self.label_status_municipios = ctk.CTkLabel(
             frame_municipios,
@@ -366,6 +376,7 @@ class GUI7:
         # Atualiza dropdown de municípios (todas as plataformas)
         if hasattr(self, 'dropdown_municipio'):
             self.dropdown_municipio.configure(state="normal" if habilitado else "disabled")
+            self.check_retomar.configure(state="normal" if habilitado else "disabled")
 
         # Controla loading indicator
         if self.loading_indicator:
@@ -424,7 +435,7 @@ class GUI7:
                 # Execução individual
                 if municipio_selecionado == "Todos os Municípios":
                     # Processa todos os municípios sequencialmente
-                    estatisticas = self.bot_mds.processar_todos_municipios(ano, mes)
+                    estatisticas = self.bot_mds.processar_todos_municipios(ano, mes, retomar=self.retomar_var.get())
                     if not self._cancelado:
                         self.parent_container.after(0, self._finalizar_execucao_todos, estatisticas)
                 else:
@@ -48,6 +48,7 @@ class ConfigGUI:
         self.hora_var = tk.StringVar(value="")     # Vazio - será preenchido do JSON
         self.minuto_var = tk.StringVar(value="")   # Vazio - será preenchido do JSON
         self.modo_exec_var = tk.StringVar(value="")  # Vazio - será preenchido do JSON
+        self.retomar_var = tk.BooleanVar(value=False)
 
         # Variáveis para dias da semana
         self.dia_seg_var = tk.BooleanVar(value=False)
@@ -575,6 +576,16 @@ class ConfigGUI:
         )
         self.dropdown_modo.pack()
 
+        # Retomar: pula os municípios já concluídos numa execução interrompida com os mesmos parâmetros
+        self.check_retomar = ctk.CTkCheckBox(
+            frame_modo,
+            text="Retomar execução interrompida",
+            variable=self.retomar_var,
+            command=self._on_config_change,
+            font=ctk.CTkFont(size=13)
+        )
+        self.check_retomar.pack(pady=(10, 0))
+
         # Label de info sobre execução
         self.label_info_modo = ctk.CTkLabel(
             modo_frame,
@@ -870,6 +881,7 @@ class ConfigGUI:
                 self.modo_exec_var.set(f"Paralelo ({parallel_instances} instâncias)")
             else:
                 self.modo_exec_var.set("Individual")
+            self.retomar_var.set(saved_config.get('resume', False))
 
             # Atualiza visualização dos campos
             if self.execucao_auto_var.get():
@@ -952,7 +964,8 @@ class ConfigGUI:
             },
             'time': horario,
             'execution_mode': 'Paralela' if "Paralelo" in modo_exec else 'Individual',
-            'parallel_instances': parallel_instances
+            'parallel_instances': parallel_instances,
+            'resume': self.retomar_var.get()
         }
 
         # Salva no arquivo user_config.json